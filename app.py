@@ -1,13 +1,32 @@
 """
 İK Analitiği — HR Analytics Prototype
 Content-area prototype (embedded inside Dakika app).
-Filters: period type, period, department.
+Filters: period type, period and a drill-down filter state over company, department,
+position, collar, gender, age and tenure group; clicking a bar or pie slice cross-filters.
+Data: hr_analytics cube and headcount event logs over the Parquet store (HR_DATA_DIR); falls back to MOCK when absent.
 """
 
+import hmac
+import json
+import os
+import sys
+from types import SimpleNamespace
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+
+from hr_analytics import profiling
+from hr_analytics.bitmap import DIMENSIONS
+from hr_analytics.charts import BLUE
+from hr_analytics.cohorts import SURVIVAL_PERIODS
+from hr_analytics.dims import MONTHS_TR, PERIOD_TYPES, period_options
+from hr_analytics.prefetch import ENABLED as PREFETCH
+from hr_analytics.prefetch import Prefetcher
+from hr_analytics.profiling import span
+from hr_analytics.sections import CSS as SECTION_CSS
+from hr_analytics.sections import SECTIONS, kpi_html
+from hr_analytics.service import Engines
+from hr_analytics.warmup import shared_engines, shared_figures, shared_watcher
+from hr_analytics.watch import ENABLED as WATCH
 
 # ── Page config ───────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -35,37 +54,6 @@ html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
     max-width: 100%;
 }
 
-/* ── KPI card ── */
-.kpi-card {
-    background: white;
-    border-radius: 10px;
-    padding: 18px 20px;
-    box-shadow: 0 1px 3px rgba(0,0,0,0.08);
-    border: 1px solid #e2e6ea;
-    min-height: 110px;
-}
-.kpi-label {
-    font-size: 12.5px;
-    color: #374151;
-    font-weight: 500;
-    margin-bottom: 8px;
-    display: flex;
-    align-items: center;
-    gap: 6px;
-}
-.kpi-value {
-    font-size: 32px;
-    font-weight: 700;
-    color: #111827;
-    line-height: 1.1;
-    margin-bottom: 4px;
-}
-.kpi-sub {
-    font-size: 11.5px;
-    color: #6b7280;
-    margin-top: 4px;
-}
-
 /* ── Chart card — style Streamlit's own container wrapper ── */
 [data-testid="stVerticalBlockBorderWrapper"] {
     background: white;
@@ -75,27 +63,7 @@ html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
     border: 1px solid #e2e6ea !important;
     margin-bottom: 16px;
 }
-.chart-title {
-    font-size: 14px;
-    font-weight: 600;
-    color: #111827;
-    margin-bottom: 12px;
-}
-
-/* ── Page header ── */
-.page-title {
-    font-size: 22px;
-    font-weight: 700;
-    color: #111827;
-    line-height: 1.2;
-}
-.page-sub {
-    font-size: 12.5px;
-    color: #6b7280;
-    margin-top: 2px;
-    margin-bottom: 0;
-}
-
+""" + SECTION_CSS + """
 /* ── Filter label ── */
 .filter-label {
     font-size: 11px;
@@ -127,6 +95,28 @@ html, body, [class*="css"] { font-family: 'Inter', sans-serif; }
     color: white !important;
 }
 
+/* ── Section navigation (segmented control styled like the tab bar) ── */
+div[data-testid="stButtonGroup"] {
+    background: white;
+    border-radius: 8px;
+    padding: 4px;
+    border: 1px solid #e2e6ea;
+    margin-bottom: 20px;
+}
+button[data-testid^="stBaseButton-segmented_control"] {
+    border: none !important;
+    border-radius: 6px !important;
+    padding: 7px 16px;
+    font-weight: 500;
+    font-size: 13px;
+    color: #374151;
+    background: transparent;
+}
+button[data-testid="stBaseButton-segmented_controlActive"] {
+    background-color: #2563eb !important;
+    color: white !important;
+}
+
 /* selectbox label */
 div[data-testid="stSelectbox"] label { display: none; }
 </style>
@@ -134,43 +124,35 @@ div[data-testid="stSelectbox"] label { display: none; }
 
 
 # ── Constants ─────────────────────────────────────────────────────────────────
-DEPARTMENTS = [
-    "Tüm Departmanlar",
-    "Yazılım & Teknoloji",
-    "Satış & Pazarlama",
-    "Muhasebe & Finans",
-    "İnsan Kaynakları",
-    "Operasyon",
-    "Hukuk",
-    "Yönetim",
-]
-
-COMPANIES = [
-    "Tüm Şirketler",
-    "Şirket A",
-    "Şirket B",
-    "Şirket C",
-]
-
-MONTHS_TR = [
-    "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
-    "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık",
-]
-
-BLUE = "#1d6fce"
-# High-contrast qualitative palette (ColorBrewer Set1 + adjustments)
-COLORS = [
-    "#1d6fce",  # blue
-    "#e05c00",  # orange
-    "#2ca02c",  # green
-    "#d62728",  # red
-    "#9467bd",  # purple
-    "#8c564b",  # brown
-    "#e377c2",  # pink
-    "#17becf",  # teal
-]
+# "sections": only the selected section runs; "tabs": all six st.tabs bodies run
+NAV_MODE = os.environ.get("HR_NAV_MODE", "sections")
+# Cache statistics are shown when the page is opened with ?admin=<HR_ADMIN_TOKEN>
+ADMIN_TOKEN = os.environ.get("HR_ADMIN_TOKEN", "")
+# Timing spans and a profiling panel with HR_PROFILE=1 or ?profile=1 (see hr_analytics.profiling)
+profiler = profiling.Profiler() if profiling.enabled(st.query_params) else None
+profiling.activate(profiler)
+# Neighbour states still queued from this session's last rerun would compete with this one
+if (batch := st.session_state.pop("prefetch", None)) is not None:
+    batch.cancel()
+
+# Drill-down dimensions in filter order; selections live in st.session_state["flt_<dim>"]
+FILTER_LABELS = {
+    "company": "Şirket",
+    "department": "Departman",
+    "position": "Pozisyon",
+    "collar": "Yaka",
+    "gender": "Cinsiyet",
+    "age_group": "Yaş Grubu",
+    "tenure_group": "Kıdem",
+}
+FILTER_OPTIONS = {dim: DIMENSIONS[dim][1:] if dim in ("company", "department") else DIMENSIONS[dim]
+                  for dim in FILTER_LABELS}
 
 # ── Mock Data ─────────────────────────────────────────────────────────────────
+# Shown until a data directory exists (see hr_analytics.store.DATA_DIR).
+TREND_PERIODS = [f"{m} 2025" for m in MONTHS_TR]
+COHORT_PERIODS = [f"{m} {y}" for y in (2024, 2025) for m in MONTHS_TR]
+
 MOCK = {
     # Demografi
     "headcount": 248,
@@ -204,6 +186,15 @@ MOCK = {
     "salary_hourly_avg": 267.5,
     "salary_hourly_min": 115.6,
     "salary_hourly_max": 906.3,
+    "salary_p10": 24_600,
+    "salary_median": 38_900,
+    "salary_p90": 71_400,
+    "salary_band_by_dept": {
+        "Yazılım & Teknoloji": [38_200, 55_900, 84_700], "Satış & Pazarlama": [26_400, 38_600, 61_200],
+        "Operasyon": [21_500, 29_800, 45_100], "Muhasebe & Finans": [28_900, 41_700, 62_300],
+        "İnsan Kaynakları": [25_800, 36_900, 54_600], "Hukuk": [33_400, 49_800, 78_900],
+        "Yönetim": [61_200, 92_400, 138_000],
+    },
     "salary_by_dept": {
         "Yazılım & Teknoloji": 58_400, "Satış & Pazarlama": 41_200,
         "Operasyon": 31_800, "Muhasebe & Finans": 43_500,
@@ -223,6 +214,24 @@ MOCK = {
     "cost_labor_total": 10_614_400,
     "cost_sgk_total": 2_335_168,
     "cost_overtime_total": 318_450,
+    "cost_by_dept": {
+        "Yazılım & Teknoloji": 5_168_900, "Satış & Pazarlama": 2_789_700,
+        "Operasyon": 1_812_600, "Muhasebe & Finans": 2_157_300,
+        "İnsan Kaynakları": 1_101_800, "Hukuk": 950_100, "Yönetim": 1_277_600,
+    },
+    "cost_by_position": {
+        "Yazılım Geliştirici": 4_420_600, "Satış Temsilcisi": 2_091_500,
+        "Muhasebe Uzmanı": 1_677_500, "İK Uzmanı": 1_217_000,
+        "Operasyon Uzmanı": 1_516_800, "Yönetici": 2_384_000, "Diğer": 1_950_600,
+    },
+    "cost_trend": {
+        "Brüt Ücret": [9_540_000, 9_610_000, 9_720_000, 9_810_000, 9_930_000, 10_020_000,
+                       10_210_000, 10_260_000, 10_300_000, 10_410_000, 10_520_000, 10_614_400],
+        "Fazla Mesai": [284_000, 291_000, 302_000, 296_000, 310_000, 305_000,
+                        321_000, 312_000, 298_000, 307_000, 315_000, 318_450],
+        "SGK İşveren Payı": [2_098_800, 2_114_200, 2_138_400, 2_158_200, 2_184_600, 2_204_400,
+                             2_246_200, 2_257_200, 2_266_000, 2_290_200, 2_314_400, 2_335_168],
+    },
 
     # Fazla Mesai
     "overtime_total": 1_842,
@@ -265,314 +274,313 @@ MOCK = {
     "termination_by_tenure": {
         "0-1 Yıl": 5, "1-3 Yıl": 3, "3-5 Yıl": 2, "5-10 Yıl": 1, "10+ Yıl": 0,
     },
+    "retention_6m": 84.2,
+    "retention_12m": 71.5,
+    "avg_exit_tenure": 2.3,
+    "exit_tenure": {
+        "0-3 Ay": 2, "3-6 Ay": 2, "6-12 Ay": 1, "1-2 Yıl": 2,
+        "2-5 Yıl": 2, "5-10 Yıl": 1, "10+ Yıl": 1,
+    },
+    "cohort_retention": dict(zip(COHORT_PERIODS, [
+        58.3, 60.0, 61.5, 57.1, 62.5, 63.6, 60.0, 64.7, 66.7, 63.2, 68.4, 66.7,
+        70.6, 72.2, 71.4, 75.0, 76.5, 78.9, 81.3, 83.3, 86.7, 88.9, 92.9, 100.0,
+    ])),
+    "survival_periods": SURVIVAL_PERIODS,
+    "survival_curve": {
+        "Tüm Kohortlar": [
+            98.6, 96.1, 93.8, 91.2, 88.9, 86.5, 84.2, 82.3, 80.1, 77.9, 75.8, 73.6,
+            71.5, 70.3, 69.2, 68.0, 66.9, 65.9, 64.8, 63.8, 62.9, 61.9, 61.0, 60.1, 59.3,
+        ],
+        "Son 12 Ay İşe Girenler": [
+            99.0, 97.0, 95.1, 92.8, 90.7, 88.5, 86.3, 84.6, 82.5, 80.4, 78.6, 76.7,
+            *[None] * 13,
+        ],
+        "Önceki 12 Ay İşe Girenler": [
+            98.2, 95.3, 92.6, 89.7, 87.2, 84.6, 82.1, 80.0, 77.7, 75.3, 73.1, 70.6,
+            68.4, 67.2, 66.1, 64.9, 63.8, 62.8, 61.7, 60.7, 59.8, 58.8, 57.9, 57.0, 56.2,
+        ],
+    },
     "hires_trend":        [8, 12, 15, 22, 18, 14, 20, 17, 11, 16, 19, 18],
     "terminations_trend": [5,  7,  9, 14, 11,  8, 13, 10,  6,  9, 12, 11],
+    "trend_periods": TREND_PERIODS,
 }
 
-TREND_PERIODS = [f"{m} 2025" for m in MONTHS_TR]
-
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
-def fmt_num(v, d=0):
-    return f"{v:,.{d}f}".replace(",", ".")
-
-def fmt_currency(v):
-    return f"₺{v:,.0f}"
-
 def kpi(label, value, sub="", icon=""):
-    icon_html = f'<span style="font-size:15px">{icon}</span> ' if icon else ""
-    st.markdown(f"""
-    <div class="kpi-card">
-        <div class="kpi-label">{icon_html}{label}</div>
-        <div class="kpi-value">{value}</div>
-        <div class="kpi-sub">{sub}</div>
-    </div>""", unsafe_allow_html=True)
-
-HOVER_BG    = "rgba(255,255,255,0.97)"
-HOVER_FONT  = dict(family="Inter", size=13, color="#111827")
-HOVER_BORDER = "rgba(0,0,0,0)"
-
-def _base_layout(height=260, extra_margin_b=0):
-    return dict(
-        plot_bgcolor="white", paper_bgcolor="white",
-        margin=dict(l=0, r=0, t=4, b=extra_margin_b),
-        font=dict(family="Inter", size=12, color="#111827"),
-        hoverlabel=dict(
-            bgcolor=HOVER_BG,
-            font=HOVER_FONT,
-            bordercolor="#e2e6ea",
-            namelength=-1,
-        ),
-        height=height,
-    )
+    with span("kpi", label):
+        st.markdown(kpi_html(label, value, sub, icon), unsafe_allow_html=True)
+
+def process_rss():
+    """Resident set size of this worker process in bytes (peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+
+@st.cache_resource
+def figure_cache():
+    return shared_figures()
+
+PLOTLY_CONFIG = {"displayModeBar": False}
+
+def _on_chart_select(key, dim, field):
+    # Clicking a bar / slice filters on its category; clicking the only
+    # filtered category again clears that dimension
+    points = st.session_state[key]["selection"]["points"]
+    picked = [p[field] for p in points if p.get(field) in FILTER_OPTIONS[dim]]
+    if not picked:
+        return
+    current = st.session_state.get(f"flt_{dim}", [])
+    st.session_state[f"flt_{dim}"] = [] if sorted(set(picked)) == sorted(current) else list(dict.fromkeys(picked))
+
+def _plotly_spec(spec, height, drill=None):
+    # The cached spec goes through the public API as a dict; Streamlit
+    # validates and re-serializes it, which the figure cache cannot skip.
+    # ``drill`` = (widget key, dimension, point field) makes points clickable.
+    select = {}
+    if drill:
+        select = dict(key=drill[0], on_select=lambda: _on_chart_select(*drill), selection_mode="points")
+    st.plotly_chart(json.loads(spec), width="stretch", height=height, config=PLOTLY_CONFIG, **select)
+
+def _show(entry, title, drill=None):
+    spec, height = entry
+    st.markdown(f'<div class="chart-title">{title}</div>', unsafe_allow_html=True)
+    with span("chart_send", title, bytes=len(spec)):
+        _plotly_spec(spec, height, drill)
 
-def bar_chart(data, title, color=BLUE, horizontal=False, x_label="", y_label=""):
-    cats = list(data.keys())
-    vals = list(data.values())
-    col_x = x_label or "Kategori"
-    col_y = y_label or "Değer"
-    df = pd.DataFrame({col_x: cats, col_y: vals})
-
-    if horizontal:
-        hover_tpl = f"<b>%{{y}}</b><br>{col_x}: %{{x:,.0f}}<extra></extra>"
-        fig = px.bar(df, x=col_y, y=col_x, orientation="h",
-                     color_discrete_sequence=[color],
-                     hover_data={col_x: False, col_y: False})
-        fig.update_traces(
-            hovertemplate=f"<b>%{{y}}</b><br>%{{x:,.1f}}<extra></extra>",
-            marker_line_width=0,
-        )
-        fig.update_layout(yaxis={"categoryorder": "total ascending"})
-    else:
-        fig = px.bar(df, x=col_x, y=col_y, color_discrete_sequence=[color],
-                     hover_data={col_x: False, col_y: False})
-        fig.update_traces(
-            hovertemplate=f"<b>%{{x}}</b><br>%{{y:,.1f}}<extra></extra>",
-            marker_line_width=0,
-        )
+def bar_chart(data, title, color=BLUE, horizontal=False, x_label="", y_label="", drill=None):
+    with span("chart", title):
+        _show(figure_cache().get("bar", title, data, color=color, horizontal=horizontal,
+                                 x_label=x_label, y_label=y_label), title,
+              drill and (f"chart:{title}", drill, "y" if horizontal else "x"))
 
-    fig.update_layout(**_base_layout(), showlegend=False, xaxis_title="", yaxis_title="")
-    fig.update_xaxes(showgrid=False, tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
-    fig.update_yaxes(gridcolor="#f3f4f6", tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
-    st.markdown(f'<div class="chart-title">{title}</div>', unsafe_allow_html=True)
-    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
-
-def pie_chart(data, title):
-    cats = list(data.keys())
-    vals = list(data.values())
-    df = pd.DataFrame({"Grup": cats, "Adet": vals})
-    fig = px.pie(df, names="Grup", values="Adet",
-                 color_discrete_sequence=COLORS, hole=0.5)
-    fig.update_layout(
-        **_base_layout(),
-        legend=dict(orientation="v", x=1, y=0.5, font=dict(color="#111827", size=12)),
-    )
-    fig.update_traces(
-        textposition="inside",
-        textinfo="percent",
-        textfont=dict(color="white", size=12),
-        hovertemplate="<b>%{label}</b><br>%{value:,.0f} (%{percent})<extra></extra>",
-    )
-    st.markdown(f'<div class="chart-title">{title}</div>', unsafe_allow_html=True)
-    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+def pie_chart(data, title, drill=None):
+    with span("chart", title):
+        _show(figure_cache().get("pie", title, data), title, drill and (f"chart:{title}", drill, "label"))
+
+def band_chart(bands, title, color=BLUE):
+    with span("chart", title):
+        _show(figure_cache().get("band", title, bands, color=color), title)
 
 def trend_line(periods, series, title):
-    fig = go.Figure()
-    line_colors = [BLUE, "#dc2626"]
-    for i, (name, values) in enumerate(series.items()):
-        fig.add_trace(go.Scatter(
-            x=periods, y=values, mode="lines+markers", name=name,
-            line=dict(color=line_colors[i % 2], width=2),
-            marker=dict(size=5),
-            hovertemplate=f"<b>%{{x}}</b><br>{name}: %{{y}}<extra></extra>",
-        ))
-    fig.update_layout(
-        **_base_layout(height=270, extra_margin_b=60),
-        legend=dict(orientation="h", y=-0.32, xanchor="center", x=0.5,
-                    font=dict(color="#111827", size=13)),
-    )
-    fig.update_xaxes(showgrid=False, tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
-    fig.update_yaxes(gridcolor="#f3f4f6", tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
-    st.markdown(f'<div class="chart-title">{title}</div>', unsafe_allow_html=True)
-    st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+    with span("chart", title):
+        _show(figure_cache().get("trend", title, periods, series), title)
 
 
 
 # ── Header row: title + filters ───────────────────────────────────────────────
-title_col, f0, f1, f2, f3 = st.columns([3, 1.4, 1.2, 1.2, 1.4])
+def clear_filters():
+    for dim in FILTER_LABELS:
+        st.session_state[f"flt_{dim}"] = []
+
+title_col, f0, f1, f2 = st.columns([3, 1.2, 1.2, 1.4])
 
 with title_col:
     st.markdown('<div class="page-title">İK Analitik Panosu</div>', unsafe_allow_html=True)
 
 with f0:
-    st.markdown('<div class="filter-label">Şirket</div>', unsafe_allow_html=True)
-    selected_company = st.selectbox("co", COMPANIES, label_visibility="collapsed")
-
-with f1:
     st.markdown('<div class="filter-label">Dönem Türü</div>', unsafe_allow_html=True)
-    period_type = st.selectbox("pt", ["Aylık", "Çeyreklik", "Yıllık"], label_visibility="collapsed")
+    period_type = st.selectbox("pt", PERIOD_TYPES, label_visibility="collapsed")
 
-with f2:
+with f1:
     st.markdown('<div class="filter-label">Dönem</div>', unsafe_allow_html=True)
-    if period_type == "Aylık":
-        period_opts = [f"{m} 2025" for m in MONTHS_TR] + ["Ocak 2026"]
-        period_default = len(period_opts) - 1
-    elif period_type == "Çeyreklik":
-        period_opts = ["Q1 2025", "Q2 2025", "Q3 2025", "Q4 2025", "Q1 2026"]
-        period_default = len(period_opts) - 1
-    else:
-        period_opts = ["2024", "2025", "2026"]
-        period_default = 1
+    period_opts, period_default = period_options(period_type)
     selected_period = st.selectbox("dp", period_opts, index=period_default, label_visibility="collapsed")
 
-with f3:
-    st.markdown('<div class="filter-label">Departman</div>', unsafe_allow_html=True)
-    selected_dept = st.selectbox("dept", DEPARTMENTS, label_visibility="collapsed")
+with f2:
+    st.markdown('<div class="filter-label">Filtreler</div>', unsafe_allow_html=True)
+    n_active = sum(bool(st.session_state.get(f"flt_{dim}")) for dim in FILTER_LABELS)
+    with st.popover(f"Filtreler ({n_active})" if n_active else "Tüm Çalışanlar", use_container_width=True):
+        filters = {
+            dim: st.multiselect(label, FILTER_OPTIONS[dim], key=f"flt_{dim}", placeholder="Tümü")
+            for dim, label in FILTER_LABELS.items()
+        }
+        st.button("Filtreleri Temizle", on_click=clear_filters, use_container_width=True)
 
 # Sub-header
-company_label = selected_company if selected_company != "Tüm Şirketler" else "Tüm Şirketler"
-dept_label = selected_dept if selected_dept != "Tüm Departmanlar" else "Tüm Departmanlar"
+company_label = ", ".join(filters["company"]) or "Tüm Şirketler"
+dept_label = ", ".join(filters["department"]) or "Tüm Departmanlar"
+drill_label = "".join(
+    f" · {FILTER_LABELS[dim]}: {', '.join(values)}"
+    for dim, values in filters.items() if values and dim not in ("company", "department")
+)
 st.markdown(
     f'<div class="page-sub" style="margin-bottom:20px">'
-    f'{company_label} · {period_type} · {selected_period} · {dept_label}'
+    f'{company_label} · {period_type} · {selected_period} · {dept_label}{drill_label}'
     f'</div>',
     unsafe_allow_html=True,
 )
 
-# ── Tabs ──────────────────────────────────────────────────────────────────────
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-    "👥 Demografi",
-    "💰 Ücret",
-    "🏭 Maliyet",
-    "🕐 Fazla Mesai",
-    "🏖️ Devamsızlık",
-    "🔄 İşe Alım & Çıkış",
-])
-
-
-# ══════════════════════════════════════════════════════════════════════════════
-# TAB 1 — Demografi
-# ══════════════════════════════════════════════════════════════════════════════
-with tab1:
-    c1, c2, c3, c4 = st.columns(4)
-    with c1: kpi("Toplam Çalışan", fmt_num(MOCK["headcount"]), icon="👥")
-    with c2: kpi("Ortalama Yaş", fmt_num(MOCK["avg_age"], 1), icon="🎂")
-    with c3: kpi("Ortalama Kıdem", f"{fmt_num(MOCK['avg_tenure'], 1)} yıl", icon="📅")
-    with c4: kpi("Emekli Çalışan", fmt_num(MOCK["retired_count"]), icon="🏅")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    col_a, col_b = st.columns(2)
-    with col_a:
-        with st.container(border=True): pie_chart(MOCK["collar"], "Beyaz / Mavi Yaka Dağılımı")
-    with col_b:
-        with st.container(border=True): pie_chart(MOCK["gender"], "Cinsiyete Göre Çalışan Sayısı")
-
-    col_c, col_d = st.columns(2)
-    with col_c:
-        with st.container(border=True): bar_chart(MOCK["age_groups"], "Yaş Skalasına Göre Çalışan Sayısı", color=BLUE)
-    with col_d:
-        with st.container(border=True): bar_chart(MOCK["tenure_groups"], "Kıdem Yılı Skalasına Göre Çalışan Sayısı", color="#7c3aed")
-
-    col_e, col_f = st.columns(2)
-    with col_e:
-        with st.container(border=True): bar_chart(MOCK["headcount_by_dept"], "Departmanlara Göre Çalışan Sayısı", color="#059669", horizontal=True)
-    with col_f:
-        with st.container(border=True): bar_chart(MOCK["headcount_by_position"], "Pozisyonlara Göre Çalışan Sayısı", color="#d97706", horizontal=True)
-
-    if period_type == "Yıllık":
-        with st.container(border=True):
-            trend_line(
-                TREND_PERIODS,
-                {"Çalışan Sayısı": MOCK["headcount_trend"]},
-                "Aylara Göre Çalışan Sayısı — Son 12 Ay",
-            )
-
+# ── Data ──────────────────────────────────────────────────────────────────────
+# The engines and caches are this process's shared instances, already open
+# when the server was started through hr_analytics.warmup; the spinners only
+# show on a cold worker.  Loaders take the shared engines' generation, which
+# a partition reload (hr_analytics.watch) bumps, so the next rerun after a
+# reload gets the new engines.
+@st.cache_resource(show_spinner="Veriler yükleniyor…", max_entries=1)
+def load_cube(generation):
+    return shared_engines().cube
+
+@st.cache_resource
+def aggregate_cache():
+    return shared_engines().cache
+
+@st.cache_resource(show_spinner="Veriler yükleniyor…", max_entries=1)
+def load_headcount_engine(generation):
+    return shared_engines().headcount
+
+@st.cache_resource(show_spinner="Maliyetler hesaplanıyor…", max_entries=1)
+def load_cost_engine(generation):
+    return shared_engines().cost
+
+@st.cache_resource(show_spinner="İzin bakiyeleri güncelleniyor…", max_entries=1)
+def load_leave_engine(generation):
+    return shared_engines().leave
+
+@st.cache_resource(show_spinner="Ücret dağılımları hazırlanıyor…", max_entries=1)
+def load_salary_sketches(generation):
+    return shared_engines().sketches
+
+@st.cache_resource(show_spinner="Kohortlar hazırlanıyor…", max_entries=1)
+def load_cohort_engine(generation):
+    return shared_engines().cohorts
+
+@st.cache_resource(show_spinner="Filtre dizini hazırlanıyor…", max_entries=1)
+def load_drill_engine(generation):
+    # Row-level store and bitmap index, loaded on the first state the cube can't answer
+    return shared_engines().drill
+
+@st.cache_resource
+def engines():
+    # Filter state → bundle (cube cell or drill-down), shared with the headless API
+    shared = shared_engines()
+
+    def current(load):
+        return lambda: load(shared.generation)
+
+    return Engines(
+        cache=aggregate_cache(), cube=current(load_cube), headcount=current(load_headcount_engine),
+        cost=current(load_cost_engine), leave=current(load_leave_engine),
+        sketches=current(load_salary_sketches), cohorts=current(load_cohort_engine),
+        drill=current(load_drill_engine),
+    )
 
-# ══════════════════════════════════════════════════════════════════════════════
-# TAB 2 — Ücret
-# ══════════════════════════════════════════════════════════════════════════════
-with tab2:
-    c1, c2, c3 = st.columns(3)
-    with c1: kpi("Ortalama Maaş", fmt_currency(MOCK["salary_avg"]), icon="💵")
-    with c2: kpi("Minimum Maaş", fmt_currency(MOCK["salary_min"]), icon="📉")
-    with c3: kpi("Maksimum Maaş", fmt_currency(MOCK["salary_max"]), icon="📈")
-
-    c4, c5, c6 = st.columns(3)
-    with c4: kpi("Ort. Saatlik Ücret", fmt_currency(MOCK["salary_hourly_avg"]), icon="⏱️")
-    with c5: kpi("Min. Saatlik Ücret", fmt_currency(MOCK["salary_hourly_min"]), icon="📉")
-    with c6: kpi("Maks. Saatlik Ücret", fmt_currency(MOCK["salary_hourly_max"]), icon="📈")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    col_a, col_b = st.columns(2)
-    with col_a:
-        with st.container(border=True): bar_chart(MOCK["salary_by_dept"], "Departmanlara Göre Ortalama Maaş (₺)", color=BLUE, horizontal=True)
-    with col_b:
-        with st.container(border=True): bar_chart(MOCK["salary_by_position"], "Pozisyona Göre Ortalama Maaş (₺)", color="#059669", horizontal=True)
-
-    with st.container(border=True): bar_chart(MOCK["salary_by_tenure"], "Kıdem Yılı Skalasına Göre Ortalama Maaş (₺)", color="#d97706")
-
-
-# ══════════════════════════════════════════════════════════════════════════════
-# TAB 3 — Maliyet
-# ══════════════════════════════════════════════════════════════════════════════
-with tab3:
-    c1, c2, c3 = st.columns(3)
-    with c1: kpi("Toplam İşçilik Maliyeti", fmt_currency(MOCK["cost_labor_total"]), icon="🏭")
-    with c2: kpi("Toplam SGK Maliyeti", fmt_currency(MOCK["cost_sgk_total"]), icon="🏛️")
-    with c3: kpi("Toplam Fazla Mesai Maliyeti", fmt_currency(MOCK["cost_overtime_total"]), icon="⚡")
-
-
-# ══════════════════════════════════════════════════════════════════════════════
-# TAB 4 — Fazla Mesai
-# ══════════════════════════════════════════════════════════════════════════════
-with tab4:
-    c1, c2 = st.columns(2)
-    with c1: kpi("Toplam Fazla Mesai Gün", f"{fmt_num(MOCK['overtime_total'])} saat", icon="🕐")
-    with c2: kpi("Ortalama Fazla Mesai", f"{fmt_num(MOCK['overtime_avg'], 1)} saat", icon="📊")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    col_a, col_b = st.columns(2)
-    with col_a:
-        with st.container(border=True): bar_chart(MOCK["overtime_by_position"], "Pozisyonlara Göre Ortalama FM (saat)", color=BLUE, horizontal=True)
-    with col_b:
-        with st.container(border=True): pie_chart(MOCK["overtime_by_type"], "Fazla Mesai Türü Dağılımı")
-
-
-# ══════════════════════════════════════════════════════════════════════════════
-# TAB 5 — Devamsızlık
-# ══════════════════════════════════════════════════════════════════════════════
-with tab5:
-    c1, c2, c3 = st.columns(3)
-    with c1: kpi("Toplam Devamsızlık", f"{fmt_num(MOCK['total_absent_days'])} gün", icon="📋")
-    with c2: kpi("Ortalama Devamsızlık", f"{fmt_num(MOCK['avg_absent_days'], 2)} gün", icon="📉")
-    with c3: kpi("Toplam Yıllık İzin Bakiyesi", f"{fmt_num(MOCK['total_annual_leave_balance'])} gün", icon="🏖️")
-
-    c4, c5, c6 = st.columns(3)
-    with c4: kpi("Ort. Yıllık İzin Bakiyesi", f"{fmt_num(MOCK['avg_annual_leave_balance'], 1)} gün", icon="📅")
-    with c5: kpi("Toplam Kullanılan Yıllık İzin", f"{fmt_num(MOCK['total_used_annual_leave'])} gün", icon="✅")
-    with c6: kpi("Ort. Kullanılan Yıllık İzin", f"{fmt_num(MOCK['avg_used_annual_leave'], 1)} gün", icon="📊")
-
-    st.markdown("<br>", unsafe_allow_html=True)
-
-    col_a, col_b = st.columns(2)
-    with col_a:
-        with st.container(border=True): pie_chart(MOCK["absence_types"], "Devamsızlık Türüne Göre Dağılım")
-    with col_b:
-        with st.container(border=True): bar_chart(MOCK["absence_by_tenure"], "Kıdem Skalasına Göre Devamsızlık (gün)", color="#d97706")
-
-    with st.container(border=True): bar_chart(MOCK["absence_by_age"], "Yaş Skalasına Göre Devamsızlık (gün)", color="#7c3aed")
-
-
-# ══════════════════════════════════════════════════════════════════════════════
-# TAB 6 — İşe Alım & Çıkış
-# ══════════════════════════════════════════════════════════════════════════════
-with tab6:
-    c1, c2, c3 = st.columns(3)
-    with c1: kpi("İş Başı Yapan Çalışan", fmt_num(MOCK["hires"]), icon="🟢")
-    with c2: kpi("İşten Çıkan Çalışan", fmt_num(MOCK["terminations"]), icon="🔴")
-    if period_type == "Yıllık":
-        with c3: kpi("Turnover Oranı (Yıllık)", f"%{fmt_num(MOCK['turnover_rate_yearly'], 1)}", icon="📆")
+@st.cache_resource
+def watcher():
+    # Reloads changed company × month partitions in the background (HR_WATCH=0 disables)
+    return shared_watcher()
+
+@st.cache_resource
+def prefetcher():
+    # Adjacent periods, period types and sibling departments (HR_PREFETCH=0 disables)
+    return Prefetcher(engines())
+
+if profiler is not None:
+    profiler.state = {"period_type": period_type, "period": selected_period, "nav": NAV_MODE,
+                      "filters": {dim: values for dim, values in filters.items() if values}}
+
+if WATCH:
+    watcher()
+with span("data", "cube"):
+    cube = engines().cube
+with span("data", "bundle"):
+    if cube is None:
+        data = MOCK
     else:
-        with c3: kpi("Turnover Oranı", f"%{fmt_num(MOCK['turnover_rate_monthly'], 1)}", icon="🔄")
-
-
-    st.markdown("<br>", unsafe_allow_html=True)
+        if PREFETCH:
+            prefetcher().record(filters, period_type, selected_period)
+        data = engines().bundle(filters, period_type, selected_period)
+
+# ── Sections ──────────────────────────────────────────────────────────────────
+# Each former tab is a function in hr_analytics.sections so that only the
+# visible one needs to run; batch reports render the same definitions.
+UI = SimpleNamespace(
+    columns=st.columns,
+    card=lambda: st.container(border=True),
+    spacer=lambda: st.markdown("<br>", unsafe_allow_html=True),
+    kpi=kpi, bar_chart=bar_chart, pie_chart=pie_chart, trend_line=trend_line, band_chart=band_chart,
+)
 
-    col_a, col_b = st.columns(2)
-    with col_a:
-        with st.container(border=True): pie_chart(MOCK["termination_reasons"], "İşten Çıkış Sebebi Dağılımı")
-    with col_b:
-        with st.container(border=True): pie_chart(MOCK["termination_by_collar"], "Yaka Rengine Göre İşten Çıkma Dağılımı")
+# ── Navigation ────────────────────────────────────────────────────────────────
+if NAV_MODE == "tabs":
+    # Legacy mode: every tab body runs and is sent on each rerun
+    for tab, (label, render) in zip(st.tabs(list(SECTIONS)), SECTIONS.items()):
+        with tab, span("section", label):
+            render(UI, data, period_type)
+else:
+    # Clicking the active segment deselects it; keep showing the last section
+    picked = st.segmented_control("section", list(SECTIONS), key="section",
+                                  default=next(iter(SECTIONS)), label_visibility="collapsed")
+    if picked:
+        st.session_state["last_section"] = picked
+    active = st.session_state.get("last_section", next(iter(SECTIONS)))
+    if profiler is not None:
+        profiler.state["section"] = active
+    with span("section", active):
+        SECTIONS[active](UI, data, period_type)
+
+if cube is not None and PREFETCH:
+    st.session_state["prefetch"] = prefetcher().schedule(filters, period_type, selected_period)
+
+
+# ── Admin ─────────────────────────────────────────────────────────────────────
+if ADMIN_TOKEN and hmac.compare_digest(st.query_params.get("admin", ""), ADMIN_TOKEN):
+    with st.expander("Yönetici · Önbellek Durumu"):
+        c1, c2, c3, c4 = st.columns(4)
+        with c1:
+            st.caption("Veri önbelleği (filtre başına)")
+            st.json(aggregate_cache().stats())
+            if WATCH:
+                st.caption("Veri yenileme (şirket × ay bölümleri)")
+                st.json(watcher().stats())
+        with c2:
+            st.caption("Grafik önbelleği")
+            st.json(figure_cache().stats())
+        if cube is not None:
+            with c3:
+                st.caption("Satır deposu ve filtre dizini")
+                drill_stats = engines().drill.stats()
+                st.json(drill_stats)
+            if PREFETCH:
+                with c4:
+                    st.caption("Ön yükleme (komşu filtreler)")
+                    st.json(prefetcher().stats())
+            mem = drill_stats["store"]
+            st.caption(
+                f"Bellek: çalışan verisi {mem['bytes'] / 2**20:,.1f} MB "
+                f"(nesne sütunlarıyla {mem['naive_object_bytes'] / 2**20:,.1f} MB, "
+                f"×{mem['reduction']:.1f} daha az) · işlem RSS {process_rss() / 2**20:,.0f} MB"
+            )
 
-    with st.container(border=True): bar_chart(MOCK["termination_by_tenure"], "Kıdeme Göre İşten Çıkma Dağılımı", color="#dc2626")
 
-    if period_type == "Yıllık":
-        with st.container(border=True):
-            trend_line(
-                TREND_PERIODS,
-                {"İşe Alım": MOCK["hires_trend"], "İşten Çıkış": MOCK["terminations_trend"]},
-                "Aylara Göre İşe Alım & Çıkma — Son 12 Ay",
-            )
+# ── Profiling ─────────────────────────────────────────────────────────────────
+if profiler is not None:
+    profiling.activate(None)
+    total_ms = profiler.total_ms()
+    try:
+        profiler.write()
+        log_note = f"{len(profiler.spans) + 1} satır → {profiling.LOG_PATH}"
+    except OSError as exc:
+        log_note = f"{profiling.LOG_PATH} yazılamadı: {exc}"
+    with st.expander(f"Profil · {total_ms:,.0f} ms · {len(profiler.spans)} ölçüm"):
+        st.caption(f"Çalıştırma {profiler.run} · {log_note}")
+        st.caption("Tür başına (öz süre: alt ölçümler hariç)")
+        st.dataframe(
+            [{"tür": kind, "çağrı": row["calls"], "toplam ms": round(row["ms"], 2),
+              "öz ms": round(row["self_ms"], 2)}
+             for kind, row in sorted(profiler.summary().items(), key=lambda kv: -kv[1]["self_ms"])],
+            hide_index=True, width="stretch",
+        )
+        depth = {}
+        for rec in profiler.spans:
+            depth[rec["id"]] = 0 if rec["parent"] is None else depth[rec["parent"]] + 1
+        st.caption("Ölçümler")
+        st.dataframe(
+            [{"ölçüm": "\u2003" * depth[rec["id"]] + f"{rec['kind']} · {rec['name']}",
+              "başlangıç ms": round(rec["start_ms"], 2), "ms": round(rec.get("ms", 0.0), 2)}
+             for rec in profiler.spans],
+            hide_index=True, width="stretch",
+        )
@@ -0,0 +1,254 @@
+"""
+Rerun-latency benchmark for app.py, driven headlessly through Streamlit's AppTest.
+
+    python benchmarks/bench_app.py --employees 200000 --data /tmp/hr-bench --out bench.json
+    python benchmarks/bench_app.py --compare base.json bench.json
+
+For every section × filter combination the script switches the session to
+that state, reruns it ``--runs`` times and records the script-run time
+(first / p50 / p95), the peak Python allocation of one traced rerun and the
+serialized size of the ForwardMsgs the rerun produced.  The data directory
+is generated with ``hr_analytics.generate`` when it is empty.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+SCHEMA = 1
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ── AppTest plumbing ──────────────────────────────────────────────────────────
+class _Payload:
+    """Records the serialized size of the messages each script run produced."""
+
+    last_bytes = 0
+
+    @classmethod
+    def install(cls):
+        import streamlit.testing.v1.local_script_runner as lsr
+
+        parse = lsr.parse_tree_from_messages
+
+        def measured(messages):
+            cls.last_bytes = sum(m.ByteSize() for m in messages)
+            return parse(messages)
+
+        lsr.parse_tree_from_messages = measured
+
+
+def _patch_button_group():
+    # AppTest compares formatted option strings with the option protos, which
+    # fails once Streamlit splits a leading emoji into ``content_icon``
+    import streamlit.testing.v1.element_tree as et
+
+    def indices(self):
+        labels = [f"{o.content_icon} {o.content}" if o.content_icon else o.content for o in self.options]
+        value = self.value
+        values = value if isinstance(value, list) else [] if value is None else [value]
+        return [labels.index(v) for v in values]
+
+    et.ButtonGroup.indices = property(indices)
+
+
+def _select(at, company, period_type, period, dept):
+    from hr_analytics.dims import COMPANIES, DEPARTMENTS
+
+    at.selectbox[0].set_value(period_type).run()
+    at.selectbox[1].set_value(period)
+    at.multiselect(key="flt_company").set_value([] if company == COMPANIES[0] else [company])
+    at.multiselect(key="flt_department").set_value([] if dept == DEPARTMENTS[0] else [dept])
+
+
+def _timed_run(at):
+    t = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - t
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────────────
+def filter_states():
+    from hr_analytics.dims import COMPANIES, DEPARTMENTS, PERIOD_TYPES, period_options
+
+    for company, period_type in itertools.product(COMPANIES, PERIOD_TYPES):
+        for period in period_options(period_type)[0]:
+            for dept in DEPARTMENTS:
+                yield company, period_type, period, dept
+
+
+def dataset_info(root):
+    import pyarrow.parquet as pq
+
+    root = Path(root)
+    parts = sorted((root / "snapshots").glob("*/*.parquet"))
+    return {
+        "employees": pq.ParquetFile(root / "employees.parquet").metadata.num_rows,
+        "employee_months": sum(pq.ParquetFile(f).metadata.num_rows for f in parts),
+        "partitions": len(parts),
+    }
+
+
+def run(args):
+    from streamlit.testing.v1 import AppTest
+
+    from hr_analytics.generate import generate
+    from hr_analytics.store import has_data
+
+    if not has_data(args.data):
+        print(f"generating {args.employees:,} employees → {args.data}", file=sys.stderr)
+        generate(args.employees, args.months, args.data, args.seed)
+
+    _Payload.install()
+    _patch_button_group()
+
+    def new_session():
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=args.timeout)
+        at.run()
+        return at
+
+    t = time.perf_counter()
+    at = new_session()
+    startup = time.perf_counter() - t
+    sections = [o.content if not o.content_icon else f"{o.content_icon} {o.content}"
+                for o in at.button_group[0].options] if args.nav == "sections" else ["(tüm sekmeler)"]
+
+    states = list(filter_states())
+    if args.sample:
+        states = random.Random(args.seed).sample(states, min(args.sample, len(states)))
+
+    results = []
+    for i, state in enumerate(states):
+        _select(at, *state)
+        for section in sections:
+            if args.nav == "sections":
+                at.button_group[0].set_value(section)
+            times = [_timed_run(at) for _ in range(args.runs)]
+            payload = _Payload.last_bytes
+            peak = None
+            if args.memory:
+                tracemalloc.start()
+                _timed_run(at)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            results.append({
+                "section": section,
+                "company": state[0], "period_type": state[1], "period": state[2], "dept": state[3],
+                "first_s": times[0],
+                "p50_s": _percentile(times, 50),
+                "p95_s": _percentile(times, 95),
+                "peak_alloc_bytes": peak,
+                "payload_bytes": payload,
+            })
+        print(f"\r{i + 1}/{len(states)} filter states", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    p50 = [r["p50_s"] for r in results]
+    return {
+        "schema": SCHEMA,
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "nav_mode": args.nav,
+            "runs": args.runs,
+            "data": {"dir": str(args.data), **dataset_info(args.data)},
+            "startup_s": startup,
+        },
+        "summary": {
+            "combinations": len(results),
+            "p50_s": _percentile(p50, 50),
+            "p95_s": _percentile([r["p95_s"] for r in results], 95),
+            "max_s": max(p50, default=0.0),
+            "payload_p50_bytes": _percentile([r["payload_bytes"] for r in results], 50),
+            "payload_max_bytes": max((r["payload_bytes"] for r in results), default=0),
+            "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        },
+        "results": results,
+    }
+
+
+# ── Comparison ────────────────────────────────────────────────────────────────
+def _key(r):
+    return r["section"], r["company"], r["period_type"], r["period"], r["dept"]
+
+
+def compare(base_path, new_path, threshold):
+    base, new = (json.loads(Path(p).read_text()) for p in (base_path, new_path))
+    print(f"{'':24}{'base':>12}{'new':>12}{'ratio':>8}")
+    for name in ("p50_s", "p95_s", "payload_p50_bytes", "payload_max_bytes", "peak_rss_bytes"):
+        a, b = base["summary"][name], new["summary"][name]
+        print(f"{name:24}{a:>12.4g}{b:>12.4g}{b / a if a else float('nan'):>8.2f}")
+
+    old = {_key(r): r for r in base["results"]}
+    slower = []
+    for r in new["results"]:
+        o = old.get(_key(r))
+        if o and o["p50_s"] > 0 and r["p50_s"] / o["p50_s"] > 1 + threshold:
+            slower.append((r["p50_s"] / o["p50_s"], _key(r)))
+    print(f"\n{len(slower)} combinations slower than {threshold:.0%} (p50)")
+    for ratio, key in sorted(slower, reverse=True)[:20]:
+        print(f"  ×{ratio:.2f}  {' · '.join(key)}")
+    return 1 if slower else 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark dashboard reruns with AppTest.")
+    ap.add_argument("--data", type=Path, default=Path(os.environ.get("HR_DATA_DIR", "/tmp/hr-bench")))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--months", type=int, default=36)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--runs", type=int, default=5, help="timed reruns per combination")
+    ap.add_argument("--sample", type=int, default=0, help="benchmark this many random filter states (0 = all)")
+    ap.add_argument("--nav", choices=["sections", "tabs"], default="sections")
+    ap.add_argument("--no-memory", dest="memory", action="store_false", help="skip the traced rerun")
+    ap.add_argument("--timeout", type=float, default=120)
+    ap.add_argument("--out", type=Path)
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    ap.add_argument("--threshold", type=float, default=0.10, help="regression threshold for --compare")
+    args = ap.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+
+    # The data layer reads its location at import time
+    os.environ["HR_DATA_DIR"] = str(args.data)
+    os.environ["HR_NAV_MODE"] = args.nav
+    report = run(args)
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.out:
+        args.out.write_text(text)
+    print(json.dumps(report["summary"], indent=1))
+
+
+if __name__ == "__main__":
+    main()
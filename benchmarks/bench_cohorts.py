@@ -0,0 +1,103 @@
+"""
+Hire-cohort engine speed on millions of employee records.
+
+    python benchmarks/bench_cohorts.py --employees 5000000
+
+Draws the synthetic employee table only (no snapshots), builds
+``CohortEngine`` from its hire and termination dates and times the survival
+curves, per-cohort retention and tenure at exit of every company ×
+department cell for the default period of each period type, KPI windows
+included.  The all-company curve of the yearly period is checked against a
+naive scan that tests every cohort member on every month end.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hr_analytics.cohorts import COHORTS, HORIZON, CohortEngine  # noqa: E402
+from hr_analytics.dims import COMPANIES, DEPARTMENTS, PERIOD_TYPES, month_end_day, period_months, period_options  # noqa: E402
+from hr_analytics.generate import LAST_MONTH, employees  # noqa: E402
+
+
+def days(series):
+    d = series.to_numpy("datetime64[D]")
+    return np.where(np.isnat(d), -1, d.astype(np.int64))
+
+
+def naive_curve(hire, term, as_of):
+    hire_month = hire.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) + 1970 * 12
+    risk, gone = np.zeros(HORIZON + 1), np.zeros(HORIZON + 1)
+    for cohort in range(as_of - COHORTS + 1, as_of + 1):
+        t = term[hire_month == cohort]
+        before = np.ones(len(t), dtype=bool)
+        for k in range(as_of - cohort + 1):
+            on_payroll = (t < 0) | (t >= month_end_day(cohort + k))
+            risk[k] += before.sum()
+            gone[k] += (before & ~on_payroll).sum()
+            before = on_payroll
+    curve = np.cumprod(1 - np.divide(gone, risk, out=np.zeros_like(gone), where=risk > 0)) * 100
+    return [float(v) if ok else None for v, ok in zip(curve, np.cumprod(risk > 0).astype(bool))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Time the hire-cohort engine.")
+    ap.add_argument("--employees", type=int, default=5_000_000)
+    ap.add_argument("--months", type=int, default=36)
+    ap.add_argument("--out", type=Path)
+    args = ap.parse_args()
+
+    emp, _ = employees(args.employees, args.months, np.random.default_rng(7))
+    company = emp["company"].cat.codes.to_numpy()
+    dept = emp["department"].cat.codes.to_numpy()
+    hire, term = days(emp["hire_date"]), days(emp["termination_date"])
+    del emp
+
+    t = time.perf_counter()
+    engine = CohortEngine(company, dept, hire, term, LAST_MONTH - args.months + 1, LAST_MONTH)
+    build_s = time.perf_counter() - t
+
+    states = {}
+    for period_type in PERIOD_TYPES:
+        options, default = period_options(period_type)
+        t = time.perf_counter()
+        for c in COMPANIES:
+            for d in DEPARTMENTS:
+                engine.bundle(c, period_type, options[default], d)
+                engine.kpi_windows(c, period_type, options[default], d)
+        states[period_type] = time.perf_counter() - t
+
+    period = period_options("Yıllık")[0][period_options("Yıllık")[1]]
+    as_of = min(period_months("Yıllık", period)[-1], LAST_MONTH)
+    t = time.perf_counter()
+    want = naive_curve(hire, term, as_of)
+    naive_s = time.perf_counter() - t
+    got = engine.bundle(COMPANIES[0], "Yıllık", period, DEPARTMENTS[0])["survival_curve"]["Tüm Kohortlar"]
+    match = all((a is None and b is None) or (a is not None and b is not None and math.isclose(a, b, abs_tol=1e-9))
+                for a, b in zip(got, want))
+
+    result = {
+        "employees": args.employees,
+        "cohorts": COHORTS,
+        "cells": len(COMPANIES) * len(DEPARTMENTS),
+        "build_s": build_s,
+        "all_cells_s": states,
+        "engine_bytes": int(engine.stays.nbytes + engine.exits.nbytes + engine.exit_days.nbytes),
+        "naive_one_cell_s": naive_s,
+        "curve_matches_naive": match,
+    }
+    print(json.dumps(result, indent=1, ensure_ascii=False))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cube rebuild: single process against the company-partitioned process pool.
+
+    python benchmarks/bench_cube.py --data /tmp/hr-bench --workers 1 2 4 8
+
+The single-process path loads the whole store and builds the cube; the
+pooled path (``cube.build_parallel``) has each worker read its company ×
+month-block partitions and return only those cells.  Both include reading
+the Parquet files.  Every pooled cube must equal the single-process cube
+exactly; exits non-zero otherwise.  Speedups are bounded by the cores
+available (reported as ``cpus``).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hr_analytics.cube import Cube, build_parallel  # noqa: E402
+from hr_analytics.generate import generate  # noqa: E402
+from hr_analytics.store import HRStore, has_data  # noqa: E402
+
+
+def same(a, b):
+    return all(np.array_equal(getattr(a, n), getattr(b, n)) for n in ("sums", "mins", "maxs"))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare single-process and pooled cube builds.")
+    ap.add_argument("--data", type=Path, default=Path("/tmp/hr-bench"))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", type=Path)
+    args = ap.parse_args()
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+
+    def best(fn):
+        times = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            out = fn()
+            times.append(time.perf_counter() - t)
+        return out, min(times)
+
+    reference, single_s = best(lambda: Cube.build(HRStore.open(args.data)))
+    result = {"cpus": len(os.sched_getaffinity(0)), "single_s": single_s, "pool": {}, "mismatches": 0}
+    for workers in args.workers:
+        cube, pool_s = best(lambda: build_parallel(args.data, workers))
+        ok = same(cube, reference)
+        result["mismatches"] += not ok
+        result["pool"][workers] = {"s": pool_s, "speedup": single_s / pool_s, "exact": ok}
+
+    print(json.dumps(result, indent=1))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1))
+    sys.exit(1 if result["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Drill-down row selection: bitmap index against boolean masks over the rows.
+
+    python benchmarks/bench_drill.py --data /tmp/hr-bench --states 200
+
+Random filter states (one to three dimensions, one or two values each, over
+a random period) are resolved both through ``BitmapIndex`` and as NumPy
+boolean masks over every snapshot row; the row sets must be identical.
+Reports index size and build time, selection latency of both and the time
+of the full drill-down bundle.  Exits non-zero on any mismatch.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hr_analytics.bitmap import DIMENSIONS, BitmapIndex, row_codes  # noqa: E402
+from hr_analytics.dims import PERIOD_TYPES, period_months, period_options  # noqa: E402
+from hr_analytics.drill import DrillEngine  # noqa: E402
+from hr_analytics.generate import generate  # noqa: E402
+from hr_analytics.leave import LeaveEngine  # noqa: E402
+from hr_analytics.store import HRStore, has_data  # noqa: E402
+
+
+def random_states(n, seed):
+    rng = np.random.default_rng(seed)
+    dims = list(DIMENSIONS)
+    for _ in range(n):
+        filters = {}
+        for dim in rng.choice(dims, size=rng.integers(1, 4), replace=False):
+            labels = DIMENSIONS[dim][1:] if dim in ("company", "department") else DIMENSIONS[dim]
+            filters[str(dim)] = [str(v) for v in rng.choice(labels, size=rng.integers(1, 3), replace=False)]
+        period_type = str(rng.choice(PERIOD_TYPES))
+        opts, _ = period_options(period_type)
+        yield filters, period_type, str(rng.choice(opts))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare bitmap drill-down selection with boolean masks.")
+    ap.add_argument("--data", type=Path, default=Path("/tmp/hr-bench"))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--states", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", type=Path)
+    args = ap.parse_args()
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+    store = HRStore.open(args.data)
+    t = time.perf_counter()
+    index = BitmapIndex.build(store)
+    build_s = time.perf_counter() - t
+    engine = DrillEngine(store, index, LeaveEngine.open(args.data))
+    codes = {dim: row_codes(store, dim) for dim in DIMENSIONS}
+    month = store.snap("month")
+
+    bitmap_s, mask_s, bundle_s, mismatches = [], [], [], 0
+    for filters, period_type, period in random_states(args.states, args.seed):
+        months = period_months(period_type, period)
+
+        t = time.perf_counter()
+        got = index.rows(filters, months)
+        bitmap_s.append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        mask = np.isin(month, months)
+        for dim, values in filters.items():
+            mask &= np.isin(codes[dim], [DIMENSIONS[dim].index(v) for v in values])
+        want = np.flatnonzero(mask)
+        mask_s.append(time.perf_counter() - t)
+        mismatches += not np.array_equal(got, want)
+
+        t = time.perf_counter()
+        engine.bundle(filters, period_type, period)
+        bundle_s.append(time.perf_counter() - t)
+
+    stats = index.stats()
+    result = {
+        **stats,
+        "compression": stats["uncompressed_bytes"] / stats["bytes"],
+        "build_s": build_s,
+        "states": args.states,
+        "mismatches": mismatches,
+        "bitmap_p50_ms": float(np.percentile(bitmap_s, 50) * 1e3),
+        "mask_p50_ms": float(np.percentile(mask_s, 50) * 1e3),
+        "speedup_p50": float(np.percentile(mask_s, 50) / np.percentile(bitmap_s, 50)),
+        "bundle_p50_ms": float(np.percentile(bundle_s, 50) * 1e3),
+        "bundle_p95_ms": float(np.percentile(bundle_s, 95) * 1e3),
+    }
+    print(json.dumps(result, indent=1))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Resident memory of the employee data: compact ``HRStore`` vs object columns.
+
+    python benchmarks/bench_memory.py --data /tmp/hr-bench
+
+Each layout is loaded in a fresh interpreter, which reports its resident
+set growth once the load's temporaries are freed and returned to the OS:
+
+    naive     employees + snapshots as pandas frames with the Turkish labels
+              as Python object columns, float64 money and datetime64 dates
+    compact   ``HRStore.open`` (int8 codes, int16 months, int32 days, kuruş)
+
+Exits non-zero if the reduction is below ``--min-reduction``.
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _settle():
+    """Collect garbage and hand freed allocator pages back to the OS."""
+    import ctypes
+
+    import pyarrow as pa
+
+    gc.collect()
+    pa.default_memory_pool().release_unused()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except OSError:
+        pass
+
+
+def _load(layout, root):
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    from hr_analytics.store import HRStore
+
+    _settle()
+    before = _rss()
+    if layout == "naive":
+        # One str object per cell, as a CSV or Excel import produces
+        frames = [
+            pq.read_table(path).to_pandas(deduplicate_objects=False)
+            for path in (root / "employees.parquet", root / "snapshots")
+        ]
+        for col in ("birth_date", "hire_date", "termination_date"):
+            frames[0][col] = pd.to_datetime(frames[0][col])
+        deep = sum(int(df.memory_usage(deep=True).sum()) for df in frames)
+        held = frames
+    else:
+        store = HRStore.open(root)
+        usage = store.memory_usage()
+        deep = usage["bytes"]
+        held = store
+    _settle()
+    result = {"layout": layout, "rss_bytes": _rss() - before, "deep_bytes": deep}
+    if layout == "compact":
+        result["estimated_naive_bytes"] = usage["naive_object_bytes"]
+    del held
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare resident memory of naive and compact employee data.")
+    ap.add_argument("--data", type=Path, default=Path("/tmp/hr-bench"))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--min-reduction", type=float, default=5.0)
+    ap.add_argument("--out", type=Path)
+    ap.add_argument("--layout", choices=["naive", "compact"], help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.layout:
+        print(json.dumps(_load(args.layout, args.data)))
+        return
+
+    from hr_analytics.generate import generate
+    from hr_analytics.store import has_data
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+    runs = {}
+    for layout in ("naive", "compact"):
+        out = subprocess.run([sys.executable, __file__, "--data", str(args.data), "--layout", layout],
+                             capture_output=True, text=True, check=True).stdout
+        runs[layout] = json.loads(out.splitlines()[-1])
+    report = {
+        **runs,
+        "rss_reduction": runs["naive"]["rss_bytes"] / max(runs["compact"]["rss_bytes"], 1),
+        "deep_reduction": runs["naive"]["deep_bytes"] / max(runs["compact"]["deep_bytes"], 1),
+    }
+    print(json.dumps(report, indent=1))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=1))
+    sys.exit(0 if report["rss_reduction"] >= args.min_reduction else 1)
+
+
+if __name__ == "__main__":
+    main()
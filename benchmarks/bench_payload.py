@@ -0,0 +1,162 @@
+"""
+Websocket bytes per rerun, full against compact chart payloads.
+
+    python benchmarks/bench_payload.py --data /tmp/hr-bench --steps 60
+
+Each mode runs in its own process (``HR_PAYLOAD`` is read at startup) and
+replays the same seeded session through AppTest: every step changes the
+company, department, period type, period or section, or just reruns
+unchanged.  For every rerun the script records the serialized size of the
+ForwardMsgs and the bytes actually sent to a browser, emulating its message
+cache: a cacheable message whose hash the client already holds goes out as
+a hash reference, as ``ScriptRunContext.enqueue`` does for a real session.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MODES = ("full", "compact")
+
+
+def session(steps, seed):
+    from hr_analytics.dims import COMPANIES, DEPARTMENTS, PERIOD_TYPES, period_options
+
+    rng = random.Random(seed)
+    opts, default = period_options(PERIOD_TYPES[0])
+    state = {"company": COMPANIES[0], "period_type": PERIOD_TYPES[0], "period": opts[default],
+             "dept": DEPARTMENTS[0], "section": 0}
+    yield "start", dict(state)
+    for _ in range(steps):
+        move = rng.choice(["company", "dept", "period", "period_type", "section", "section", "rerun"])
+        if move == "company":
+            state["company"] = rng.choice(COMPANIES)
+        elif move == "dept":
+            state["dept"] = rng.choice(DEPARTMENTS)
+        elif move == "period_type":
+            state["period_type"] = rng.choice(PERIOD_TYPES)
+            opts, default = period_options(state["period_type"])
+            state["period"] = opts[default]
+        elif move == "period":
+            state["period"] = rng.choice(period_options(state["period_type"])[0])
+        elif move == "section":
+            state["section"] = rng.randrange(6)
+        yield move, dict(state)
+
+
+def child(steps, seed, timeout):
+    import streamlit.testing.v1.local_script_runner as lsr
+    from streamlit import config as st_config
+    from streamlit.runtime.forward_msg_cache import create_reference_msg
+    from streamlit.testing.v1 import AppTest
+
+    from bench_app import _patch_button_group
+    from hr_analytics.dims import COMPANIES, DEPARTMENTS
+    from hr_analytics.warmup import COMPACT_MIN_CACHED_MESSAGE_SIZE
+
+    if os.environ.get("HR_PAYLOAD") == "compact":
+        # As hr_analytics.warmup.main configures the server; AppTest skips the CLI
+        st_config.set_option("global.minCachedMessageSize", COMPACT_MIN_CACHED_MESSAGE_SIZE)
+    captured = []
+    parse = lsr.parse_tree_from_messages
+
+    def capture(messages):
+        captured[:] = messages
+        return parse(messages)
+
+    lsr.parse_tree_from_messages = capture
+    _patch_button_group()
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout)
+    client = set()              # hashes the emulated browser has cached
+    runs = []
+    for move, state in session(steps, seed):
+        if move != "start":
+            if at.selectbox[0].value != state["period_type"]:
+                at.selectbox[0].set_value(state["period_type"]).run()
+            at.selectbox[1].set_value(state["period"])
+            at.multiselect(key="flt_company").set_value([] if state["company"] == COMPANIES[0] else [state["company"]])
+            at.multiselect(key="flt_department").set_value([] if state["dept"] == DEPARTMENTS[0] else [state["dept"]])
+            options = at.button_group[0].options
+            o = options[state["section"]]
+            at.button_group[0].set_value(f"{o.content_icon} {o.content}" if o.content_icon else o.content)
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        raw = wire = charts = charts_sent = 0
+        for msg in captured:
+            size = msg.ByteSize()
+            raw += size
+            is_chart = msg.WhichOneof("type") == "delta" and msg.delta.new_element.WhichOneof("type") == "plotly_chart"
+            charts += is_chart
+            if msg.metadata.cacheable and msg.hash in client:
+                wire += create_reference_msg(msg).ByteSize()
+            else:
+                wire += size
+                charts_sent += is_chart
+                if msg.metadata.cacheable:
+                    client.add(msg.hash)
+        runs.append({"move": move, "raw_bytes": raw, "wire_bytes": wire, "charts": charts, "charts_sent": charts_sent})
+    return runs
+
+
+def summarize(runs):
+    return {
+        "reruns": len(runs),
+        "raw_mean_bytes": statistics.mean(r["raw_bytes"] for r in runs),
+        "wire_mean_bytes": statistics.mean(r["wire_bytes"] for r in runs),
+        "wire_p50_bytes": statistics.median(r["wire_bytes"] for r in runs),
+        "wire_total_bytes": sum(r["wire_bytes"] for r in runs),
+        "charts_sent_share": sum(r["charts_sent"] for r in runs) / max(1, sum(r["charts"] for r in runs)),
+        "unchanged_rerun_wire_bytes": statistics.mean(
+            [r["wire_bytes"] for r in runs if r["move"] == "rerun"] or [0]),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare websocket bytes per rerun of full and compact payloads.")
+    ap.add_argument("--data", type=Path, default=Path(os.environ.get("HR_DATA_DIR", "/tmp/hr-bench")))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--steps", type=int, default=60)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--timeout", type=float, default=120)
+    ap.add_argument("--out", type=Path)
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.steps, args.seed, args.timeout)))
+        return
+
+    from hr_analytics.generate import generate
+    from hr_analytics.store import has_data
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+
+    result = {}
+    for mode in MODES:
+        env = {**os.environ, "HR_DATA_DIR": str(args.data), "HR_NAV_MODE": "sections", "HR_PAYLOAD": mode}
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", "--steps", str(args.steps), "--seed", str(args.seed),
+             "--timeout", str(args.timeout)],
+            env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        result[mode] = summarize(json.loads(out.strip().splitlines()[-1]))
+    result["wire_reduction"] = result["full"]["wire_total_bytes"] / result["compact"]["wire_total_bytes"]
+
+    print(json.dumps(result, indent=1))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1))
+
+
+if __name__ == "__main__":
+    main()
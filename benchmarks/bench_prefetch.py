@@ -0,0 +1,121 @@
+"""
+Foreground latency and hit rate of the background prefetcher.
+
+    python benchmarks/bench_prefetch.py --data /tmp/hr-bench --steps 80 --think 0.5
+
+Replays the same seeded navigation walk twice against ``service.Engines``
+with an empty cache, without and with a ``Prefetcher``: each step moves to
+an adjacent period, a sibling department, another period type, or toggles
+a drill-down filter (which the cube can't answer), waits ``--think``
+seconds like a user reading the page, then requests the bundle.  Reports
+foreground latency per step, the prefetcher's stats (hit rate, precision,
+CPU used) and the latency of cold requests in both runs, which shows
+whether prefetch slows the foreground.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hr_analytics.cache import AggregateCache  # noqa: E402
+from hr_analytics.dims import DEPARTMENTS, PERIOD_TYPES, period_options  # noqa: E402
+from hr_analytics.generate import generate  # noqa: E402
+from hr_analytics.prefetch import Prefetcher  # noqa: E402
+from hr_analytics.service import Engines  # noqa: E402
+from hr_analytics.store import has_data  # noqa: E402
+
+
+def walk(steps, seed):
+    rng = random.Random(seed)
+    period_type = PERIOD_TYPES[0]
+    opts, i = period_options(period_type)
+    dept, gender = None, None
+    for _ in range(steps):
+        move = rng.choices(["period", "dept", "period_type", "drill"], [0.4, 0.3, 0.15, 0.15])[0]
+        if move == "period":
+            i = max(0, min(len(opts) - 1, i + rng.choice([-1, -1, 1])))
+        elif move == "dept":
+            depts = DEPARTMENTS[1:]
+            j = depts.index(dept) if dept else rng.randrange(len(depts))
+            dept = depts[max(0, min(len(depts) - 1, j + rng.choice([-1, 1])))]
+        elif move == "period_type":
+            period_type = rng.choice([t for t in PERIOD_TYPES if t != period_type])
+            opts, i = period_options(period_type)
+        else:
+            gender = None if gender else "Kadın"
+        filters = {"department": [dept] if dept else [], "gender": [gender] if gender else []}
+        yield filters, period_type, opts[i]
+
+
+def run(engines, steps, seed, think, prefetch):
+    engines.cache.clear()
+    prefetcher = Prefetcher(engines) if prefetch else None
+    batch = None
+    latencies, cold = [], []
+    for state in walk(steps, seed):
+        time.sleep(think)
+        if batch is not None:
+            batch.cancel()
+        was_cached = engines.cached(*state)
+        if prefetcher is not None:
+            prefetcher.record(*state)
+        t = time.perf_counter()
+        engines.bundle(*state)
+        elapsed = time.perf_counter() - t
+        latencies.append(elapsed)
+        if not was_cached:
+            cold.append(elapsed)
+        if prefetcher is not None:
+            batch = prefetcher.schedule(*state)
+    if batch is not None:
+        batch.cancel()
+    result = {
+        "p50_ms": statistics.median(latencies) * 1e3,
+        "mean_ms": statistics.mean(latencies) * 1e3,
+        "max_ms": max(latencies) * 1e3,
+        "cold_requests": len(cold),
+        "cold_p50_ms": statistics.median(cold) * 1e3 if cold else 0.0,
+    }
+    if prefetcher is not None:
+        result["prefetch"] = prefetcher.stats()
+        prefetcher.shutdown()
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure the background prefetcher's hit rate and foreground latency.")
+    ap.add_argument("--data", type=Path, default=Path("/tmp/hr-bench"))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--steps", type=int, default=80)
+    ap.add_argument("--think", type=float, default=0.5, help="seconds between steps")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", type=Path)
+    args = ap.parse_args()
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+    engines = Engines(args.data, cache=AggregateCache(max_bytes=256 * 2**20))
+    for name in Engines.NAMES:
+        getattr(engines, name)
+
+    result = {
+        "steps": args.steps,
+        "think_s": args.think,
+        "off": run(engines, args.steps, args.seed, args.think, prefetch=False),
+        "on": run(engines, args.steps, args.seed, args.think, prefetch=True),
+    }
+    result["mean_speedup"] = result["off"]["mean_ms"] / result["on"]["mean_ms"]
+    print(json.dumps(result, indent=1))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1))
+
+
+if __name__ == "__main__":
+    main()
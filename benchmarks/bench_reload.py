@@ -0,0 +1,154 @@
+"""
+Partition reload against a restart after one company × month lands.
+
+    python benchmarks/bench_reload.py --data /tmp/hr-bench --change edit
+
+Copies the data directory, opens every engine over the copy and caches the
+bundle of every cube state plus a few drill-down states.  Then it changes
+the copy: ``edit`` rewrites one company's partition three months back with
+salaries raised 10 %, ``append`` adds a month after the last with every
+company's rows copied from it, and ``overtime`` replaces one month's
+overtime partial.  A ``PartitionWatcher`` picks the change up (two polls:
+one to see it, one to let it settle) and reloads.
+
+Reports the reload time, how many cached bundles it dropped and kept, and
+the time to serve every state again, next to a restart: engines opened
+over a copy taken right after the change, with the persisted cube and
+monthly arrays still from before it, and then every state computed cold.
+Finally every bundle of the reloaded engines is checked against the
+restarted ones.
+"""
+
+import argparse
+import json
+import math
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import pyarrow as pa  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from hr_analytics.cache import AggregateCache  # noqa: E402
+from hr_analytics.dims import COMPANIES, DEPARTMENTS, OVERTIME_COLUMNS, PERIOD_TYPES, month_slug, period_options  # noqa: E402
+from hr_analytics.generate import generate  # noqa: E402
+from hr_analytics.service import Engines  # noqa: E402
+from hr_analytics.store import company_file, has_data, partition_months, read_month, write_overtime  # noqa: E402
+from hr_analytics.watch import PartitionWatcher  # noqa: E402
+
+CHANGES = ("edit", "append", "overtime")
+
+
+def states():
+    for period_type in PERIOD_TYPES:
+        for period in period_options(period_type)[0]:
+            for company in COMPANIES:
+                for dept in DEPARTMENTS:
+                    filters = {"company": [] if company == COMPANIES[0] else [company],
+                               "department": [] if dept == DEPARTMENTS[0] else [dept]}
+                    yield filters, period_type, period
+            yield {"gender": ["Kadın"]}, period_type, period
+
+
+def change(root, kind):
+    months = partition_months(root)
+    if kind == "edit":
+        path = company_file(months[-3], COMPANIES[2], root)
+        df = pq.read_table(path).to_pandas()
+        df["salary"] = df["salary"] * 1.1
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+    elif kind == "append":
+        month = months[-1] + 1
+        target = root / "snapshots" / month_slug(month)
+        target.mkdir()
+        for path in (root / "snapshots" / month_slug(months[-1])).glob("*.parquet"):
+            df = pq.read_table(path).to_pandas()
+            df["month"] = month
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), target / path.name)
+    else:
+        df = read_month(months[-4], root)[["employee_id", "month", *OVERTIME_COLUMNS]]
+        df = df.sample(frac=0.2, random_state=7).assign(**{OVERTIME_COLUMNS[0]: 7.5})
+        write_overtime(df, root)
+
+
+def serve_all(engines, all_states):
+    t = time.perf_counter()
+    bundles = [engines.bundle(*state) for state in all_states]
+    return time.perf_counter() - t, bundles
+
+
+def same(a, b):
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+    return a == b
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Time a partition reload against a restart.")
+    ap.add_argument("--data", type=Path, default=Path("/tmp/hr-bench"))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--change", choices=CHANGES, default="edit")
+    ap.add_argument("--out", type=Path)
+    args = ap.parse_args()
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+    work = Path(tempfile.mkdtemp(prefix="hr-reload-"))
+    try:
+        root = work / "data"
+        shutil.copytree(args.data, root)
+        engines = Engines(root, cache=AggregateCache(max_bytes=2**30))
+        watcher = PartitionWatcher(engines).baseline()
+        for name in Engines.NAMES:
+            getattr(engines, name)
+        all_states = list(states())
+        serve_all(engines, all_states)
+        cached = engines.cache.stats()["entries"]
+
+        change(root, args.change)
+        shutil.copytree(root, work / "restart")
+        watcher.poll()
+        t = time.perf_counter()
+        invalidated = watcher.poll()
+        reload_s = time.perf_counter() - t
+        kept = engines.cache.stats()["entries"]
+        after_reload_s, reloaded = serve_all(engines, all_states)
+
+        t = time.perf_counter()
+        restarted = Engines(work / "restart", cache=AggregateCache(max_bytes=2**30))
+        for name in Engines.NAMES:
+            getattr(restarted, name)
+        restart_open_s = time.perf_counter() - t
+        after_restart_s, fresh = serve_all(restarted, all_states)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    result = {
+        "change": args.change,
+        "states": len(all_states),
+        "reload_s": reload_s,
+        "invalidated_partitions": None if invalidated is None else len(invalidated),
+        "bundles_dropped": cached - kept,
+        "bundles_kept": kept,
+        "serve_after_reload_s": after_reload_s,
+        "restart_open_s": restart_open_s,
+        "serve_after_restart_s": after_restart_s,
+        "speedup": (restart_open_s + after_restart_s) / (reload_s + after_reload_s),
+        "bundles_match": all(same(a, b) for a, b in zip(reloaded, fresh)),
+    }
+    print(json.dumps(result, indent=1))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1))
+
+
+if __name__ == "__main__":
+    main()
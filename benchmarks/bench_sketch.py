@@ -0,0 +1,88 @@
+"""
+Accuracy and speed of the salary quantile sketches against exact percentiles.
+
+    python benchmarks/bench_sketch.py --data /tmp/hr-bench --alpha 0.01 0.005 0.001
+
+For every company × period × department filter the exact P10 / median / P90
+of the selected employee-months is compared with the merged sketch.  Exits
+non-zero if any relative error exceeds the configured bound.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from hr_analytics.dims import COMPANIES, DEPARTMENTS, PERIOD_TYPES, period_months, period_options  # noqa: E402
+from hr_analytics.generate import generate  # noqa: E402
+from hr_analytics.sketch import QUANTILES, SalarySketches  # noqa: E402
+from hr_analytics.store import HRStore, has_data  # noqa: E402
+
+
+def exact(values, qs=QUANTILES):
+    # Lower-rank quantile, the definition the sketch bounds
+    if not len(values):
+        return np.zeros(len(qs))
+    values = np.sort(values)
+    return values[np.floor(np.array(qs) * (len(values) - 1)).astype(int)]
+
+
+def check(store, sketches, alpha):
+    worst, queries, elapsed = 0.0, 0, 0.0
+    for company, period_type in itertools.product(COMPANIES, PERIOD_TYPES):
+        for period in period_options(period_type)[0]:
+            months = store.available(period_months(period_type, period))
+            for dept in DEPARTMENTS:
+                t = time.perf_counter()
+                got = sketches.bundle(company, period_type, period, dept)
+                elapsed += time.perf_counter() - t
+                rows = store.rows(months, COMPANIES.index(company), DEPARTMENTS.index(dept))
+                want = exact(store.money("salary", rows))
+                est = np.array([got["salary_p10"], got["salary_median"], got["salary_p90"]])
+                err = np.abs(est - want) / np.where(want > 0, want, 1)
+                worst = max(worst, float(err.max()))
+                queries += 1
+    return {
+        "alpha": alpha,
+        "buckets": sketches.sketch.n_buckets,
+        "bytes": int(sketches.counts.nbytes),
+        "queries": queries,
+        "max_rel_error": worst,
+        "within_bound": worst <= alpha + 1e-12,
+        "query_us": elapsed / queries * 1e6,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Check salary sketch error against exact quantiles.")
+    ap.add_argument("--data", type=Path, default=Path("/tmp/hr-bench"))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--alpha", type=float, nargs="+", default=[0.01, 0.005, 0.001])
+    ap.add_argument("--out", type=Path)
+    args = ap.parse_args()
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+    store = HRStore.open(args.data)
+    results = []
+    for alpha in args.alpha:
+        t = time.perf_counter()
+        sketches = SalarySketches.open(args.data, alpha)
+        result = check(store, sketches, alpha)
+        result["open_s"] = time.perf_counter() - t
+        results.append(result)
+        print(json.dumps(result))
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=1))
+    sys.exit(0 if all(r["within_bound"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Time to first paint for a fresh worker, with and without the boot warm-up.
+
+    python benchmarks/bench_startup.py --data /tmp/hr-bench --repeat 3
+
+Every sample is a new Python process running the real entry point,
+``python -m hr_analytics.warmup``, with ``HR_WARMUP=0`` in the cold case,
+up to where it hands over to ``streamlit run``.  "ready" is the time from
+spawning it until then, when the server would answer its health check.
+"first_run" is the first visitor's script run on the default state (driven
+through AppTest, as in bench_app.py, in place of the server), and "paint"
+their sum.  The child also reports the figure-cache hit rate of that first
+run, whether plotly.express was imported, and whether the app's
+``shared_engines()`` is the instance the warm-up filled (``python -m``
+runs the module as ``__main__``, a copy the app does not import).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+MODES = ("cold", "warm")
+
+
+def child(mode, t0, timeout):
+    import runpy
+
+    from streamlit.web import cli
+
+    result = {}
+
+    def first_visit():
+        # Stands in for the server ``warmup.main`` starts: the first session
+        from streamlit.testing.v1 import AppTest
+
+        from bench_app import _patch_button_group
+        from hr_analytics import warmup
+
+        ready = time.time() - t0
+        warmed = warmup._shared.get("engines")
+        _patch_button_group()
+        figures = warmup.shared_figures()
+        before = figures.stats()
+        t = time.perf_counter()
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout)
+        at.run()
+        first_run = time.perf_counter() - t
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        after = figures.stats()
+        hits, misses = after["hits"] - before["hits"], after["misses"] - before["misses"]
+        result.update({
+            "ready_s": ready,
+            "first_run_s": first_run,
+            "paint_s": ready + first_run,
+            "figure_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "plotly_express_imported": "plotly.express" in sys.modules,
+            "app_uses_warmed_engines": warmed is not None and warmup.shared_engines() is warmed,
+        })
+        return 0
+
+    cli.main = first_visit
+    os.environ["HR_WARMUP"] = "1" if mode == "warm" else "0"
+    sys.argv = ["hr_analytics.warmup"]
+    try:
+        runpy.run_module("hr_analytics.warmup", run_name="__main__", alter_sys=True)
+    except SystemExit:
+        pass
+    return result
+
+
+def sample(mode, data, timeout):
+    env = {**os.environ, "HR_DATA_DIR": str(data)}
+    t0 = time.time()
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, "--t0", repr(t0), "--timeout", str(timeout)],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Measure time to first paint of a fresh worker.")
+    ap.add_argument("--data", type=Path, default=Path("/tmp/hr-bench"))
+    ap.add_argument("--employees", type=int, default=100_000, help="employees to generate if --data is empty")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--timeout", type=float, default=600)
+    ap.add_argument("--out", type=Path)
+    ap.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    ap.add_argument("--t0", type=float, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.child, args.t0, args.timeout)))
+        return
+
+    from hr_analytics.generate import generate
+    from hr_analytics.store import has_data
+
+    if not has_data(args.data):
+        generate(args.employees, root=args.data)
+
+    result = {}
+    for mode in MODES:
+        runs = [sample(mode, args.data, args.timeout) for _ in range(args.repeat)]
+        result[mode] = {
+            **{k: statistics.median(r[k] for r in runs) for k in ("ready_s", "first_run_s", "paint_s")},
+            "figure_hit_rate": runs[-1]["figure_hit_rate"],
+            "plotly_express_imported": runs[-1]["plotly_express_imported"],
+            "app_uses_warmed_engines": runs[-1]["app_uses_warmed_engines"],
+        }
+    result["first_run_speedup"] = result["cold"]["first_run_s"] / result["warm"]["first_run_s"]
+
+    print(json.dumps(result, indent=1))
+    if args.out:
+        args.out.write_text(json.dumps(result, indent=1))
+
+
+if __name__ == "__main__":
+    main()
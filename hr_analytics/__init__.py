@@ -0,0 +1 @@
+"""Data layer behind the İK Analitiği dashboard."""
@@ -0,0 +1,274 @@
+"""
+Vectorized aggregation of the store into the bundle the dashboard tabs read.
+
+``bundle(store, company, period_type, period, dept)`` returns a dict with the
+same keys as ``MOCK`` in app.py plus ``trend_periods``, less the labor costs
+that ``costs`` computes at each month's rates; ``bundle_rows`` does the same
+for any row selection, such as a drill-down filter state.  Stock
+measures (headcount, demographics, leave balance) are taken at the last month
+of the period; flow measures (pay, overtime, absence, hires, exits) cover every
+month of it and per-employee averages divide by the period's average headcount.
+"""
+
+import numpy as np
+
+from .dims import (
+    ABSENCE_COLUMNS, ABSENCE_TYPES, AGE_BOUNDS, AGE_GROUPS, COLLARS, COMPANIES,
+    DEPARTMENTS, GENDERS, MONTHLY_HOURS, OVERTIME_COLUMNS, OVERTIME_TYPES,
+    POSITIONS, TENURE_BOUNDS, TENURE_GROUPS, TERMINATION_REASONS,
+    month_label, period_months,
+)
+
+TREND_MONTHS = 12
+DAYS_PER_YEAR = 365.25
+
+
+# ── Small vector helpers ──────────────────────────────────────────────────────
+def safe_div(a, b):
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    return np.divide(a, b, out=np.zeros(np.broadcast(a, b).shape), where=b != 0)
+
+def _counts(codes, n, weights=None):
+    return np.bincount(codes, weights=weights, minlength=n)[:n]
+
+def labelled(labels, values, keep=None):
+    """Dict of label → value, optionally only where ``keep`` is true."""
+    return {
+        lab: v.item() for i, (lab, v) in enumerate(zip(labels, np.asarray(values)))
+        if keep is None or keep[i]
+    }
+
+def _stat(fn, arr):
+    return float(fn(arr)) if len(arr) else 0.0
+
+def years_between(start_days, end_days):
+    return (end_days - start_days) / DAYS_PER_YEAR
+
+def _group_lut(bounds, top=128):
+    # Group bounds are whole years, so the group of x is the group of floor(x)
+    return np.searchsorted(bounds, np.arange(top), side="right").astype(np.int8)
+
+def period_windows(period_type, period, first_month, n_months):
+    """Month indexes of a period and of the same months one period and one year back.
+
+    Returns ``(idx, ok)`` with ``idx`` of shape (3, n): the period's months
+    inside ``first_month .. first_month + n_months - 1``, then those shifted
+    back by the period's length and by twelve months.  ``ok`` is False for a
+    window the data does not fully cover (its indexes are clipped, not
+    meaningful).  None when the period itself has no data.
+    """
+    requested = np.array(period_months(period_type, period)) - first_month
+    current = requested[(requested >= 0) & (requested < n_months)]
+    if not len(current):
+        return None
+    idx = current[None, :] - np.array([0, len(requested), 12])[:, None]
+    ok = ((idx >= 0) & (idx < n_months)).all(axis=1)
+    return np.clip(idx, 0, n_months - 1), ok
+
+def windowed(values, ok):
+    """{name: [current, previous, year_ago]} with None for uncovered windows."""
+    return {name: [float(v) if k else None for v, k in zip(np.broadcast_to(vals, ok.shape), ok)]
+            for name, vals in values.items()}
+
+_AGE_LUT = _group_lut(AGE_BOUNDS)
+_TENURE_LUT = _group_lut(TENURE_BOUNDS)
+
+def age_group(years):
+    return _AGE_LUT[np.clip(years, 0, len(_AGE_LUT) - 1).astype(np.intp)]
+
+def tenure_group(years):
+    return _TENURE_LUT[np.clip(years, 0, len(_TENURE_LUT) - 1).astype(np.intp)]
+
+
+# ── Bundle ────────────────────────────────────────────────────────────────────
+class _Selection:
+    """Rows of one filter state, resolved once and shared by every section.
+
+    ``select(months)`` returns the snapshot row indices of the filter state
+    within the given (available) months, in ascending order.
+    """
+
+    def __init__(self, store, requested, select):
+        self.store = store
+        self.select = select
+        self.months = store.available(requested)
+        self.last = self.months[-1] if self.months else requested[-1]
+        self.n_months = max(len(self.months), 1)
+        self.window0 = self.last - TREND_MONTHS + 1
+
+        # The trend window ends at the period's last month, so it covers the period
+        self.window = select(store.available(range(self.window0, self.last + 1)))
+        window_month = store.snap("month")[self.window]
+        self.stock = self.window[window_month == self.last]
+        self.rows = self.window[np.isin(window_month, self.months)]
+        self.avg_headcount = len(self.rows) / self.n_months
+        self._years = {}
+
+    def years_since(self, which, emp_col):
+        """Years from an employee date column to the end of each row's month.
+
+        ``which`` is "stock" or "rows"; results are memoized per selection.
+        """
+        if which == "stock" and self.months == [self.last]:
+            which = "rows"
+        key = (which, emp_col)
+        if key not in self._years:
+            rows = getattr(self, which)
+            emp = self.store.snap_emp[rows]
+            end = self.store.month_end(self.store.snap("month")[rows])
+            self._years[key] = years_between(self.store.emp(emp_col)[emp], end)
+        return self._years[key]
+
+    def by_window_month(self, rows):
+        """Count of ``rows`` (of the trend window) in each of its months."""
+        return _counts(self.store.snap("month")[rows] - self.window0, TREND_MONTHS).astype(int).tolist()
+
+    def per_head(self, codes, n, weights):
+        """Average of ``weights`` per employee in each group over the period."""
+        heads = _counts(codes, n) / self.n_months
+        return safe_div(_counts(codes, n, weights), heads)
+
+
+def bundle(store, company, period_type, period, dept):
+    c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+    return bundle_rows(store, period_type, period, lambda months: store.rows(months, c, d))
+
+
+def bundle_rows(store, period_type, period, select, extra=(), months=None):
+    """Bundle over the rows ``select(months)`` picks (see ``_Selection``).
+
+    ``months`` replaces the period's months, such as a comparison window of
+    ``period_windows``.  ``extra`` section functions run last and override
+    keys of the built-in ones.
+    """
+    sel = _Selection(store, months or period_months(period_type, period), select)
+    out = {}
+    for section in (_demography, _salary, _overtime, _absence, _flows, *extra):
+        out.update(section(sel))
+    return out
+
+
+# ── Demografi ─────────────────────────────────────────────────────────────────
+def _demography(sel):
+    store, rows = sel.store, sel.stock
+    emp = store.snap_emp[rows]
+    age = sel.years_since("stock", "birth_date")
+    tenure = sel.years_since("stock", "hire_date")
+    dept_n = _counts(store.snap("department")[rows], len(DEPARTMENTS))[1:]
+    pos_n = _counts(store.snap("position")[rows], len(POSITIONS))
+    window = range(sel.window0, sel.last + 1)
+    return {
+        "headcount": len(rows),
+        "avg_age": _stat(np.mean, age),
+        "avg_tenure": _stat(np.mean, tenure),
+        "retired_count": int(store.emp("retired")[emp].sum()),
+        "gender": labelled(GENDERS, _counts(store.emp("gender")[emp], len(GENDERS))),
+        "collar": labelled(COLLARS, _counts(store.emp("collar")[emp], len(COLLARS))),
+        "headcount_by_dept": labelled(DEPARTMENTS[1:], dept_n, keep=dept_n > 0),
+        "headcount_by_position": labelled(POSITIONS, pos_n, keep=pos_n > 0),
+        "age_groups": labelled(AGE_GROUPS, _counts(age_group(age), len(AGE_GROUPS))),
+        "tenure_groups": labelled(TENURE_GROUPS, _counts(tenure_group(tenure), len(TENURE_GROUPS))),
+        "headcount_trend": sel.by_window_month(sel.window),
+        "trend_periods": [month_label(m) for m in window],
+    }
+
+
+# ── Ücret ─────────────────────────────────────────────────────────────────────
+def _salary(sel):
+    store, rows = sel.store, sel.rows
+    salary = store.money("salary", rows)
+    dept = store.snap("department")[rows]
+    pos = store.snap("position")[rows]
+    tgrp = tenure_group(sel.years_since("rows", "hire_date"))
+
+    def mean_by(codes, n):
+        heads = _counts(codes, n)
+        return safe_div(_counts(codes, n, salary), heads), heads > 0
+
+    by_dept, dept_keep = mean_by(dept, len(DEPARTMENTS))
+    by_pos, pos_keep = mean_by(pos, len(POSITIONS))
+    by_tenure, _ = mean_by(tgrp, len(TENURE_GROUPS))
+    avg, lo, hi = _stat(np.mean, salary), _stat(np.min, salary), _stat(np.max, salary)
+    return {
+        "salary_avg": avg,
+        "salary_min": lo,
+        "salary_max": hi,
+        "salary_std": _stat(np.std, salary),
+        "salary_hourly_avg": avg / MONTHLY_HOURS,
+        "salary_hourly_min": lo / MONTHLY_HOURS,
+        "salary_hourly_max": hi / MONTHLY_HOURS,
+        "salary_by_dept": labelled(DEPARTMENTS[1:], by_dept[1:], keep=dept_keep[1:]),
+        "salary_by_position": labelled(POSITIONS, by_pos, keep=pos_keep),
+        "salary_by_tenure": labelled(TENURE_GROUPS, by_tenure),
+    }
+
+
+# ── Fazla Mesai ───────────────────────────────────────────────────────────────
+def _overtime(sel):
+    store, rows = sel.store, sel.rows
+    hours = np.stack([store.quantity(c, rows) for c in OVERTIME_COLUMNS])
+    per_row = hours.sum(axis=0)
+    pos = store.snap("position")[rows]
+    by_pos = sel.per_head(pos, len(POSITIONS), per_row)
+    total = float(per_row.sum())
+    return {
+        "overtime_total": total,
+        "overtime_avg": float(safe_div(total, sel.avg_headcount)),
+        "overtime_by_position": labelled(POSITIONS, by_pos, keep=_counts(pos, len(POSITIONS)) > 0),
+        "overtime_by_type": labelled(OVERTIME_TYPES, hours.sum(axis=1)),
+    }
+
+
+# ── Devamsızlık ───────────────────────────────────────────────────────────────
+def _absence(sel):
+    store, rows = sel.store, sel.rows
+    days = np.stack([store.quantity(c, rows) for c in ABSENCE_COLUMNS])
+    per_row = days.sum(axis=0)
+    by_type = days.sum(axis=1)
+    total = float(by_type.sum())
+    used = float(by_type[0])
+    balance = store.quantity("leave_balance", sel.stock)
+    tgrp = tenure_group(sel.years_since("rows", "hire_date"))
+    agrp = age_group(sel.years_since("rows", "birth_date"))
+    return {
+        "total_absent_days": total,
+        "avg_absent_days": float(safe_div(total, sel.avg_headcount)),
+        "total_annual_leave_balance": float(balance.sum()),
+        "avg_annual_leave_balance": _stat(np.mean, balance),
+        "total_used_annual_leave": used,
+        "avg_used_annual_leave": float(safe_div(used, sel.avg_headcount)),
+        "absence_types": labelled(ABSENCE_TYPES, by_type),
+        "absence_by_tenure": labelled(TENURE_GROUPS, sel.per_head(tgrp, len(TENURE_GROUPS), per_row)),
+        "absence_by_age": labelled(AGE_GROUPS, sel.per_head(agrp, len(AGE_GROUPS), per_row)),
+    }
+
+
+# ── İşe Alım & Çıkış ──────────────────────────────────────────────────────────
+def _flows(sel):
+    # An employee is active in the months of their hire and exit, so events
+    # are read off the selected rows falling in those months
+    store, rows = sel.store, sel.window
+    emp = store.snap_emp[rows]
+    month = store.snap("month")[rows]
+    first, last = (sel.months[0], sel.months[-1]) if sel.months else (sel.last + 1, sel.last)
+    in_period = (month >= first) & (month <= last)
+    is_hire = month == store.emp("hire_month")[emp]
+    is_exit = month == store.emp("termination_month")[emp]
+    hired = emp[is_hire & in_period]
+    left = emp[is_exit & in_period]
+
+    reasons = store.emp("termination_reason")[left]
+    exit_tenure = years_between(store.emp("hire_date")[left], store.emp("termination_date")[left])
+
+    terminations = len(left)
+    return {
+        "hires": len(hired),
+        "terminations": terminations,
+        "turnover_rate_monthly": float(safe_div(terminations * 100, sel.avg_headcount * sel.n_months)),
+        "turnover_rate_yearly": float(safe_div(terminations * 100, sel.avg_headcount)),
+        "termination_reasons": labelled(TERMINATION_REASONS, _counts(reasons[reasons >= 0], len(TERMINATION_REASONS))),
+        "termination_by_collar": labelled(COLLARS, _counts(store.emp("collar")[left], len(COLLARS))),
+        "termination_by_tenure": labelled(TENURE_GROUPS, _counts(tenure_group(exit_tenure), len(TENURE_GROUPS))),
+        "hires_trend": sel.by_window_month(rows[is_hire]),
+        "terminations_trend": sel.by_window_month(rows[is_exit]),
+    }
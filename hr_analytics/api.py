@@ -0,0 +1,192 @@
+"""
+Headless HTTP API over the dashboard's bundles, for the host Dakika app.
+
+    python -m hr_analytics.api --port 8502
+
+    GET /v1/bundle?period_type=Aylık&period=Ocak 2026&company=Şirket A&department=Hukuk
+    GET /v1/options
+    GET /healthz
+
+``/v1/bundle`` returns the same dict the tabs render, computed by
+``service.Engines`` through the shared ``AggregateCache``.  ``company``,
+``department`` and the other drill-down dimensions (``position``,
+``collar``, ``gender``, ``age_group``, ``tenure_group``) may repeat; a
+missing period selects the dashboard's default.  ``format=arrow`` (or
+``Accept: application/vnd.apache.arrow.stream``) returns a one-row Arrow
+IPC stream with one column per bundle key, label → value charts as
+``map<string, …>`` columns.
+
+Responses carry a strong ETag over the data version, the canonical filter
+state and the format, and answer ``If-None-Match`` with 304 before any
+aggregation runs.  Identical requests in flight at the same time share one
+computation (see ``AggregateCache.get``).  Unless ``HR_WATCH=0``, changed
+partitions of the data directory are reloaded in the background (see
+``watch``) and the ETags move with them.
+"""
+
+import argparse
+import hashlib
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pyarrow as pa
+
+from .bitmap import DIMENSIONS
+from .dims import COMPANIES, DEPARTMENTS, PERIOD_TYPES, period_options
+from .drill import filter_key
+from .service import Engines
+from .store import DATA_DIR
+from .watch import ENABLED as WATCH
+from .watch import PartitionWatcher
+
+JSON = "application/json; charset=utf-8"
+ARROW = "application/vnd.apache.arrow.stream"
+# Clients may store responses but must revalidate; a revalidation is a 304
+CACHE_CONTROL = "no-cache"
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def parse_state(query):
+    """(filters, period_type, period) from parsed query parameters."""
+    period_type = query.get("period_type", [PERIOD_TYPES[0]])[-1]
+    if period_type not in PERIOD_TYPES:
+        raise BadRequest(f"period_type must be one of {PERIOD_TYPES}")
+    opts, default = period_options(period_type)
+    period = query.get("period", [opts[default]])[-1]
+    if period not in opts:
+        raise BadRequest(f"unknown {period_type} period {period!r}")
+    filters = {}
+    for dim, labels in DIMENSIONS.items():
+        # The "Tüm …" margins mean no filter, as in the dashboard's selectboxes
+        values = [v for v in query.get(dim, []) if v not in (COMPANIES[0], DEPARTMENTS[0])]
+        unknown = [v for v in values if v not in labels]
+        if unknown:
+            raise BadRequest(f"unknown {dim} {', '.join(unknown)}")
+        if values:
+            filters[dim] = values
+    return filters, period_type, period
+
+
+def etag(version, filters, period_type, period, fmt):
+    state = json.dumps([version, filter_key(filters), period_type, period, fmt], ensure_ascii=False)
+    return '"' + hashlib.sha1(state.encode()).hexdigest() + '"'
+
+
+def _column(value):
+    if isinstance(value, dict):
+        items = list(value.items())
+        inner = pa.array([v for _, v in items]).type if items else pa.float64()
+        return pa.array([items], type=pa.map_(pa.string(), inner))
+    return pa.array([value])
+
+
+def bundle_table(bundle):
+    """One-row Arrow table of a bundle, one column per key."""
+    return pa.table({key: _column(value) for key, value in bundle.items()})
+
+
+def to_ipc(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "hr-analytics"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == "/v1/bundle":
+                self._bundle(query)
+            elif url.path == "/v1/options":
+                self._json(HTTPStatus.OK, {
+                    "period_types": {t: dict(zip(("options", "default"), period_options(t)))
+                                     for t in PERIOD_TYPES},
+                    "dimensions": DIMENSIONS,
+                })
+            elif url.path == "/healthz":
+                self._json(HTTPStatus.OK, {"ok": True, "version": self.server.engines.version})
+            else:
+                self._json(HTTPStatus.NOT_FOUND, {"error": f"no route {url.path}"})
+        except BadRequest as exc:
+            self._json(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+
+    do_HEAD = do_GET
+
+    def _bundle(self, query):
+        filters, period_type, period = parse_state(query)
+        fmt = query.get("format", [""])[-1] or ("arrow" if ARROW in self.headers.get("Accept", "") else "json")
+        if fmt not in ("json", "arrow"):
+            raise BadRequest("format must be json or arrow")
+        engines = self.server.engines
+        tag = etag(engines.version, filters, period_type, period, fmt)
+        headers = {"ETag": tag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept"}
+        match = self.headers.get("If-None-Match", "")
+        if match.strip() == "*" or tag in [m.strip() for m in match.split(",")]:
+            self._send(HTTPStatus.NOT_MODIFIED, b"", None, headers)
+            return
+        bundle = engines.bundle(filters, period_type, period)
+        if bundle is None:
+            self._json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": f"no data under {engines.root}"})
+            return
+        if fmt == "arrow":
+            self._send(HTTPStatus.OK, to_ipc(bundle_table(bundle)), ARROW, headers)
+        else:
+            self._json(HTTPStatus.OK, bundle, headers)
+
+    def _json(self, status, obj, headers=None):
+        body = json.dumps(obj, ensure_ascii=False).encode()
+        self._send(status, body, JSON, headers or {})
+
+    def _send(self, status, body, content_type, headers):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=8502, root=DATA_DIR, verbose=False):
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.engines = Engines(root)
+    server.watcher = PartitionWatcher(server.engines).start() if WATCH else None
+    server.verbose = verbose
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve dashboard bundles as JSON and Arrow IPC.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8502)
+    ap.add_argument("--data", default=str(DATA_DIR))
+    ap.add_argument("--warm", action="store_true", help="open every engine before accepting requests")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+    server = serve(args.host, args.port, args.data, args.verbose)
+    if args.warm and server.engines.cube is not None:
+        for name in Engines.NAMES:
+            getattr(server.engines, name)
+    print(f"Serving {args.data} on http://{args.host}:{server.server_port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Compressed bitmap index over snapshot rows for drill-down filtering.
+
+One bitmap per value of every filterable dimension (company, department,
+position, collar, gender, age group, tenure group) marks the snapshot rows
+that carry it.  A filter state ORs the bitmaps of the values picked within a
+dimension, ANDs across dimensions and with the period's month range, and
+only the surviving rows are aggregated.
+
+Bitmaps are split into chunks of 2^16 row ids, as in Roaring bitmaps.  Each
+stored chunk is whichever is smallest of a sorted ``uint16`` array of
+offsets, a 1024-word ``uint64`` bitset (8 KiB) or a ``uint32`` list of
+``[start, stop)`` runs; empty chunks are not stored.  Snapshots are sorted
+by month, company and department, so those dimensions are a few runs per
+month.  Age and tenure groups are taken at the end of each row's month,
+like the dashboard's demographics.
+"""
+
+import numpy as np
+
+from .aggregate import age_group, tenure_group, years_between
+from .dims import AGE_GROUPS, COLLARS, COMPANIES, DEPARTMENTS, GENDERS, POSITIONS, TENURE_GROUPS
+
+CHUNK_BITS = 16
+CHUNK = 1 << CHUNK_BITS
+WORDS = CHUNK // 64
+ARRAY_MAX = 4096                       # an array chunk this long is as large as a bitset
+
+# Filterable dimension → decode table; company and department codes start at 1
+DIMENSIONS = {
+    "company": COMPANIES,
+    "department": DEPARTMENTS,
+    "position": POSITIONS,
+    "collar": COLLARS,
+    "gender": GENDERS,
+    "age_group": AGE_GROUPS,
+    "tenure_group": TENURE_GROUPS,
+}
+_FIRST_CODE = {"company": 1, "department": 1}
+
+
+# ── Chunks ────────────────────────────────────────────────────────────────────
+def _is_bitset(chunk):
+    return chunk.dtype == np.uint64
+
+def _is_runs(chunk):
+    return chunk.dtype == np.uint32
+
+def _words(chunk):
+    if _is_bitset(chunk):
+        return chunk
+    if _is_runs(chunk):
+        edges = np.zeros(CHUNK + 1, dtype=np.int32)
+        np.add.at(edges, chunk[:, 0], 1)
+        np.add.at(edges, chunk[:, 1], -1)
+        bits = np.cumsum(edges[:-1]) > 0
+    else:
+        bits = np.zeros(CHUNK, dtype=bool)
+        bits[chunk] = True
+    return np.packbits(bits, bitorder="little").view(np.uint64)
+
+def _offsets(chunk):
+    if _is_bitset(chunk):
+        return np.flatnonzero(np.unpackbits(chunk.view(np.uint8), bitorder="little")).astype(np.uint16)
+    if _is_runs(chunk):
+        return _offsets(_words(chunk))
+    return chunk
+
+def _card(chunk):
+    if _is_bitset(chunk):
+        return int(np.bitwise_count(chunk).sum())
+    if _is_runs(chunk):
+        return int((chunk[:, 1] - chunk[:, 0]).sum())
+    return len(chunk)
+
+def _compact(offsets):
+    """Smallest container for sorted, unique chunk offsets."""
+    breaks = np.flatnonzero(np.diff(offsets.astype(np.int32)) != 1) + 1
+    if 8 * (len(breaks) + 1) < min(2 * len(offsets), 8 * WORDS):
+        starts = np.r_[0, breaks]
+        stops = np.r_[breaks, len(offsets)]
+        return np.column_stack([offsets[starts], offsets[stops - 1].astype(np.uint32) + 1]).astype(np.uint32)
+    return offsets if len(offsets) <= ARRAY_MAX else _words(offsets)
+
+def _from_runs(runs):
+    """Smallest container for sorted ``[start, stop)`` runs, as ``_compact`` picks it."""
+    if 8 * len(runs) < min(2 * _card(runs), 8 * WORDS):
+        return runs
+    return _shrink(_words(runs))
+
+def _shrink(words):
+    return _offsets(words) if _card(words) <= ARRAY_MAX else words
+
+def _and(a, b):
+    if _is_runs(a) and not _is_bitset(b) and not _is_runs(b):
+        a, b = b, a
+    if _is_runs(b) and not _is_bitset(a) and not _is_runs(a):
+        # Array ∩ runs: an offset is kept if the run ending after it starts at or before it
+        pos = np.searchsorted(b[:, 1], a, side="right")
+        inside = pos < len(b)
+        inside[inside] = b[pos[inside], 0] <= a[inside]
+        return a[inside]
+    if _is_bitset(a) or _is_runs(a):
+        a, b = b, a
+    if _is_bitset(a) or _is_runs(a):
+        return _shrink(_words(a) & _words(b))
+    b = _words(b)
+    hit = (b[a >> 6] >> (a & 63).astype(np.uint64)) & np.uint64(1)
+    return a[hit.astype(bool)]
+
+def _or(a, b):
+    if not (_is_bitset(a) or _is_runs(a) or _is_bitset(b) or _is_runs(b)):
+        union = np.union1d(a, b)
+        return union if len(union) <= ARRAY_MAX else _words(union)
+    return _words(a) | _words(b)
+
+
+class Bitmap:
+    """Set of row ids stored as ``{chunk number: array, bitset or runs chunk}``."""
+
+    __slots__ = ("chunks",)
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks if chunks is not None else {}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Bitmap of sorted, unique row ids."""
+        rows = np.asarray(rows, dtype=np.int64)
+        keys = rows >> CHUNK_BITS
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(rows) else []
+        bounds = np.append(starts, len(rows))
+        chunks = {}
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            chunks[int(keys[a])] = _compact((rows[a:b] & (CHUNK - 1)).astype(np.uint16))
+        return cls(chunks)
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        """Bitmap of the union of sorted, disjoint ``(start, stop)`` row ranges."""
+        # Ranges split at chunk boundaries into runs; touching runs merge
+        runs = {}
+        for start, stop in ranges:
+            start, stop = int(start), int(stop)
+            while start < stop:
+                key = start >> CHUNK_BITS
+                base = key << CHUNK_BITS
+                end = min(stop, base + CHUNK)
+                chunk = runs.setdefault(key, [])
+                if chunk and chunk[-1][1] == start - base:
+                    chunk[-1][1] = end - base
+                else:
+                    chunk.append([start - base, end - base])
+                start = end
+        return cls({key: _from_runs(np.array(r, dtype=np.uint32)) for key, r in runs.items()})
+
+    def __and__(self, other):
+        small, large = sorted((self.chunks, other.chunks), key=len)
+        out = {}
+        for key, chunk in small.items():
+            if key in large:
+                both = _and(chunk, large[key])
+                if _card(both):
+                    out[key] = both
+        return Bitmap(out)
+
+    def __or__(self, other):
+        out = dict(self.chunks)
+        for key, chunk in other.chunks.items():
+            out[key] = _or(out[key], chunk) if key in out else chunk
+        return Bitmap(out)
+
+    def __len__(self):
+        return sum(_card(c) for c in self.chunks.values())
+
+    @property
+    def nbytes(self):
+        return sum(c.nbytes for c in self.chunks.values())
+
+    def rows(self):
+        """Sorted row ids as an int64 array."""
+        parts = [
+            (key << CHUNK_BITS) + _offsets(c).astype(np.int64)
+            for key, c in sorted(self.chunks.items())
+        ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+def row_codes(store, dim):
+    """Code of every snapshot row in ``dim`` (see ``DIMENSIONS``)."""
+    if dim in ("company", "department", "position"):
+        return store.snap(dim)
+    emp = store.snap_emp
+    if dim in ("collar", "gender"):
+        return store.emp(dim)[emp]
+    end = store.month_end(store.snap("month"))
+    if dim == "age_group":
+        return age_group(years_between(store.emp("birth_date")[emp], end))
+    return tenure_group(years_between(store.emp("hire_date")[emp], end))
+
+
+class BitmapIndex:
+    """Bitmaps of an ``HRStore``'s snapshot rows per dimension value."""
+
+    def __init__(self, store, bitmaps):
+        self.store = store
+        self.bitmaps = bitmaps
+
+    @classmethod
+    def build(cls, store):
+        bitmaps = {}
+        for dim, labels in DIMENSIONS.items():
+            codes = row_codes(store, dim)
+            order = np.argsort(codes, kind="stable")        # row ids stay sorted within a value
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+            first = _FIRST_CODE.get(dim, 0)
+            bitmaps[dim] = {
+                labels[v]: Bitmap.from_rows(order[bounds[v]:bounds[v + 1]])
+                for v in range(first, len(labels))
+            }
+        return cls(store, bitmaps)
+
+    def select(self, filters, months):
+        """Rows of ``months`` matching ``filters`` ({dimension: values}), as a bitmap.
+
+        Values of one dimension are ORed, dimensions are ANDed; a dimension
+        without values does not filter.
+        """
+        out = Bitmap.from_ranges(self.store.ranges(self.store.available(months)))
+        # Most selective dimension first keeps the intermediate results small
+        picked = []
+        for dim, values in filters.items():
+            if values:
+                union = Bitmap()
+                for value in values:
+                    union = union | self.bitmaps[dim].get(value, Bitmap())
+                picked.append(union)
+        for bitmap in sorted(picked, key=len):
+            out = bitmap & out
+        return out
+
+    def rows(self, filters, months):
+        return self.select(filters, months).rows()
+
+    def stats(self):
+        n_rows = self.store.n_rows
+        nbytes = sum(b.nbytes for values in self.bitmaps.values() for b in values.values())
+        n_bitmaps = sum(len(values) for values in self.bitmaps.values())
+        return {
+            "rows": n_rows,
+            "bitmaps": n_bitmaps,
+            "bytes": nbytes,
+            # One uncompressed bit per row and value
+            "uncompressed_bytes": n_bitmaps * ((n_rows + 7) // 8),
+        }
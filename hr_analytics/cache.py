@@ -0,0 +1,176 @@
+"""
+Process-wide cache of per-filter aggregate bundles, shared by all sessions.
+
+Entries are keyed by (company, period_type, period, department), plus the
+canonical drill-down filters for states beyond one company and department
+(see ``drill.filter_key``), and remember which company × month partitions
+they were computed from, so reloading one partition drops only the bundles
+that read it.  Eviction is LRU within a byte budget, plus an optional
+time-to-live.  Concurrent misses on the same key are coalesced: the first
+caller computes, the others wait for its result.  A bundle whose partitions
+were invalidated while it was being computed is returned but not stored,
+since it may have read the engines from before the reload.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from .aggregate import TREND_MONTHS
+from .cohorts import COHORTS
+from .dims import COMPANIES, period_months
+
+
+def bundle_partitions(company, period_type, period):
+    """(company, month) partitions a bundle depends on.
+
+    Its period, the trend window and the month before it (the window's
+    opening headcount) and the hire months of its cohorts, and the same for
+    the previous-period and year-ago windows of the KPI cards, which
+    drill-down states aggregate like the period itself.
+    """
+    months = period_months(period_type, period)
+    ends = {months[-1] - shift for shift in (0, len(months), 12)}
+    read = {m for end in ends for m in range(end - max(TREND_MONTHS, COHORTS - 1), end + 1)}
+    companies = COMPANIES[1:] if company == COMPANIES[0] else [company]
+    return {(c, m) for c in companies for m in read}
+
+
+class _Entry:
+    __slots__ = ("value", "nbytes", "created", "partitions")
+
+    def __init__(self, value, nbytes, partitions):
+        self.value = value
+        self.nbytes = nbytes
+        self.created = time.monotonic()
+        self.partitions = partitions
+
+
+class AggregateCache:
+    """Thread-safe LRU of bundles with a byte budget, TTL and partition index."""
+
+    def __init__(self, max_bytes=64 * 2**20, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._by_partition = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; partitions remember the epoch they were last dropped in
+        self._epoch = 0
+        self._invalidated = {}
+        self._cleared = 0
+        self.nbytes = 0
+        self.hits = self.misses = self.coalesced = 0
+        self.evictions = self.expirations = self.invalidations = 0
+
+    def get(self, company, period_type, period, dept, compute, drill=()):
+        """Cached bundle for a filter state; ``compute()`` runs on a miss.
+
+        ``company`` must cover every company the drill filters can select, so
+        that partition invalidation reaches the entry.
+        """
+        key = (company, period_type, period, dept) + ((drill,) if drill else ())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry.created > self.ttl:
+                self._drop(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = Future()
+                self.misses += 1
+                started = self._epoch
+            else:
+                self.coalesced += 1
+        if pending is not None:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._pending.pop(key).set_exception(exc)
+            raise
+        self.put(key, value, since=started)
+        with self._lock:
+            self._pending.pop(key).set_result(value)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (self.ttl is None or time.monotonic() - entry.created <= self.ttl)
+
+    def put(self, key, value, since=None):
+        """Store a bundle; with ``since`` (an epoch) only if none of its partitions were invalidated after it."""
+        entry = _Entry(value, len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)),
+                       bundle_partitions(*key[:3]))
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if since is not None and (self._cleared > since or
+                                      any(self._invalidated.get(p, 0) > since for p in entry.partitions)):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self.nbytes += entry.nbytes
+            for part in entry.partitions:
+                self._by_partition.setdefault(part, set()).add(key)
+            while self.nbytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_partition(self, company, month):
+        """Drop every bundle that read the given company × month partition."""
+        with self._lock:
+            self._epoch += 1
+            self._invalidated[(company, month)] = self._epoch
+            keys = list(self._by_partition.get((company, month), ()))
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._cleared = self._epoch
+            self._entries.clear()
+            self._by_partition.clear()
+            self.nbytes = 0
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.nbytes -= entry.nbytes
+        for part in entry.partitions:
+            keys = self._by_partition.get(part)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_partition[part]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
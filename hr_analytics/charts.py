@@ -0,0 +1,278 @@
+"""
+Plotly figure builders for the dashboard charts and a shared figure cache.
+
+The builders return plain figures and know nothing about Streamlit, so the
+same chart definitions can be rendered by the app or exported elsewhere.
+``FigureCache`` keeps finished figures as serialized Plotly JSON, keyed by a
+content hash of the chart data and style, optionally backed by a directory
+that several processes share.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from .profiling import span
+
+BLUE = "#1d6fce"
+# High-contrast qualitative palette (ColorBrewer Set1 + adjustments)
+COLORS = [
+    "#1d6fce",  # blue
+    "#e05c00",  # orange
+    "#2ca02c",  # green
+    "#d62728",  # red
+    "#9467bd",  # purple
+    "#8c564b",  # brown
+    "#e377c2",  # pink
+    "#17becf",  # teal
+]
+
+HOVER_BG    = "rgba(255,255,255,0.97)"
+HOVER_FONT  = dict(family="Inter", size=13, color="#111827")
+HOVER_BORDER = "rgba(0,0,0,0)"
+
+
+# ── Figures ───────────────────────────────────────────────────────────────────
+def _base_layout(height=260, extra_margin_b=0):
+    return dict(
+        plot_bgcolor="white", paper_bgcolor="white",
+        margin=dict(l=0, r=0, t=4, b=extra_margin_b),
+        font=dict(family="Inter", size=12, color="#111827"),
+        hoverlabel=dict(
+            bgcolor=HOVER_BG,
+            font=HOVER_FONT,
+            bordercolor="#e2e6ea",
+            namelength=-1,
+        ),
+        height=height,
+    )
+
+def bar_figure(data, color=BLUE, horizontal=False, x_label="", y_label=""):
+    # Built from graph_objects directly: the same trace and layout plotly.express
+    # produced, without importing px (and pandas) on the first chart of a worker.
+    # x_label / y_label only named px's DataFrame columns; both titles are blank.
+    cats = list(data.keys())
+    vals = list(data.values())
+    fig = go.Figure(go.Bar(
+        x=vals if horizontal else cats,
+        y=cats if horizontal else vals,
+        orientation="h" if horizontal else "v",
+        marker=dict(color=color, line_width=0),
+        name="", showlegend=False, textposition="auto",
+        hovertemplate=(f"<b>%{{y}}</b><br>%{{x:,.1f}}<extra></extra>" if horizontal
+                       else f"<b>%{{x}}</b><br>%{{y:,.1f}}<extra></extra>"),
+    ))
+    if horizontal:
+        fig.update_layout(yaxis={"categoryorder": "total ascending"})
+
+    fig.update_layout(**_base_layout(), barmode="relative", showlegend=False, xaxis_title="", yaxis_title="")
+    fig.update_xaxes(showgrid=False, tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
+    fig.update_yaxes(gridcolor="#f3f4f6", tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
+    return fig
+
+def pie_figure(data):
+    fig = go.Figure(go.Pie(
+        labels=list(data.keys()), values=list(data.values()), hole=0.5, name="",
+        textposition="inside",
+        textinfo="percent",
+        textfont=dict(color="white", size=12),
+        hovertemplate="<b>%{label}</b><br>%{value:,.0f} (%{percent})<extra></extra>",
+    ))
+    fig.update_layout(
+        **_base_layout(),
+        piecolorway=COLORS,
+        legend=dict(orientation="v", x=1, y=0.5, font=dict(color="#111827", size=12)),
+    )
+    return fig
+
+def trend_figure(periods, series):
+    fig = go.Figure()
+    line_colors = [BLUE, "#dc2626", "#059669"]
+    for i, (name, values) in enumerate(series.items()):
+        fig.add_trace(go.Scatter(
+            x=periods, y=values, mode="lines+markers", name=name,
+            line=dict(color=line_colors[i % len(line_colors)], width=2),
+            marker=dict(size=5),
+            hovertemplate=f"<b>%{{x}}</b><br>{name}: %{{y}}<extra></extra>",
+        ))
+    fig.update_layout(
+        **_base_layout(height=270, extra_margin_b=60),
+        legend=dict(orientation="h", y=-0.32, xanchor="center", x=0.5,
+                    font=dict(color="#111827", size=13)),
+    )
+    fig.update_xaxes(showgrid=False, tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
+    fig.update_yaxes(gridcolor="#f3f4f6", tickfont=dict(color="#111827"), title_font=dict(color="#111827"))
+    return fig
+
+def band_figure(bands, color=BLUE):
+    """Horizontal P10–P90 range per category with a median marker."""
+    cats = list(bands.keys())
+    p10, p50, p90 = (list(v) for v in zip(*bands.values())) if bands else ([], [], [])
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=cats, x=[hi - lo for lo, hi in zip(p10, p90)], base=p10, orientation="h",
+        marker=dict(color=color, opacity=0.35, line_width=0), name="P10–P90",
+        customdata=list(zip(p10, p90)),
+        hovertemplate="<b>%{y}</b><br>P10 %{customdata[0]:,.0f} – P90 %{customdata[1]:,.0f}<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        y=cats, x=p50, mode="markers", name="Medyan",
+        marker=dict(color=color, size=10, symbol="line-ns-open", line_width=3),
+        hovertemplate="<b>%{y}</b><br>Medyan %{x:,.0f}<extra></extra>",
+    ))
+    fig.update_layout(**_base_layout(), showlegend=False, xaxis_title="", yaxis_title="")
+    fig.update_xaxes(gridcolor="#f3f4f6", tickfont=dict(color="#111827"))
+    fig.update_yaxes(showgrid=False, tickfont=dict(color="#111827"))
+    return fig
+
+BUILDERS = {"bar": bar_figure, "pie": pie_figure, "trend": trend_figure, "band": band_figure}
+
+
+# ── Compact payloads ──────────────────────────────────────────────────────────
+# The styling every figure repeats, carried by one small template that
+# replaces the default (Streamlit's, ~3.7 kB of colorscales per figure).
+_AXIS_STYLE = dict(tickfont=dict(color="#111827"), title=dict(font=dict(color="#111827")))
+COMPACT_TEMPLATE = {"layout": {
+    **{k: v for k, v in _base_layout().items() if k not in ("margin", "height")},
+    "colorway": COLORS,
+    "xaxis": _AXIS_STYLE,
+    "yaxis": _AXIS_STYLE,
+}}
+# Decimals the hover labels show per chart kind
+PRECISION = {"bar": 1, "pie": 1, "band": 0, "trend": 2}
+
+
+def _strip(layout, template):
+    # Drop layout keys whose value the template already gives
+    for key, value in template.items():
+        if key not in layout:
+            continue
+        if isinstance(value, dict) and isinstance(layout[key], dict):
+            _strip(layout[key], value)
+            if not layout[key]:
+                del layout[key]
+        elif layout[key] == value:
+            del layout[key]
+
+
+def _round(values, digits):
+    if isinstance(values, list):
+        return [_round(v, digits) for v in values]
+    if isinstance(values, float):
+        v = round(values, digits)
+        return int(v) if v.is_integer() else v
+    return values
+
+
+def compact_spec(spec, kind):
+    """``spec`` with the shared template, values rounded to display precision, no whitespace."""
+    fig = json.loads(spec)
+    layout = fig["layout"]
+    layout.pop("template", None)
+    _strip(layout, COMPACT_TEMPLATE["layout"])
+    layout["template"] = COMPACT_TEMPLATE
+    for trace in fig["data"]:
+        for field in ("x", "y", "values", "base", "customdata"):
+            if field in trace:
+                trace[field] = _round(trace[field], PRECISION[kind])
+    return json.dumps(fig, separators=(",", ":"), ensure_ascii=False)
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+def figure_key(kind, title, *args, **style):
+    """Content hash of a chart's data, title and style arguments."""
+    payload = json.dumps([kind, title, args, style], sort_keys=True, ensure_ascii=False, default=float)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class FigureCache:
+    """Thread-safe LRU of serialized figures shared by every session.
+
+    ``get`` returns ``(spec_json, height)``; the figure is only built and
+    serialized on a miss.  With ``directory`` a miss first looks for
+    ``<key>.json`` there and every built figure is written to it.  With
+    ``compact`` specs go through ``compact_spec``.
+    """
+
+    def __init__(self, max_entries=512, directory=None, compact=False):
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory is not None else None
+        self.compact = compact
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+
+    def get(self, kind, title, *args, **style):
+        key = figure_key(kind, title, *args, **style) + ("-c" if self.compact else "")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._load(key, title)
+        if entry is None:
+            with span("figure_build", title):
+                fig = BUILDERS[kind](*args, **style)
+            with span("figure_serialize", title):
+                spec = pio.to_json(fig, validate=False)
+                if self.compact:
+                    spec = compact_spec(spec, kind)
+                entry = (spec, fig.layout.height)
+            self._store(key, entry[0])
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def _load(self, key, title):
+        if self.directory is None:
+            return None
+        try:
+            with span("figure_load", title):
+                spec = (self.directory / f"{key}.json").read_text()
+        except OSError:
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        return spec, json.loads(spec)["layout"].get("height")
+
+    def _store(self, key, spec):
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.json"
+        tmp = path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(spec)
+        os.replace(tmp, path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "compact": self.compact,
+                "max_entries": self.max_entries,
+                "bytes": sum(len(spec) for spec, _ in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
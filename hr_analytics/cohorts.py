@@ -0,0 +1,173 @@
+"""
+Hire cohorts: retention curves and tenure at exit.
+
+A cohort is everyone hired in one month.  For every company × department
+cell ``CohortEngine`` counts each month's hires by the number of month ends
+they stayed on the payroll, and each month's exits by tenure group, in one
+``bincount`` over the hire and termination dates of the employee table.  A
+filter state's ``COHORTS`` cohorts are then a slice of a dense array, so
+the curves of every department cost a few hundred microseconds each.
+
+Survival pools the cohorts Kaplan–Meier style: a cohort hired k months
+before the period's last month has been seen at k month ends after its
+hire month's, is at risk up to there and censored after, so recent cohorts
+count for the months they have had without dragging the tail of the curve
+down.  Being on the payroll at a month end matches ``HeadcountEngine``'s
+closing headcount (the termination date is the last working day).  Cohorts
+and exits are limited to the months the source data covers, as the trends
+are.
+"""
+
+import numpy as np
+
+from .aggregate import DAYS_PER_YEAR, labelled, period_windows, safe_div
+from .dims import COMPANIES, DEPARTMENTS, EXIT_TENURE_BOUNDS, EXIT_TENURE_GROUPS, month_label, period_months
+from .events import read_events
+from .store import DATA_DIR
+
+COHORTS = 24                             # monthly cohorts up to the period's last month
+HORIZON = 24                             # month ends after the hire month the curves run to
+SURVIVAL_PERIODS = [f"{k}. Ay" for k in range(HORIZON + 1)]
+# Survival series: all cohorts, then the newer and the older half apart
+SERIES = {
+    "Tüm Kohortlar": slice(None),
+    "Son 12 Ay İşe Girenler": slice(COHORTS // 2, None),
+    "Önceki 12 Ay İşe Girenler": slice(None, COHORTS // 2),
+}
+RETENTION_KPIS = {"retention_6m": 6, "retention_12m": 12}
+
+
+def month_of(days):
+    """Month key of each day number."""
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) + 1970 * 12
+
+
+def stay_months(hire_day, termination_day):
+    """Month ends on the payroll from the hire month on, capped at ``HORIZON + 1``.
+
+    ``termination_day`` is -1 for employees still employed.
+    """
+    left = termination_day >= 0
+    # The month of the first day off the payroll
+    departure = month_of(np.where(left, termination_day + 1, 0))
+    stayed = np.clip(departure - month_of(hire_day), 0, HORIZON + 1)
+    return np.where(left, stayed, HORIZON + 1)
+
+
+def exit_group(hire_day, termination_day):
+    """``EXIT_TENURE_GROUPS`` code of each exit's tenure."""
+    months = (termination_day - hire_day) / (DAYS_PER_YEAR / 12)
+    return np.searchsorted(EXIT_TENURE_BOUNDS, months, side="right")
+
+
+def survival(stays, observed):
+    """Pooled Kaplan–Meier retention (%) at 0..HORIZON month ends after hire.
+
+    ``stays`` counts each cohort's hires by ``stay_months``, shape (cohort,
+    HORIZON + 2); ``observed`` is the last month end each cohort was seen
+    at.  Points no cohort has reached yet are None.
+    """
+    k = np.arange(HORIZON + 2)
+    seen = k[None, :] <= np.asarray(observed)[:, None]
+    # At risk at month end k: hired, and not gone before it
+    at_risk = stays.sum(axis=1, keepdims=True) - (np.cumsum(stays, axis=1) - stays)
+    risk = (at_risk * seen).sum(axis=0)[:HORIZON + 1]
+    gone = (stays * seen).sum(axis=0)[:HORIZON + 1]
+    curve = np.cumprod(1 - safe_div(gone, risk)) * 100
+    reached = np.cumprod(risk > 0).astype(bool)
+    return [float(v) if ok else None for v, ok in zip(curve, reached)]
+
+
+def cohort_bundle(stays, cohorts, as_of, exits, exit_days):
+    """Cohort keys of a bundle.
+
+    ``stays`` (COHORTS, HORIZON + 2) counts the hires of each month in
+    ``cohorts`` by ``stay_months``, seen up to month ``as_of``; ``exits``
+    counts the period's exits per ``EXIT_TENURE_GROUPS`` and ``exit_days``
+    sums their tenure.
+    """
+    observed = as_of - np.asarray(cohorts)
+    hired = stays.sum(axis=1)
+    stayed = (stays * (np.arange(HORIZON + 2)[None, :] > observed[:, None])).sum(axis=1)
+    curves = {name: survival(stays[part], observed[part]) for name, part in SERIES.items()}
+    pooled = next(iter(curves.values()))
+    return {
+        **{key: pooled[k] for key, k in RETENTION_KPIS.items()},
+        "avg_exit_tenure": float(safe_div(exit_days, exits.sum())) / DAYS_PER_YEAR,
+        "survival_periods": SURVIVAL_PERIODS,
+        "survival_curve": curves,
+        "cohort_retention": labelled([month_label(int(m)) for m in cohorts], safe_div(stayed * 100, hired),
+                                     keep=hired > 0),
+        "exit_tenure": labelled(EXIT_TENURE_GROUPS, np.asarray(exits).astype(int)),
+    }
+
+
+class CohortEngine:
+    """Hire-cohort retention and tenure at exit of every company × department cell.
+
+    ``stays`` (company, dept, month, HORIZON + 2) counts each month's hires
+    by ``stay_months``; ``exits`` (company, dept, month, group) counts each
+    month's exits by tenure group and ``exit_days`` (company, dept, month)
+    sums their tenure in days.  Index 0 of company and dept holds the
+    margins, as in the cube.
+    """
+
+    def __init__(self, company, dept, hire_day, termination_day, first_month, last_month):
+        self.first_month, self.n_months = first_month, last_month - first_month + 1
+        n = self.n_months
+        cell = np.asarray(company, dtype=np.int64) * len(DEPARTMENTS) + dept
+        hire_day = np.asarray(hire_day, dtype=np.int64)
+        termination_day = np.asarray(termination_day, dtype=np.int64)
+
+        hired = month_of(hire_day) - first_month
+        self.stays = self._cells((cell * n + hired) * (HORIZON + 2) + stay_months(hire_day, termination_day),
+                                 (hired >= 0) & (hired < n), (n, HORIZON + 2))
+
+        left = termination_day >= 0
+        exited = month_of(np.where(left, termination_day, 0)) - first_month
+        in_data = left & (exited >= 0) & (exited < n)
+        groups = len(EXIT_TENURE_GROUPS)
+        self.exits = self._cells((cell * n + exited) * groups + exit_group(hire_day, termination_day),
+                                 in_data, (n, groups))
+        self.exit_days = self._cells(cell * n + exited, in_data, (n,), weights=termination_day - hire_day)
+
+    @staticmethod
+    def _cells(keys, mask, shape, weights=None):
+        # One bincount into (company, dept, *shape), then the margins
+        cells = (len(COMPANIES), len(DEPARTMENTS), *shape)
+        out = np.bincount(keys[mask], weights=None if weights is None else weights[mask],
+                          minlength=int(np.prod(cells))).reshape(cells)
+        out[:, 0] = out[:, 1:].sum(axis=1)
+        out[0] = out[1:].sum(axis=0)
+        return out
+
+    @classmethod
+    def open(cls, root=DATA_DIR):
+        return cls(*read_events(root))
+
+    def _section(self, c, d, as_of, idx):
+        # Cohort keys as of month ``as_of``, exits over month indexes ``idx``
+        cohorts = np.arange(as_of - COHORTS + 1, as_of + 1)
+        i = cohorts - self.first_month
+        inside = (i >= 0) & (i < self.n_months)
+        stays = np.zeros((COHORTS, HORIZON + 2), dtype=np.int64)
+        stays[inside] = self.stays[c, d, i[inside]]
+        return cohort_bundle(stays, cohorts, as_of, self.exits[c, d, idx].sum(axis=0), self.exit_days[c, d, idx].sum())
+
+    def bundle(self, company, period_type, period, dept):
+        """Survival curves, retention per cohort and tenure at exit for a filter state."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        requested = np.array(period_months(period_type, period))
+        idx = requested[(requested >= self.first_month) & (requested < self.first_month + self.n_months)] - self.first_month
+        as_of = int(idx[-1]) + self.first_month if len(idx) else int(requested[-1])
+        return self._section(c, d, as_of, idx)
+
+    def kpi_windows(self, company, period_type, period, dept):
+        """Retention and tenure-at-exit KPIs for the period, the previous period and a year ago."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        windows = period_windows(period_type, period, self.first_month, self.n_months)
+        if windows is None:
+            return {}
+        idx, ok = windows
+        values = [self._section(c, d, int(w[-1]) + self.first_month, w) if k else {} for w, k in zip(idx, ok)]
+        return {key: [v.get(key) for v in values] for key in (*RETENTION_KPIS, "avg_exit_tenure")}
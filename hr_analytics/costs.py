@@ -0,0 +1,174 @@
+"""
+Employer labor cost per employee-month: gross pay, overtime pay and SGK.
+
+SGK contributions are charged on gross pay plus overtime pay, floored at
+the gross minimum wage and capped at ``ceiling`` × that wage, at the
+employer rate less the incentive discount.  Rates live in ``RATE_TABLES``,
+each row effective from a month onward, so every month is costed with the
+rates that applied at the time.
+
+Results are kept per month as a company × department × position cell array
+under ``<data>/costs/``.  A month is recomputed only when its source
+partitions change or a rate table covering it is added or edited.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from .aggregate import TREND_MONTHS, labelled, period_windows, windowed
+from .dims import (
+    COMPANIES, DEPARTMENTS, MONTHLY_HOURS, OVERTIME_COLUMNS, POSITIONS,
+    month_key, period_months,
+)
+from .store import DATA_DIR, monthly_arrays, partition_fingerprint, read_month
+
+# Each row overrides the previous one from its effective month (YYYY-MM)
+RATE_TABLES = [
+    {
+        "effective": "2023-01",
+        "min_wage": 10_008.00,          # gross monthly minimum wage
+        "ceiling": 7.5,                 # contribution ceiling, × min_wage
+        "employer_rate": 0.2275,        # employer share incl. unemployment insurance
+        "incentive": 0.05,              # 5-point Treasury incentive (5510 s. md. 81/ı)
+        "overtime_premium": [1.5, 1.5, 2.0],   # weekday / weekend / public holiday
+    },
+    {"effective": "2023-07", "min_wage": 13_414.50},
+    {"effective": "2024-01", "min_wage": 20_002.50},
+    {"effective": "2025-01", "min_wage": 26_005.50},
+    {"effective": "2026-01", "min_wage": 33_030.00},
+]
+
+COMPONENTS = ["Brüt Ücret", "Fazla Mesai", "SGK İşveren Payı"]
+_GROSS, _OVERTIME, _SGK = range(len(COMPONENTS))
+
+
+def _effective_month(table):
+    year, month = table["effective"].split("-")
+    return month_key(int(year), int(month))
+
+
+def rates_for(month, tables=RATE_TABLES):
+    """Rate table in force during ``month``."""
+    rates = {}
+    for table in sorted(tables, key=_effective_month):
+        if _effective_month(table) <= month:
+            rates.update(table)
+    return rates
+
+
+def rates_version(rates):
+    return hashlib.sha1(json.dumps(rates, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def employee_costs(salary, overtime_hours, rates):
+    """(gross, overtime pay, employer SGK) arrays for one month's rows.
+
+    ``overtime_hours`` has one column per overtime type.
+    """
+    salary = np.asarray(salary, dtype=np.float64)
+    hourly = salary / MONTHLY_HOURS
+    overtime = np.asarray(overtime_hours, dtype=np.float64) @ np.asarray(rates["overtime_premium"]) * hourly
+    floor = rates["min_wage"]
+    base = np.clip(salary + overtime, floor, floor * rates["ceiling"])
+    sgk = base * (rates["employer_rate"] - rates["incentive"])
+    return salary, overtime, sgk
+
+
+def row_costs(store, rows, tables=RATE_TABLES):
+    """(n, component) costs of ``HRStore`` snapshot rows, each at its month's rates."""
+    month = store.snap("month")[rows]
+    out = np.zeros((len(rows), len(COMPONENTS)))
+    for m in np.unique(month):
+        hit = np.flatnonzero(month == m)
+        r = rows[hit]
+        hours = np.column_stack([store.quantity(col, r) for col in OVERTIME_COLUMNS])
+        out[hit] = np.column_stack(employee_costs(store.money("salary", r), hours, rates_for(int(m), tables)))
+    return out
+
+
+def month_cells(df, rates):
+    """Cost components summed per company × department × position, with margins."""
+    n_co, n_dept, n_pos = len(COMPANIES), len(DEPARTMENTS), len(POSITIONS)
+    hours = np.column_stack([df[col].to_numpy(np.float64) for col in OVERTIME_COLUMNS])
+    components = employee_costs(df["salary"].to_numpy(), hours, rates)
+    cell = ((df["company"].cat.codes.to_numpy().astype(np.int64) * n_dept
+             + df["department"].cat.codes.to_numpy()) * n_pos
+            + df["position"].cat.codes.to_numpy())
+    out = np.stack([np.bincount(cell, w, minlength=n_co * n_dept * n_pos) for w in components], axis=-1)
+    out = out.reshape(n_co, n_dept, n_pos, len(COMPONENTS))
+    out[0] = out[1:].sum(axis=0)
+    out[:, 0] = out[:, 1:].sum(axis=1)
+    return out
+
+
+class CostEngine:
+    """``cells[company, dept, month, position, component]`` for every data month."""
+
+    def __init__(self, cells, first_month, recomputed=()):
+        self.cells = cells
+        self.first_month = first_month
+        self.n_months = cells.shape[2]
+        self.recomputed = list(recomputed)
+
+    @classmethod
+    def open(cls, root=DATA_DIR, tables=RATE_TABLES):
+        """Load the persisted monthly costs, recomputing stale months only."""
+        def stamp(m):
+            return {"rates": rates_version(rates_for(m, tables)), "source": partition_fingerprint(m, root)}
+
+        def compute(m):
+            df = read_month(m, root, ["company", "department", "position", "salary"])
+            return month_cells(df, rates_for(m, tables))
+
+        months, arrays, recomputed = monthly_arrays("costs", stamp, compute, root)
+        first = months[0]
+        cells = np.zeros((len(COMPANIES), len(DEPARTMENTS), months[-1] - first + 1,
+                          len(POSITIONS), len(COMPONENTS)))
+        for m, arr in zip(months, arrays):
+            cells[:, :, m - first] = arr
+        return cls(cells, first, recomputed)
+
+    def bundle(self, company, period_type, period, dept):
+        """Cost KPIs plus breakdowns by department, position and month."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        requested = np.array(period_months(period_type, period))
+        idx = requested - self.first_month
+        idx = idx[(idx >= 0) & (idx < self.n_months)]
+        last = int(self.first_month + idx[-1]) if len(idx) else int(requested[-1])
+
+        by_dept = self.cells[c, :, idx].sum(axis=0)                  # (dept, position, component)
+        totals = by_dept[d].sum(axis=0)
+        dept_cost = by_dept[1:].sum(axis=(1, 2))
+        pos_cost = by_dept[d].sum(axis=1)
+        in_filter = (np.arange(1, len(DEPARTMENTS)) == d) | (d == 0)
+
+        window = np.arange(last - TREND_MONTHS + 1, last + 1) - self.first_month
+        in_data = (window >= 0) & (window < self.n_months)
+        trend = np.zeros((TREND_MONTHS, len(COMPONENTS)))
+        trend[in_data] = self.cells[c, d, window[in_data]].sum(axis=1)
+
+        return {
+            "cost_labor_total": float(totals[_GROSS]),
+            "cost_sgk_total": float(totals[_SGK]),
+            "cost_overtime_total": float(totals[_OVERTIME]),
+            "cost_by_dept": labelled(DEPARTMENTS[1:], dept_cost.round(), keep=(dept_cost > 0) & in_filter),
+            "cost_by_position": labelled(POSITIONS, pos_cost.round(), keep=pos_cost > 0),
+            # Same 12-month window as the bundle's ``trend_periods``
+            "cost_trend": {name: trend[:, i].round().tolist() for i, name in enumerate(COMPONENTS)},
+        }
+
+    def kpi_windows(self, company, period_type, period, dept):
+        """Cost KPIs for the period, the previous period and a year ago."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        windows = period_windows(period_type, period, self.first_month, self.n_months)
+        if windows is None:
+            return {}
+        idx, ok = windows
+        totals = self.cells[c, d][idx].sum(axis=(1, 2))              # (window, component)
+        return windowed({
+            "cost_labor_total": totals[:, _GROSS],
+            "cost_sgk_total": totals[:, _SGK],
+            "cost_overtime_total": totals[:, _OVERTIME],
+        }, ok)
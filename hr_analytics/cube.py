@@ -0,0 +1,560 @@
+"""
+Pre-aggregated company × department × month cube.
+
+Every cell holds additive measures (counts, sums, sums of squares) plus
+min/max extremes, so a quarter or a year is answered by merging 3 or 12
+monthly cells instead of rescanning rows.  Index 0 on the company and
+department axes holds the precomputed margin ("Tüm Şirketler" /
+"Tüm Departmanlar").
+
+The cube is persisted under ``<data>/cube/`` as ``.npy`` files, memory-mapped
+at startup and rebuilt whenever the source Parquet files change.  Rebuilds
+fan out over a process pool (``HR_WORKERS``): each worker reads one
+company's month × company partitions for a block of months and returns
+just those cells; the parent places them and adds the margins.
+``Cube.refresh`` rebuilds only the cells of changed partitions.
+"""
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .aggregate import (
+    TREND_MONTHS, age_group, labelled, period_windows, safe_div, tenure_group, windowed, years_between,
+)
+from .dims import (
+    ABSENCE_COLUMNS, ABSENCE_TYPES, AGE_GROUPS, COLLARS, COMPANIES, DEPARTMENTS,
+    GENDERS, MONTHLY_HOURS, OVERTIME_COLUMNS, OVERTIME_TYPES, POSITIONS,
+    TENURE_GROUPS, TERMINATION_REASONS, month_label, period_months,
+)
+from .store import DATA_DIR, HRStore, company_file, partition_months, source_fingerprint
+
+CUBE_VERSION = 1
+
+# Processes for rebuilding the cube; 1 builds in-process
+WORKERS = int(os.environ.get("HR_WORKERS", os.cpu_count() or 1))
+
+# (measure, width) in cell order.  Stock measures are counted in every month a
+# row exists and read from the period's last month; the rest are summed.
+LAYOUT = [
+    ("headcount", 1),
+    ("age_sum", 1),
+    ("tenure_sum", 1),
+    ("retired", 1),
+    ("gender", len(GENDERS)),
+    ("collar", len(COLLARS)),
+    ("position", len(POSITIONS)),
+    ("age_group", len(AGE_GROUPS)),
+    ("tenure_group", len(TENURE_GROUPS)),
+    ("leave_balance", 1),
+    ("salary_sum", 1),
+    ("salary_sumsq", 1),
+    ("salary_by_position", len(POSITIONS)),
+    ("salary_by_tenure", len(TENURE_GROUPS)),
+    ("overtime", len(OVERTIME_TYPES)),
+    ("overtime_by_position", len(POSITIONS)),
+    ("absence", len(ABSENCE_TYPES)),
+    ("absence_by_tenure", len(TENURE_GROUPS)),
+    ("absence_by_age", len(AGE_GROUPS)),
+    # Employee events, bucketed by the month they happen in
+    ("hires", 1),
+    ("terminations", 1),
+    ("termination_reasons", len(TERMINATION_REASONS)),
+    ("termination_by_collar", len(COLLARS)),
+    ("termination_by_tenure", len(TENURE_GROUPS)),
+]
+
+SLICES = {}
+_offset = 0
+for _name, _width in LAYOUT:
+    SLICES[_name] = slice(_offset, _offset + _width)
+    _offset += _width
+N_MEASURES = _offset
+
+# Measures counted from the employee table; the rest come from snapshot rows
+EVENT_MEASURES = ("hires", "terminations", "termination_reasons", "termination_by_collar", "termination_by_tenure")
+_FROM_SNAPSHOTS = np.ones(N_MEASURES, dtype=bool)
+for _name in EVENT_MEASURES:
+    _FROM_SNAPSHOTS[SLICES[_name]] = False
+
+
+class _Cell:
+    """Named view over one measure vector."""
+
+    def __init__(self, values):
+        self.values = values
+
+    def __getitem__(self, name):
+        sl = SLICES[name]
+        return self.values[..., sl] if sl.stop - sl.start > 1 else self.values[..., sl.start]
+
+
+# ── Building ──────────────────────────────────────────────────────────────────
+class _Builder:
+    def __init__(self, n_cells):
+        self.n_cells = n_cells
+        self.sums = np.zeros((n_cells, N_MEASURES))
+
+    def add(self, cells, name, weights=None, group=None, column=0):
+        """Accumulate ``weights`` (or row counts) into each row's cell.
+
+        With ``group`` the measure is a histogram over that code; otherwise
+        ``column`` picks the slot inside a multi-column measure.
+        """
+        sl = SLICES[name]
+        if group is None:
+            self.sums[:, sl.start + column] += np.bincount(cells, weights, minlength=self.n_cells)
+            return
+        width = sl.stop - sl.start
+        hist = np.bincount(cells * width + group, weights, minlength=self.n_cells * width)
+        self.sums[:, sl] += hist.reshape(self.n_cells, width)
+
+
+def _accumulate(store, first, n_months, company=None):
+    """Flat (month, company, dept) cell sums and salary extremes of ``store``.
+
+    Covers months ``first .. first + n_months - 1``; with ``company`` only
+    that company's employee events are counted (its snapshot rows are all
+    the store holds).
+    """
+    n_co, n_dept = len(COMPANIES), len(DEPARTMENTS)
+    only = None if company is None else COMPANIES.index(company)
+    b = _Builder(n_months * n_co * n_dept)
+
+    # Snapshot rows — their segment key is the (month, company, dept) cell
+    cells = store.segment_keys + (int(store.months[0]) - first) * n_co * n_dept
+    emp = store.snap_emp
+    end = store.month_end(store.snap("month"))
+    age = years_between(store.emp("birth_date")[emp], end)
+    tenure = years_between(store.emp("hire_date")[emp], end)
+    tgrp, agrp = tenure_group(tenure), age_group(age)
+    pos = store.snap("position")
+    salary = store.money("salary")
+
+    b.add(cells, "headcount")
+    b.add(cells, "age_sum", age)
+    b.add(cells, "tenure_sum", tenure)
+    b.add(cells, "retired", store.emp("retired")[emp].astype(np.float64))
+    b.add(cells, "gender", group=store.emp("gender")[emp])
+    b.add(cells, "collar", group=store.emp("collar")[emp])
+    b.add(cells, "position", group=pos)
+    b.add(cells, "age_group", group=agrp)
+    b.add(cells, "tenure_group", group=tgrp)
+    b.add(cells, "leave_balance", store.quantity("leave_balance"))
+    b.add(cells, "salary_sum", salary)
+    b.add(cells, "salary_sumsq", salary * salary)
+    b.add(cells, "salary_by_position", salary, group=pos)
+    b.add(cells, "salary_by_tenure", salary, group=tgrp)
+
+    hours = np.zeros(len(cells))
+    for i, col in enumerate(OVERTIME_COLUMNS):
+        h = store.quantity(col)
+        b.add(cells, "overtime", h, column=i)
+        hours += h
+    b.add(cells, "overtime_by_position", hours, group=pos)
+    del hours
+
+    days = np.zeros(len(cells))
+    for i, col in enumerate(ABSENCE_COLUMNS):
+        d = store.quantity(col)
+        b.add(cells, "absence", d, column=i)
+        days += d
+    b.add(cells, "absence_by_tenure", days, group=tgrp)
+    b.add(cells, "absence_by_age", days, group=agrp)
+    del days, age, tenure, tgrp, agrp
+
+    # Employee events
+    company, dept = store.emp("company"), store.emp("department")
+
+    def event_cells(month_col):
+        m = store.emp(month_col) - first
+        ok = (m >= 0) & (m < n_months)
+        if only is not None:
+            ok &= company == only
+        return ((m * n_co + company) * n_dept + dept)[ok], ok
+
+    hired, _ = event_cells("hire_month")
+    b.add(hired, "hires")
+    left, ok = event_cells("termination_month")
+    reason = store.emp("termination_reason")[ok]
+    b.add(left, "terminations")
+    b.add(left[reason >= 0], "termination_reasons", group=reason[reason >= 0])
+    b.add(left, "termination_by_collar", group=store.emp("collar")[ok])
+    exit_tenure = years_between(store.emp("hire_date")[ok], store.emp("termination_date")[ok])
+    b.add(left, "termination_by_tenure", group=tenure_group(exit_tenure))
+
+    # Extremes: rows are sorted by cell, so each cell is one contiguous run
+    mins = np.full(b.n_cells, np.inf)
+    maxs = np.full(b.n_cells, -np.inf)
+    if len(cells):
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        mins[cells[starts]] = np.minimum.reduceat(salary, starts)
+        maxs[cells[starts]] = np.maximum.reduceat(salary, starts)
+    return b.sums, mins, maxs
+
+
+def _to_cube(a, n_months):
+    """Flat (month, company, dept, ...) cells as (company, dept, month, ...)."""
+    a = a.reshape(n_months, len(COMPANIES), len(DEPARTMENTS), -1)
+    return np.ascontiguousarray(a.transpose(1, 2, 0, 3))
+
+
+def _margins(sums, mins, maxs, months=slice(None)):
+    """Fill the company and department margins (index 0) of ``months``."""
+    for arr, merge in ((sums, np.sum), (mins, np.min), (maxs, np.max)):
+        arr[0, :, months] = merge(arr[1:, :, months], axis=0)
+        arr[:, 0, months] = merge(arr[:, 1:, months], axis=1)
+
+
+def _assemble(sums, mins, maxs, first, n_months):
+    """Cube of flat cell arrays, with the company and department margins."""
+    sums, mins, maxs = _to_cube(sums, n_months), _to_cube(mins, n_months), _to_cube(maxs, n_months)
+    _margins(sums, mins, maxs)
+    return Cube(sums, mins, maxs, first)
+
+
+def _build(store):
+    first = int(store.months[0])
+    n_months = int(store.months[-1]) - first + 1
+    return _assemble(*_accumulate(store, first, n_months), first, n_months)
+
+
+# ── Parallel build ────────────────────────────────────────────────────────────
+def _partial(root, company, months, first, n_months):
+    """Cells of one company over a block of months, read from its partitions.
+
+    Runs in a pool worker and returns only that company's cells:
+    (company code, block offset, sums, mins, maxs), or None if the company
+    has no rows in the block.
+    """
+    if not any(company_file(m, company, root).exists() for m in months):
+        return None
+    store = HRStore.open(root, company=company, months=months)
+    block0 = months[0]
+    block = months[-1] - block0 + 1
+    sums, mins, maxs = _accumulate(store, block0, block, company)
+    c = COMPANIES.index(company)
+    shape = (block, len(COMPANIES), len(DEPARTMENTS))
+    return (c, block0 - first, sums.reshape(*shape, -1)[:, c],
+            mins.reshape(shape)[:, c], maxs.reshape(shape)[:, c])
+
+
+def build_parallel(root=DATA_DIR, workers=WORKERS):
+    """Cube built by a process pool over company × month-block partitions.
+
+    Partials cover disjoint cells and keep each cell's rows in file order,
+    so the merged cube equals ``Cube.build(HRStore.open(root))`` exactly.
+    """
+    root = Path(root)
+    months = partition_months(root)
+    first, n_months = months[0], months[-1] - months[0] + 1
+    companies = COMPANIES[1:]
+    # Enough blocks for every worker to get about two tasks
+    n_blocks = min(len(months), max(1, -(-2 * workers // len(companies))))
+    blocks = [list(b) for b in np.array_split(months, n_blocks)]
+    tasks = [(root, company, [int(m) for m in block], first, n_months)
+             for company in companies for block in blocks]
+
+    n_co, n_dept = len(COMPANIES), len(DEPARTMENTS)
+    sums = np.zeros((n_months, n_co, n_dept, N_MEASURES))
+    mins = np.full((n_months, n_co, n_dept), np.inf)
+    maxs = np.full((n_months, n_co, n_dept), -np.inf)
+    # Rebuilds run in the server's session and watcher threads, and forking a
+    # multi-threaded process can deadlock the child, so workers come from a
+    # fork server that preloads this module.  Like spawned ones they import
+    # __main__ again: under Streamlit its CLI entry point, not app.py.
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    if ctx.get_start_method() == "forkserver":
+        ctx.set_forkserver_preload([__name__])
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        for part in pool.map(_partial, *zip(*tasks)):
+            if part is None:
+                continue
+            c, i0, s, lo, hi = part
+            sums[i0:i0 + len(s), c] = s
+            mins[i0:i0 + len(s), c] = lo
+            maxs[i0:i0 + len(s), c] = hi
+    return _assemble(sums.reshape(-1, N_MEASURES), mins.ravel(), maxs.ravel(), first, n_months)
+
+
+# ── Cube ──────────────────────────────────────────────────────────────────────
+class Cube:
+    """``sums[company, dept, month, measure]`` plus salary ``mins``/``maxs``."""
+
+    def __init__(self, sums, mins, maxs, first_month):
+        self.sums, self.mins, self.maxs = sums, mins, maxs
+        self.first_month = first_month
+        self.n_months = sums.shape[2]
+        has_rows = np.asarray(sums[0, 0, :, SLICES["headcount"].start]) > 0
+        self.months = [first_month + int(i) for i in np.flatnonzero(has_rows)]
+        self._month_set = set(self.months)
+
+    @classmethod
+    def build(cls, store):
+        return _build(store)
+
+    def save(self, path, source=""):
+        """Write the cube atomically: build in a sibling temp dir, then swap it in."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=".cube-"))
+        for name in ("sums", "mins", "maxs"):
+            np.save(tmp / f"{name}.npy", np.asarray(getattr(self, name)))
+        meta = {
+            "version": CUBE_VERSION,
+            "first_month": self.first_month,
+            "layout": LAYOUT,
+            "source": source,
+        }
+        (tmp / "meta.json").write_text(json.dumps(meta))
+        old = path.with_name(path.name + ".old")
+        if path.exists():
+            path.rename(old)
+        tmp.rename(path)
+        shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        meta = json.loads((path / "meta.json").read_text())
+        arrays = [np.load(path / f"{name}.npy", mmap_mode="r") for name in ("sums", "mins", "maxs")]
+        return cls(*arrays, meta["first_month"])
+
+    @classmethod
+    def open(cls, root=DATA_DIR, workers=WORKERS):
+        """Memory-map the persisted cube, rebuilding it first if it is stale.
+
+        With more than one worker the rebuild runs in a process pool
+        (``build_parallel``).
+        """
+        root = Path(root)
+        path = root / "cube"
+        source = source_fingerprint(root)
+        if _meta(path) != {"version": CUBE_VERSION, "layout": _json(LAYOUT), "source": source}:
+            cube = build_parallel(root, workers) if workers > 1 else cls.build(HRStore.open(root))
+            cube.save(path, source)
+        return cls.load(path)
+
+    def refresh(self, root, partitions):
+        """This cube with the cells of changed company × month partitions rebuilt.
+
+        ``partitions`` are the (company, month) snapshot partitions whose
+        files were rewritten, added or removed since the cube was built;
+        each is re-read on its own.  Months past the cube's last are built
+        whole and appended.  Event measures come from the employee table,
+        which is assumed unchanged, and are kept.  The result is saved and
+        memory-mapped like ``open``; None when the source months no longer
+        start where the cube does or end before it, which takes a full
+        ``open``.
+        """
+        root = Path(root)
+        months = partition_months(root)
+        first, last = self.first_month, self.first_month + self.n_months - 1
+        if not months or months[0] != first or months[-1] < last:
+            return None
+        n_months = months[-1] - first + 1
+        pad = ((0, 0), (0, 0), (0, n_months - self.n_months), (0, 0))
+        sums = np.pad(np.asarray(self.sums), pad)
+        mins = np.pad(np.asarray(self.mins), pad, constant_values=np.inf)
+        maxs = np.pad(np.asarray(self.maxs), pad, constant_values=-np.inf)
+
+        touched = set()
+        if months[-1] > last:
+            store = HRStore.open(root, months=[m for m in months if m > last])
+            cells = _accumulate(store, last + 1, months[-1] - last)
+            for arr, new in zip((sums, mins, maxs), cells):
+                arr[:, :, last + 1 - first:] = _to_cube(new, months[-1] - last)
+            touched.update(range(last + 1 - first, n_months))
+
+        n_co, n_dept = len(COMPANIES), len(DEPARTMENTS)
+        for company, month in sorted(partitions):
+            if month > last:
+                continue
+            c, i = COMPANIES.index(company), month - first
+            cell = np.zeros((n_dept, N_MEASURES))
+            lo, hi = np.full(n_dept, np.inf), np.full(n_dept, -np.inf)
+            if company_file(month, company, root).exists():
+                store = HRStore.open(root, company=company, months=[month])
+                s, lo, hi = _accumulate(store, month, 1, company)
+                cell, lo, hi = s.reshape(n_co, n_dept, -1)[c], lo.reshape(n_co, n_dept)[c], hi.reshape(n_co, n_dept)[c]
+            sums[c, :, i][:, _FROM_SNAPSHOTS] = cell[:, _FROM_SNAPSHOTS]
+            mins[c, :, i, 0], maxs[c, :, i, 0] = lo, hi
+            touched.add(i)
+
+        for i in sorted(touched):
+            _margins(sums, mins, maxs, i)
+        path = root / "cube"
+        Cube(sums, mins, maxs, first).save(path, source_fingerprint(root))
+        return Cube.load(path)
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+    def available(self, months):
+        return [m for m in months if m in self._month_set]
+
+    def bundle(self, company, period_type, period, dept):
+        """Same dict as ``aggregate.bundle``, merged from monthly cells."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        requested = period_months(period_type, period)
+        months = self.available(requested)
+        last = months[-1] if months else requested[-1]
+        n_months = max(len(months), 1)
+
+        zero = np.zeros((len(DEPARTMENTS), N_MEASURES))
+        if months:
+            i0, i1 = months[0] - self.first_month, months[-1] - self.first_month + 1
+            by_dept_flow = np.asarray(self.sums[c, :, i0:i1]).sum(axis=1)
+            by_dept_stock = np.asarray(self.sums[c, :, i1 - 1])
+            lo = float(np.min(self.mins[c, d, i0:i1]))
+            hi = float(np.max(self.maxs[c, d, i0:i1]))
+        else:
+            by_dept_flow = by_dept_stock = zero
+            lo, hi = np.inf, -np.inf
+        flow, stock = _Cell(by_dept_flow[d]), _Cell(by_dept_stock[d])
+        dept_flow, dept_stock = _Cell(by_dept_flow[1:]), _Cell(by_dept_stock[1:])
+        in_filter = (np.arange(1, len(DEPARTMENTS)) == d) | (d == 0)
+
+        headcount = stock["headcount"]
+        heads = flow["headcount"]
+        avg_headcount = heads / n_months
+        salary_avg = float(safe_div(flow["salary_sum"], heads))
+        salary_min, salary_max = (lo, hi) if np.isfinite(lo) else (0.0, 0.0)
+        pos_heads = flow["position"]
+        dept_heads = dept_flow["headcount"]
+        overtime = flow["overtime"]
+        absence = flow["absence"]
+        terminations = flow["terminations"]
+
+        window = np.arange(last - TREND_MONTHS + 1, last + 1)
+        trend_idx = window - self.first_month
+        in_cube = (trend_idx >= 0) & (trend_idx < self.n_months)
+
+        def trend(name):
+            out = np.zeros(TREND_MONTHS)
+            out[in_cube] = self.sums[c, d, trend_idx[in_cube], SLICES[name].start]
+            return out.astype(int).tolist()
+
+        return {
+            # Demografi
+            "headcount": int(headcount),
+            "avg_age": float(safe_div(stock["age_sum"], headcount)),
+            "avg_tenure": float(safe_div(stock["tenure_sum"], headcount)),
+            "retired_count": int(stock["retired"]),
+            "gender": labelled(GENDERS, stock["gender"].astype(int)),
+            "collar": labelled(COLLARS, stock["collar"].astype(int)),
+            "headcount_by_dept": labelled(DEPARTMENTS[1:], dept_stock["headcount"].astype(int),
+                                          keep=(dept_stock["headcount"] > 0) & in_filter),
+            "headcount_by_position": labelled(POSITIONS, stock["position"].astype(int),
+                                              keep=stock["position"] > 0),
+            "age_groups": labelled(AGE_GROUPS, stock["age_group"].astype(int)),
+            "tenure_groups": labelled(TENURE_GROUPS, stock["tenure_group"].astype(int)),
+            "headcount_trend": trend("headcount"),
+            "trend_periods": [month_label(int(m)) for m in window],
+
+            # Ücret
+            "salary_avg": salary_avg,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "salary_std": float(np.sqrt(max(safe_div(flow["salary_sumsq"], heads) - salary_avg ** 2, 0))),
+            "salary_hourly_avg": salary_avg / MONTHLY_HOURS,
+            "salary_hourly_min": salary_min / MONTHLY_HOURS,
+            "salary_hourly_max": salary_max / MONTHLY_HOURS,
+            "salary_by_dept": labelled(DEPARTMENTS[1:], safe_div(dept_flow["salary_sum"], dept_heads),
+                                       keep=(dept_heads > 0) & in_filter),
+            "salary_by_position": labelled(POSITIONS, safe_div(flow["salary_by_position"], pos_heads),
+                                           keep=pos_heads > 0),
+            "salary_by_tenure": labelled(TENURE_GROUPS, safe_div(flow["salary_by_tenure"], flow["tenure_group"])),
+
+            # Fazla Mesai
+            "overtime_total": float(overtime.sum()),
+            "overtime_avg": float(safe_div(overtime.sum(), avg_headcount)),
+            "overtime_by_position": labelled(POSITIONS, safe_div(flow["overtime_by_position"], pos_heads / n_months),
+                                             keep=pos_heads > 0),
+            "overtime_by_type": labelled(OVERTIME_TYPES, overtime),
+
+            # Devamsızlık
+            "total_absent_days": float(absence.sum()),
+            "avg_absent_days": float(safe_div(absence.sum(), avg_headcount)),
+            "total_annual_leave_balance": float(stock["leave_balance"]),
+            "avg_annual_leave_balance": float(safe_div(stock["leave_balance"], headcount)),
+            "total_used_annual_leave": float(absence[0]),
+            "avg_used_annual_leave": float(safe_div(absence[0], avg_headcount)),
+            "absence_types": labelled(ABSENCE_TYPES, absence),
+            "absence_by_tenure": labelled(TENURE_GROUPS, safe_div(flow["absence_by_tenure"], flow["tenure_group"] / n_months)),
+            "absence_by_age": labelled(AGE_GROUPS, safe_div(flow["absence_by_age"], flow["age_group"] / n_months)),
+
+            # İşe Alım & Çıkış
+            "hires": int(flow["hires"]),
+            "terminations": int(terminations),
+            "turnover_rate_monthly": float(safe_div(terminations * 100, avg_headcount * n_months)),
+            "turnover_rate_yearly": float(safe_div(terminations * 100, avg_headcount)),
+            "termination_reasons": labelled(TERMINATION_REASONS, flow["termination_reasons"].astype(int)),
+            "termination_by_collar": labelled(COLLARS, flow["termination_by_collar"].astype(int)),
+            "termination_by_tenure": labelled(TENURE_GROUPS, flow["termination_by_tenure"].astype(int)),
+            "hires_trend": trend("hires"),
+            "terminations_trend": trend("terminations"),
+        }
+
+    def kpi_windows(self, company, period_type, period, dept):
+        """Scalar KPIs of ``bundle`` for the period, the previous period and a year ago.
+
+        One gather of the cell's monthly vectors, shape (window, month,
+        measure), feeds every KPI at once; see ``aggregate.windowed``.
+        """
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        windows = period_windows(period_type, period, self.first_month, self.n_months)
+        if windows is None:
+            return {}
+        idx, ok = windows
+        cells = np.asarray(self.sums[c, d])
+        flow, stock = _Cell(cells[idx].sum(axis=1)), _Cell(cells[idx[:, -1]])
+        lo = np.asarray(self.mins[c, d]).reshape(-1)[idx].min(axis=1)
+        hi = np.asarray(self.maxs[c, d]).reshape(-1)[idx].max(axis=1)
+        lo, hi = np.where(np.isfinite(lo), lo, 0.0), np.where(np.isfinite(hi), hi, 0.0)
+
+        headcount = stock["headcount"]
+        avg_headcount = flow["headcount"] / idx.shape[1]
+        salary_avg = safe_div(flow["salary_sum"], flow["headcount"])
+        overtime = flow["overtime"].sum(axis=-1)
+        absence = flow["absence"]
+        return windowed({
+            "headcount": headcount,
+            "avg_age": safe_div(stock["age_sum"], headcount),
+            "avg_tenure": safe_div(stock["tenure_sum"], headcount),
+            "retired_count": stock["retired"],
+            "salary_avg": salary_avg,
+            "salary_min": lo,
+            "salary_max": hi,
+            "salary_hourly_avg": salary_avg / MONTHLY_HOURS,
+            "salary_hourly_min": lo / MONTHLY_HOURS,
+            "salary_hourly_max": hi / MONTHLY_HOURS,
+            "overtime_total": overtime,
+            "overtime_avg": safe_div(overtime, avg_headcount),
+            "total_absent_days": absence.sum(axis=-1),
+            "avg_absent_days": safe_div(absence.sum(axis=-1), avg_headcount),
+            "total_annual_leave_balance": stock["leave_balance"],
+            "avg_annual_leave_balance": safe_div(stock["leave_balance"], headcount),
+            "total_used_annual_leave": absence[:, 0],
+            "avg_used_annual_leave": safe_div(absence[:, 0], avg_headcount),
+            "hires": flow["hires"],
+            "terminations": flow["terminations"],
+            "turnover_rate_monthly": safe_div(flow["terminations"] * 100, avg_headcount * idx.shape[1]),
+            "turnover_rate_yearly": safe_div(flow["terminations"] * 100, avg_headcount),
+        }, ok)
+
+
+def _json(obj):
+    return json.loads(json.dumps(obj))
+
+def _meta(path):
+    try:
+        meta = json.loads((Path(path) / "meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+    return {k: meta.get(k) for k in ("version", "layout", "source")}
@@ -0,0 +1,109 @@
+"""
+Dimension tables and period helpers shared by the dashboard and the data layer.
+
+Code ``i`` of a coded dimension decodes to ``LIST[i]``.  For companies and
+departments index 0 is the "all" entry, so real members start at 1.
+"""
+
+import numpy as np
+
+DEPARTMENTS = [
+    "Tüm Departmanlar",
+    "Yazılım & Teknoloji",
+    "Satış & Pazarlama",
+    "Muhasebe & Finans",
+    "İnsan Kaynakları",
+    "Operasyon",
+    "Hukuk",
+    "Yönetim",
+]
+
+COMPANIES = [
+    "Tüm Şirketler",
+    "Şirket A",
+    "Şirket B",
+    "Şirket C",
+]
+
+MONTHS_TR = [
+    "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+    "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık",
+]
+
+POSITIONS = [
+    "Yazılım Geliştirici", "Satış Temsilcisi", "Muhasebe Uzmanı",
+    "İK Uzmanı", "Operasyon Uzmanı", "Yönetici", "Diğer",
+]
+
+COLLARS = ["Beyaz Yaka", "Mavi Yaka"]
+GENDERS = ["Erkek", "Kadın"]
+
+AGE_GROUPS = ["18-25", "26-35", "36-45", "46-55", "55+"]
+AGE_BOUNDS = [26, 36, 46, 56]            # lower edge (years) of each group after the first
+
+TENURE_GROUPS = ["0-1 Yıl", "1-3 Yıl", "3-5 Yıl", "5-10 Yıl", "10+ Yıl"]
+TENURE_BOUNDS = [1, 3, 5, 10]
+
+# Tenure at exit, finer in the first years where most exits fall
+EXIT_TENURE_GROUPS = ["0-3 Ay", "3-6 Ay", "6-12 Ay", "1-2 Yıl", "2-5 Yıl", "5-10 Yıl", "10+ Yıl"]
+EXIT_TENURE_BOUNDS = [3, 6, 12, 24, 60, 120]     # lower edge (months) of each group after the first
+
+ABSENCE_TYPES = [
+    "Yıllık İzin", "Hastalık İzni", "Mazeret İzni",
+    "Ücretsiz İzin", "Babalık İzni", "Diğer",
+]
+ABSENCE_COLUMNS = [
+    "absence_annual", "absence_sick", "absence_excuse",
+    "absence_unpaid", "absence_paternity", "absence_other",
+]
+
+OVERTIME_TYPES = ["Hafta İçi", "Hafta Sonu", "Resmi Tatil"]
+OVERTIME_COLUMNS = ["overtime_weekday", "overtime_weekend", "overtime_holiday"]
+
+TERMINATION_REASONS = ["İstifa", "Sözleşme Sonu", "Emeklilik", "İşten Çıkarma"]
+
+PERIOD_TYPES = ["Aylık", "Çeyreklik", "Yıllık"]
+
+MONTHLY_HOURS = 225                      # statutory monthly working hours (İş Kanunu)
+
+
+# ── Months ────────────────────────────────────────────────────────────────────
+# A month is stored as a single int: year * 12 + (month - 1).
+
+def month_key(year, month):
+    return year * 12 + month - 1
+
+def month_label(key):
+    return f"{MONTHS_TR[key % 12]} {key // 12}"
+
+def month_slug(key):
+    return f"{key // 12:04d}-{key % 12 + 1:02d}"
+
+def month_end_day(months):
+    """Day number (days since 1970-01-01) of the last day of each month key."""
+    nxt = np.asarray(months, dtype=np.int64) - 1970 * 12 + 1
+    return nxt.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) - 1
+
+
+# ── Periods ───────────────────────────────────────────────────────────────────
+def period_options(period_type):
+    """Selectbox options for a period type and the index selected by default."""
+    if period_type == "Aylık":
+        opts = [f"{m} 2025" for m in MONTHS_TR] + ["Ocak 2026"]
+        return opts, len(opts) - 1
+    if period_type == "Çeyreklik":
+        opts = ["Q1 2025", "Q2 2025", "Q3 2025", "Q4 2025", "Q1 2026"]
+        return opts, len(opts) - 1
+    return ["2024", "2025", "2026"], 1
+
+def period_months(period_type, period):
+    """Month keys covered by a period label such as "Mart 2025", "Q2 2025" or "2025"."""
+    if period_type == "Aylık":
+        name, year = period.rsplit(" ", 1)
+        return [month_key(int(year), MONTHS_TR.index(name) + 1)]
+    if period_type == "Çeyreklik":
+        quarter, year = period.split(" ")
+        first = month_key(int(year), (int(quarter[1]) - 1) * 3 + 1)
+        return list(range(first, first + 3))
+    first = month_key(int(period), 1)
+    return list(range(first, first + 12))
@@ -0,0 +1,198 @@
+"""
+Bundles for drill-down filter states.
+
+A filter state maps dimensions of ``bitmap.DIMENSIONS`` to the values picked
+in them, e.g. ``{"department": ["Hukuk"], "gender": ["Kadın"]}``.  States
+with at most one company and one department are answered by the cube and
+its engines; every other state resolves its rows through the bitmap index
+and is aggregated row by row here.  Costs, salary percentiles and leave
+balances are recomputed over the selected rows so that the bundle has the
+same keys and definitions as the cube path: costs at each month's rate
+table, exact (lower-rank) salary percentiles, the carried-forward leave
+balances of ``LeaveEngine`` and the hire cohorts of ``cohorts``.  A cohort
+takes the filter state in its hire month.
+"""
+
+import numpy as np
+
+from .aggregate import TREND_MONTHS, _counts, bundle_rows, labelled, period_windows, safe_div
+from .bitmap import DIMENSIONS, BitmapIndex
+from .cohorts import COHORTS, HORIZON, cohort_bundle, exit_group, stay_months
+from .costs import COMPONENTS, RATE_TABLES, row_costs
+from .dims import COMPANIES, DEPARTMENTS, EXIT_TENURE_GROUPS, POSITIONS
+from .encoding import NO_DAY
+from .sketch import QUANTILES
+from .store import DATA_DIR, HRStore
+
+
+def filter_key(filters):
+    """Canonical, hashable form of a filter state (empty dimensions dropped)."""
+    return tuple(
+        (dim, tuple(v for v in labels if v in filters[dim]))
+        for dim, labels in DIMENSIONS.items() if filters.get(dim)
+    )
+
+
+def cube_filters(filters):
+    """(company, department) if the cube can answer ``filters``, else None."""
+    picked = dict(filter_key(filters))
+    if set(picked) - {"company", "department"}:
+        return None
+    company = picked.get("company", (COMPANIES[0],))
+    dept = picked.get("department", (DEPARTMENTS[0],))
+    if len(company) > 1 or len(dept) > 1:
+        return None
+    return company[0], dept[0]
+
+
+def exact_quantiles(values, qs=QUANTILES):
+    """Lower-rank quantiles ``sorted[floor(q * (n - 1))]``, the sketches' definition."""
+    if not len(values):
+        return np.zeros(len(qs))
+    values = np.sort(values)
+    return values[np.floor(np.array(qs) * (len(values) - 1)).astype(int)]
+
+
+class DrillEngine:
+    """Row-level bundles over a bitmap index of the snapshot store."""
+
+    def __init__(self, store, index, leave, tables=RATE_TABLES):
+        self.store = store
+        self.index = index
+        self.leave = leave
+        self.tables = tables
+
+    @classmethod
+    def open(cls, leave, root=DATA_DIR, tables=RATE_TABLES):
+        store = HRStore.open(root)
+        return cls(store, BitmapIndex.build(store), leave, tables)
+
+    def refresh(self, leave, root, partitions):
+        """This engine with changed (company, month) partitions reread (``HRStore.refresh``)."""
+        store = self.store.refresh(root, partitions)
+        return DrillEngine(store, BitmapIndex.build(store), leave, self.tables)
+
+    def bundle(self, filters, period_type, period):
+        """Bundle of a filter state with the ``kpi_windows`` of its scalar KPIs.
+
+        The previous-period and year-ago windows of ``period_windows`` are
+        aggregated over the same filters like the period itself; the cube
+        path reads them from its monthly vectors instead.
+        """
+        out = self._rows(filters, period_type, period)
+        months = self.store.months
+        windows = None
+        if len(months):
+            windows = period_windows(period_type, period, int(months[0]), int(months[-1] - months[0]) + 1)
+        if windows is None:
+            out["kpi_windows"] = {}
+            return out
+        idx, ok = windows
+        # A year back is the previous period of a yearly view
+        compared = {}
+        values = [out]
+        for w, covered in zip(idx[1:], ok[1:]):
+            key = tuple((w + int(months[0])).tolist())
+            if covered and key not in compared:
+                compared[key] = self._rows(filters, period_type, period, list(key))
+            values.append(compared[key] if covered else {})
+        keys = [k for k, v in out.items() if v is None or isinstance(v, (int, float))]
+        out["kpi_windows"] = {k: [None if v.get(k) is None else float(v[k]) for v in values] for k in keys}
+        return out
+
+    def _rows(self, filters, period_type, period, months=None):
+        def select(months):
+            return self.index.rows(filters, months)
+
+        return bundle_rows(self.store, period_type, period, select, months=months,
+                           extra=(self._headcount, self._cost, self._salary_bands, self._leave, self._cohorts))
+
+    # ── Sections over the selection (see aggregate._Selection) ──────────────
+    def _headcount(self, sel):
+        # Closing headcount, trend and turnover as HeadcountEngine defines them:
+        # employed on the last day of the month, opening = previous closing
+        store = self.store
+        rows = np.concatenate([sel.select(store.available([sel.window0 - 1])), sel.window])
+        month = store.snap("month")[rows]
+        term = store.emp("termination_date")[store.snap_emp[rows]]
+        stays = ~(term < store.month_end(month))                 # NO_DAY: still employed
+        closing = _counts(month[stays] - sel.window0 + 1, TREND_MONTHS + 1)
+        idx = np.array(sel.months, dtype=np.int64) - sel.window0
+        avg_headcount = float(np.mean((closing[idx] + closing[idx + 1]) / 2)) if len(idx) else 0.0
+        is_exit = month == store.emp("termination_month")[store.snap_emp[rows]]
+        terminations = int(np.isin(month[is_exit], sel.months).sum())
+        return {
+            "headcount": int(closing[-1]),
+            "headcount_trend": closing[1:].astype(int).tolist(),
+            "turnover_rate_monthly": float(safe_div(terminations * 100, avg_headcount * sel.n_months)),
+            "turnover_rate_yearly": float(safe_div(terminations * 100, avg_headcount)),
+        }
+
+    def _cost(self, sel):
+        store = self.store
+        costs = row_costs(store, sel.window, self.tables)
+        month = store.snap("month")[sel.window]
+        period = costs[np.isin(month, sel.months)]
+        totals = period.sum(axis=0)
+        per_row = period.sum(axis=1)
+        dept_cost = _counts(store.snap("department")[sel.rows], len(DEPARTMENTS), per_row)[1:]
+        pos_cost = _counts(store.snap("position")[sel.rows], len(POSITIONS), per_row)
+        trend = np.stack([_counts(month - sel.window0, TREND_MONTHS, costs[:, i])
+                          for i in range(len(COMPONENTS))], axis=1)
+        return {
+            "cost_labor_total": float(totals[0]),
+            "cost_overtime_total": float(totals[1]),
+            "cost_sgk_total": float(totals[2]),
+            "cost_by_dept": labelled(DEPARTMENTS[1:], dept_cost.round(), keep=dept_cost > 0),
+            "cost_by_position": labelled(POSITIONS, pos_cost.round(), keep=pos_cost > 0),
+            "cost_trend": {name: trend[:, i].round().tolist() for i, name in enumerate(COMPONENTS)},
+        }
+
+    def _salary_bands(self, sel):
+        salary = self.store.money("salary", sel.rows)
+        dept = self.store.snap("department")[sel.rows]
+        p10, p50, p90 = exact_quantiles(salary)
+        bands = {}
+        for d in np.unique(dept):
+            bands[DEPARTMENTS[d]] = exact_quantiles(salary[dept == d]).tolist()
+        return {
+            "salary_p10": float(p10),
+            "salary_median": float(p50),
+            "salary_p90": float(p90),
+            "salary_band_by_dept": {name: bands[name] for name in DEPARTMENTS[1:] if name in bands},
+        }
+
+    def _leave(self, sel):
+        ids = self.store.snap("employee_id")[sel.stock]
+        balance = np.nan_to_num(self.leave.balances(sel.last, ids))
+        return {
+            "total_annual_leave_balance": float(balance.sum()),
+            "avg_annual_leave_balance": float(balance.mean()) if len(balance) else 0.0,
+        }
+
+    def _cohorts(self, sel):
+        store = self.store
+
+        def days(emp):
+            hire = store.emp("hire_date")[emp].astype(np.int64)
+            term = store.emp("termination_date")[emp].astype(np.int64)
+            return hire, np.where(term == NO_DAY, -1, term)
+
+        # Cohort members: the selected rows of their hire month
+        cohorts = np.arange(sel.last - COHORTS + 1, sel.last + 1)
+        rows = sel.select(store.available(cohorts.tolist()))
+        emp = store.snap_emp[rows]
+        emp = emp[store.snap("month")[rows] == store.emp("hire_month")[emp]]
+        hired = store.emp("hire_month")[emp].astype(np.int64) - cohorts[0]
+        stays = _counts(hired * (HORIZON + 2) + stay_months(*days(emp)), COHORTS * (HORIZON + 2))
+
+        # Exits in the period, as in aggregate._flows
+        month = store.snap("month")[sel.window]
+        emp = store.snap_emp[sel.window]
+        left = emp[(month == store.emp("termination_month")[emp]) & np.isin(month, sel.months)]
+        hire, term = days(left)
+        exits = _counts(exit_group(hire, term), len(EXIT_TENURE_GROUPS))
+        return cohort_bundle(stays.reshape(COHORTS, HORIZON + 2), cohorts, sel.last, exits, float((term - hire).sum()))
+
+    def stats(self):
+        return {"index": self.index.stats(), "store": self.store.memory_usage()}
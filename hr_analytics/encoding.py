@@ -0,0 +1,135 @@
+"""
+Compact column encodings for the in-memory store.
+
+Each column of the employee and snapshot tables is kept as one NumPy array
+in the smallest type that holds it exactly:
+
+    code        int8 code into its dims table (COMPANIES, DEPARTMENTS, ...)
+    month       int16 month key, decoded with MONTHS_TR by ``dims.month_label``
+    day         int32 day number since 1970-01-01, ``NO_DAY`` when missing
+    money       integer kuruş (int32, or int64 if a value would overflow it)
+    quantity    hours or days as int16 hundredths when that is exact, else float32
+    id          int32
+    flag        bool
+
+``naive_bytes`` prices the same table the way pandas does with the strings
+as Python object columns and every number at 64 bits, for the footprint
+reports in the dashboard and ``benchmarks/bench_memory.py``.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+NO_DAY = np.iinfo(np.int32).max          # compares after every real day
+KURUS = 100
+CENTI = 100
+
+EMPLOYEE_SCHEMA = {
+    "employee_id": "id",
+    "company": "code",
+    "department": "code",
+    "position": "code",
+    "collar": "code",
+    "gender": "code",
+    "birth_date": "day",
+    "hire_date": "day",
+    "termination_date": "day",
+    "termination_reason": "code",
+    "retired": "flag",
+}
+SNAPSHOT_SCHEMA = {
+    "employee_id": "id",
+    "month": "month",
+    "company": "code",
+    "department": "code",
+    "position": "code",
+    "salary": "money",
+    "overtime_weekday": "quantity",
+    "overtime_weekend": "quantity",
+    "overtime_holiday": "quantity",
+    "absence_annual": "quantity",
+    "absence_sick": "quantity",
+    "absence_excuse": "quantity",
+    "absence_unpaid": "quantity",
+    "absence_paternity": "quantity",
+    "absence_other": "quantity",
+    "leave_balance": "quantity",
+}
+
+
+def encode(series, kind):
+    """Compact array of a pandas column (categoricals must use the dims tables)."""
+    if kind == "code":
+        return series.cat.codes.to_numpy().astype(np.int8)
+    if kind == "month":
+        return series.to_numpy().astype(np.int16)
+    if kind == "day":
+        days = pd.to_datetime(series).to_numpy("datetime64[D]")
+        out = days.astype(np.int64)
+        out[np.isnat(days)] = NO_DAY
+        return out.astype(np.int32)
+    if kind == "money":
+        kurus = np.rint(series.to_numpy(np.float64) * KURUS).astype(np.int64)
+        fits = not len(kurus) or np.abs(kurus).max() <= np.iinfo(np.int32).max
+        return kurus.astype(np.int32) if fits else kurus
+    if kind == "quantity":
+        return series.to_numpy(np.float32)
+    if kind == "id":
+        return series.to_numpy().astype(np.int32)
+    if kind == "flag":
+        return series.to_numpy().astype(bool)
+    raise ValueError(f"unknown column kind {kind!r}")
+
+
+def encode_frame(df, schema):
+    """``{column: compact array}`` for the columns of ``schema`` present in ``df``."""
+    return {col: encode(df[col], kind) for col, kind in schema.items() if col in df}
+
+
+def to_money(kurus):
+    """Kuruş to lira as float64."""
+    return np.asarray(kurus, dtype=np.float64) / KURUS
+
+
+def narrow_quantity(values):
+    """int16 hundredths of a float32 quantity column if they round-trip, else ``values``.
+
+    Decided over the whole column, so that month partitions encoded apart
+    share one scale.
+    """
+    scaled = np.rint(values.astype(np.float64) * CENTI)
+    if len(values) and np.abs(scaled).max() > np.iinfo(np.int16).max:
+        return values
+    if not np.array_equal((scaled / CENTI).astype(np.float32), values):
+        return values
+    return scaled.astype(np.int16)
+
+
+def to_quantity(values):
+    """Quantity column (hundredths or float32) as float64."""
+    if values.dtype.kind == "i":
+        return values / CENTI
+    return values.astype(np.float64)
+
+
+def naive_bytes(columns, schema, categories):
+    """Size of ``columns`` as a pandas frame of object strings and 64-bit numbers.
+
+    Matches ``DataFrame.memory_usage(deep=True)``: every cell of an object
+    column is a pointer plus the full size of its string.
+    """
+    total = 0
+    for col, values in columns.items():
+        total += 8 * len(values)
+        if schema.get(col) == "code":
+            # Fresh copies: a str that has been UTF-8 encoded once reports a larger size
+            labels = [label.encode().decode() for label in categories[col]]
+            counts = np.bincount(values[values >= 0], minlength=len(labels))
+            total += int(sum(n * sys.getsizeof(label) for n, label in zip(counts, labels)))
+    return total
+
+
+def compact_bytes(columns):
+    return sum(values.nbytes for values in columns.values())
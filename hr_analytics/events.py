@@ -0,0 +1,175 @@
+"""
+Event-sourced headcount: hires and terminations as sorted event logs.
+
+Each log holds one key per (company × department segment, day) with the
+number of events on it and a running total, so the count of events up to a
+day in a segment is one binary search.  Headcount at a date is hires up to
+that day minus terminations before it, and any interval count is the
+difference of two lookups — no per-employee scan per month.
+
+Employment is taken to include both the hire date and the termination date
+(the last working day).
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import TREND_MONTHS, period_windows, safe_div, windowed
+from .dims import COMPANIES, DEPARTMENTS, month_end_day, period_months
+from .store import DATA_DIR, EMPLOYEE_CATEGORIES, _read, partition_months
+
+# Event keys are segment * _SPAN + (day - _DAY0); days from 1696 to 2413 fit
+_DAY0 = -100_000
+_SPAN = 1 << 18
+
+
+def read_events(root=DATA_DIR):
+    """Employee arrays the event engines are built from.
+
+    Company and department codes, hire and termination day numbers (-1
+    without a termination), then the first and last month with data.
+    """
+    root = Path(root)
+    emp = _read(root / "employees.parquet", EMPLOYEE_CATEGORIES,
+                columns=["company", "department", "hire_date", "termination_date"])
+
+    def days(col):
+        d = pd.to_datetime(emp[col]).to_numpy("datetime64[D]")
+        return np.where(np.isnat(d), -1, d.astype(np.int64))
+
+    months = partition_months(root)
+    return (emp["company"].cat.codes.to_numpy(), emp["department"].cat.codes.to_numpy(),
+            days("hire_date"), days("termination_date"), months[0], months[-1])
+
+
+class _EventLog:
+    """Event counts per (segment, day) with cumulative totals."""
+
+    def __init__(self, segment, day):
+        keys, counts = np.unique(segment * _SPAN + (day - _DAY0), return_counts=True)
+        self.keys = keys
+        self.total = np.concatenate([[0], np.cumsum(counts)])
+        self.n_events = int(self.total[-1])
+
+    def upto(self, segments, days):
+        """Events with day <= ``days[j]``, summed over ``segments``; one value per day."""
+        days = np.clip(np.asarray(days, dtype=np.int64) - _DAY0, -1, _SPAN - 1)
+        seg = np.asarray(segments, dtype=np.int64)[:, None] * _SPAN
+        hi = np.searchsorted(self.keys, seg + days[None, :], side="right")
+        lo = np.searchsorted(self.keys, seg, side="left")
+        return (self.total[hi] - self.total[lo]).sum(axis=0)
+
+
+class HeadcountEngine:
+    """Headcount at any date and hires / terminations in any interval.
+
+    ``first_month`` / ``last_month`` bound the months the source data covers;
+    outside them the monthly series read as zero, like the cube's trends.
+    """
+
+    def __init__(self, company, dept, hire_day, termination_day, first_month, last_month):
+        segment = np.asarray(company, dtype=np.int64) * len(DEPARTMENTS) + dept
+        left = termination_day >= 0
+        self.hires = _EventLog(segment, hire_day)
+        self.terminations = _EventLog(segment[left], termination_day[left])
+        self.first_month, self.last_month = first_month, last_month
+
+    @classmethod
+    def open(cls, root=DATA_DIR):
+        return cls(*read_events(root))
+
+    # ── Point and interval queries ───────────────────────────────────────────
+    @staticmethod
+    def segments(company=0, dept=0):
+        """Segment ids covered by a company / department code pair (0 = all)."""
+        companies = [company] if company else range(1, len(COMPANIES))
+        depts = [dept] if dept else range(1, len(DEPARTMENTS))
+        return np.array([c * len(DEPARTMENTS) + d for c in companies for d in depts])
+
+    def headcount_at(self, days, company=0, dept=0):
+        """Employees on the payroll on each day number in ``days``."""
+        segs = self.segments(company, dept)
+        days = np.asarray(days, dtype=np.int64)
+        return self.hires.upto(segs, days) - self.terminations.upto(segs, days - 1)
+
+    def hires_between(self, start, stop, company=0, dept=0):
+        """Hires with ``start <= day <= stop`` (arrays allowed)."""
+        return self._between(self.hires, start, stop, company, dept)
+
+    def terminations_between(self, start, stop, company=0, dept=0):
+        return self._between(self.terminations, start, stop, company, dept)
+
+    def _between(self, log, start, stop, company, dept):
+        segs = self.segments(company, dept)
+        start, stop = np.atleast_1d(start).astype(np.int64), np.atleast_1d(stop).astype(np.int64)
+        return log.upto(segs, stop) - log.upto(segs, start - 1)
+
+    def monthly(self, months, company=0, dept=0):
+        """Opening / closing headcount, hires and terminations for each month key."""
+        months = np.asarray(months, dtype=np.int64)
+        end = month_end_day(months)
+        start = month_end_day(months - 1) + 1
+        segs = self.segments(company, dept)
+        n = len(months)
+        # Hires up to the day before the month and up to its last day
+        hired = self.hires.upto(segs, np.concatenate([start - 1, end]))
+        # Terminations before each of those days, then up to them
+        left = self.terminations.upto(segs, np.concatenate([start - 2, end - 1, start - 1, end]))
+        headcount = hired - left[:2 * n]
+        return {
+            "opening": headcount[:n],
+            "closing": headcount[n:],
+            "hires": hired[n:] - hired[:n],
+            "terminations": left[3 * n:] - left[2 * n:3 * n],
+        }
+
+    # ── Dashboard ────────────────────────────────────────────────────────────
+    def bundle(self, company, period_type, period, dept):
+        """Closing headcount, trend series, hires / terminations and turnover rates for a filter state."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        requested = np.array(period_months(period_type, period))
+        covered = (requested >= self.first_month) & (requested <= self.last_month)
+        months = requested[covered]
+        last = int(months[-1]) if len(months) else int(requested[-1])
+        window = np.arange(last - TREND_MONTHS + 1, last + 1)
+        in_data = (window >= self.first_month) & (window <= self.last_month)
+
+        stats = self.monthly(np.concatenate([window, months]), c, d)
+        trend = {k: np.where(in_data, v[:TREND_MONTHS], 0) for k, v in stats.items()}
+        period = {k: v[TREND_MONTHS:] for k, v in stats.items()}
+
+        n_months = max(len(months), 1)
+        avg_headcount = float(np.mean((period["opening"] + period["closing"]) / 2)) if len(months) else 0.0
+        terminations = int(period["terminations"].sum())
+        return {
+            # On the payroll at the end of the period, the last point of the trend
+            "headcount": int(period["closing"][-1]) if len(months) else 0,
+            "headcount_trend": trend["closing"].tolist(),
+            "hires": int(period["hires"].sum()),
+            "terminations": terminations,
+            "turnover_rate_monthly": float(safe_div(terminations * 100, avg_headcount * n_months)),
+            "turnover_rate_yearly": float(safe_div(terminations * 100, avg_headcount)),
+            "hires_trend": trend["hires"].tolist(),
+            "terminations_trend": trend["terminations"].tolist(),
+        }
+
+    def kpi_windows(self, company, period_type, period, dept):
+        """Closing headcount, hires, terminations and turnover for the period, the previous period and a year ago."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        windows = period_windows(period_type, period, self.first_month, self.last_month - self.first_month + 1)
+        if windows is None:
+            return {}
+        idx, ok = windows
+        n_months = idx.shape[1]
+        stats = {k: v.reshape(idx.shape) for k, v in self.monthly((idx + self.first_month).ravel(), c, d).items()}
+        avg_headcount = ((stats["opening"] + stats["closing"]) / 2).mean(axis=1)
+        terminations = stats["terminations"].sum(axis=1)
+        return windowed({
+            "headcount": stats["closing"][:, -1],
+            "hires": stats["hires"].sum(axis=1),
+            "terminations": terminations,
+            "turnover_rate_monthly": safe_div(terminations * 100, avg_headcount * n_months),
+            "turnover_rate_yearly": safe_div(terminations * 100, avg_headcount),
+        }, ok)
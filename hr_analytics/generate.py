@@ -0,0 +1,160 @@
+"""
+Seeded synthetic HR dataset shaped like the dashboard's original mock values.
+
+    python -m hr_analytics.generate --employees 500000 --months 36 --out data
+
+Employees are drawn once; snapshot rows are then produced month by month and
+written straight to their month × company partitions, so memory stays at one
+month of rows regardless of the total size.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .dims import (
+    ABSENCE_COLUMNS, COLLARS, COMPANIES, DEPARTMENTS, GENDERS, OVERTIME_COLUMNS,
+    POSITIONS, TERMINATION_REASONS, month_key, month_label,
+)
+from .store import DATA_DIR, write_employees, write_snapshots
+
+LAST_MONTH = month_key(2026, 1)
+
+COMPANY_WEIGHTS = [0.45, 0.35, 0.20]
+# Department mix and the position most of each department holds (MOCK["headcount_by_dept"])
+DEPT_WEIGHTS = [68, 52, 38, 22, 44, 14, 10]
+DEPT_POSITION = [0, 1, 2, 3, 4, 6, 5]
+BLUE_COLLAR_SHARE = [0.05, 0.15, 0.02, 0.02, 0.80, 0.0, 0.0]
+# Base monthly gross pay per position in January 2026 (MOCK["salary_by_position"])
+POSITION_SALARY = [62_400, 38_200, 41_500, 39_800, 31_200, 98_500, 34_000]
+# Mean monthly overtime hours per position (MOCK["overtime_by_position"])
+POSITION_OVERTIME = [9.2, 11.4, 6.1, 4.3, 8.7, 5.2, 6.0]
+OVERTIME_SPLIT = [0.61, 0.28, 0.11]      # weekday / weekend / public holiday
+# Mean days per employee-month for each absence type (MOCK["absence_types"] / headcount)
+ABSENCE_RATES = [1.26, 0.26, 0.07, 0.03, 0.02, 0.02]
+TERMINATION_WEIGHTS = [0.55, 0.18, 0.09, 0.18]
+MIN_WAGE = 26_005
+RAISE_MONTHS = (0, 6)                    # January and July pay rises
+RAISE_RATE = 0.12
+MEAN_TENURE_YEARS = 4.0
+_EPOCH_MONTH = 1970 * 12
+
+
+def _month_start_day(m):
+    return int(np.datetime64(m - _EPOCH_MONTH, "M").astype("datetime64[D]").astype(np.int64))
+
+
+def employees(n, months, rng):
+    """Employee master table covering everyone active in the last ``months`` months."""
+    first_day = _month_start_day(LAST_MONTH - months + 1)
+    end_day = _month_start_day(LAST_MONTH + 1) - 1
+
+    company = rng.choice(len(COMPANY_WEIGHTS), n, p=COMPANY_WEIGHTS) + 1
+    dept_p = np.array(DEPT_WEIGHTS) / sum(DEPT_WEIGHTS)
+    dept = rng.choice(len(dept_p), n, p=dept_p)
+    position = np.where(rng.random(n) < 0.88, np.take(DEPT_POSITION, dept),
+                        rng.choice(len(POSITIONS), n))
+    collar = (rng.random(n) < np.take(BLUE_COLLAR_SHARE, dept)).astype(np.int8)
+    gender = (rng.random(n) < 0.43).astype(np.int8)
+
+    # Hires spread over the window plus a tail of long-tenured staff before it
+    tenure_at_start = rng.exponential(MEAN_TENURE_YEARS * 365.25, n)
+    hire = np.where(rng.random(n) < 0.6, first_day - tenure_at_start,
+                    rng.uniform(first_day, end_day, n)).astype(np.int64)
+    # Exits are memoryless, so staff already employed at the window start
+    # draw their remaining stay from that day
+    stay = rng.exponential(MEAN_TENURE_YEARS * 2 * 365.25, n).astype(np.int64)
+    term = np.maximum(hire, first_day) + stay
+    term = np.where(term <= end_day, term, -1)
+
+    age_at_hire = np.clip(rng.normal(30, 8, n), 18, 60)
+    birth = hire - (age_at_hire * 365.25).astype(np.int64)
+    age_now = (end_day - birth) / 365.25
+    retired = (age_now > 50) & (rng.random(n) < 0.35)
+    reason = np.where(term >= 0, rng.choice(len(TERMINATION_WEIGHTS), n, p=TERMINATION_WEIGHTS), -1)
+    reason = np.where((term >= 0) & (age_now > 58), 2, reason)
+
+    base = np.take(POSITION_SALARY, position) * rng.lognormal(0, 0.22, n)
+
+    def dates(days, valid=None):
+        out = pd.to_datetime(days, unit="D")
+        return out.where(valid) if valid is not None else out
+
+    return pd.DataFrame({
+        "employee_id": np.arange(1, n + 1, dtype=np.int32),
+        "company": pd.Categorical.from_codes(company, COMPANIES),
+        "department": pd.Categorical.from_codes(dept + 1, DEPARTMENTS),
+        "position": pd.Categorical.from_codes(position, POSITIONS),
+        "collar": pd.Categorical.from_codes(collar, COLLARS),
+        "gender": pd.Categorical.from_codes(gender, GENDERS),
+        "birth_date": dates(birth),
+        "hire_date": dates(hire),
+        "termination_date": dates(np.maximum(term, 0), term >= 0),
+        "termination_reason": pd.Categorical.from_codes(reason, TERMINATION_REASONS),
+        "retired": retired,
+    }), base
+
+
+def snapshots(emp, base, month, rng):
+    """Snapshot rows of every employee active during ``month``."""
+    start, end = _month_start_day(month), _month_start_day(month + 1) - 1
+    hire = emp["hire_date"].to_numpy("datetime64[D]").astype(np.int64)
+    term = emp["termination_date"].to_numpy("datetime64[D]")
+    term = np.where(np.isnat(term), np.iinfo(np.int64).max, term.astype(np.int64))
+    active = np.flatnonzero((hire <= end) & (term >= start))
+    n = len(active)
+
+    raises = sum(1 for m in range(month + 1, LAST_MONTH + 1) if m % 12 in RAISE_MONTHS)
+    tenure = (end - hire[active]) / 365.25
+    salary = base[active] * (1 + 0.025 * np.minimum(tenure, 20)) / (1 + RAISE_RATE) ** raises
+    salary = np.maximum(salary, MIN_WAGE / (1 + RAISE_RATE) ** raises).round(2)
+
+    position = emp["position"].cat.codes.to_numpy()[active]
+    ot = rng.poisson(np.take(POSITION_OVERTIME, position)[:, None] * OVERTIME_SPLIT)
+    absence = rng.poisson(ABSENCE_RATES, (n, len(ABSENCE_RATES)))
+    entitlement = np.select([tenure < 5, tenure < 15], [14, 20], 26)
+    balance = np.clip(entitlement * (1 + (month % 12) / 12) - rng.poisson(6, n), 0, None)
+
+    df = pd.DataFrame({
+        "employee_id": emp["employee_id"].to_numpy()[active],
+        "month": np.full(n, month, dtype=np.int32),
+        "company": emp["company"].to_numpy()[active],
+        "department": emp["department"].to_numpy()[active],
+        "position": emp["position"].to_numpy()[active],
+        "salary": salary,
+    })
+    for i, col in enumerate(OVERTIME_COLUMNS):
+        df[col] = ot[:, i].astype(np.float32)
+    for i, col in enumerate(ABSENCE_COLUMNS):
+        df[col] = absence[:, i].astype(np.float32)
+    df["leave_balance"] = balance.astype(np.float32)
+    return df
+
+
+def generate(n_employees, months=36, root=DATA_DIR, seed=7):
+    rng = np.random.default_rng(seed)
+    emp, base = employees(n_employees, months, rng)
+    write_employees(emp, root)
+    rows = 0
+    for month in range(LAST_MONTH - months + 1, LAST_MONTH + 1):
+        snap = snapshots(emp, base, month, rng)
+        write_snapshots(snap, root)
+        rows += len(snap)
+    return len(emp), rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate a synthetic HR dataset.")
+    ap.add_argument("--employees", type=int, default=2_000)
+    ap.add_argument("--months", type=int, default=36)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", type=Path, default=DATA_DIR)
+    args = ap.parse_args()
+    n_emp, n_rows = generate(args.employees, args.months, args.out, args.seed)
+    print(f"{n_emp:,} employees, {n_rows:,} employee-months up to {month_label(LAST_MONTH)} → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
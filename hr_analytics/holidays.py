@@ -0,0 +1,91 @@
+"""
+Turkish public-holiday calendar as a day-indexed lookup table.
+
+Each day maps to the hour from which it is a public holiday: 0 for a full
+holiday, 13 for the half-day eves (arife, 28 Ekim) and 24 for ordinary days.
+Classifying millions of worked hours is then one array gather.
+
+Religious holidays follow the lunar calendar and have to be listed per year;
+extend ``RELIGIOUS_HOLIDAYS`` from the Diyanet calendar as years are added.
+Fixed holidays need no listing; punch ingestion refuses days of years whose
+religious holidays are missing rather than class them as working days.
+"""
+
+import numpy as np
+
+HALF_DAY = 13
+NOT_HOLIDAY = 24
+
+# (month, day, from hour) — Law No. 2429
+FIXED_HOLIDAYS = [
+    (1, 1, 0),             # Yılbaşı
+    (4, 23, 0),            # Ulusal Egemenlik ve Çocuk Bayramı
+    (5, 1, 0),             # Emek ve Dayanışma Günü
+    (5, 19, 0),            # Atatürk'ü Anma, Gençlik ve Spor Bayramı
+    (7, 15, 0),            # Demokrasi ve Milli Birlik Günü
+    (8, 30, 0),            # Zafer Bayramı
+    (10, 28, HALF_DAY),    # Cumhuriyet Bayramı arifesi
+    (10, 29, 0),           # Cumhuriyet Bayramı
+]
+
+# First day of Ramazan Bayramı (3 days) and Kurban Bayramı (4 days); the
+# afternoon before each is a half-day holiday
+RELIGIOUS_HOLIDAYS = {
+    2023: [("2023-04-21", 3), ("2023-06-28", 4)],
+    2024: [("2024-04-10", 3), ("2024-06-16", 4)],
+    2025: [("2025-03-30", 3), ("2025-06-06", 4)],
+    2026: [("2026-03-20", 3), ("2026-05-27", 4)],
+}
+
+
+def _day(value):
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+def _year(days):
+    return np.asarray(days, dtype=np.int64).astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+class HolidayCalendar:
+    """``start_hour(days)`` for day numbers of any year.
+
+    The table covers [first_year, last_year] and grows to the years of the
+    days it is asked about.  Fixed holidays are marked in every year,
+    religious ones only in the years ``RELIGIOUS_HOLIDAYS`` lists (see
+    ``missing_years``).
+    """
+
+    def __init__(self, first_year=min(RELIGIOUS_HOLIDAYS), last_year=max(RELIGIOUS_HOLIDAYS)):
+        self.first_year, self.last_year = first_year, last_year
+        self.day0 = _day(f"{first_year}-01-01")
+        n_days = _day(f"{last_year + 1}-01-01") - self.day0
+        table = np.full(n_days, NOT_HOLIDAY, dtype=np.int8)
+
+        def mark(day, hour):
+            i = day - self.day0
+            if 0 <= i < n_days:
+                table[i] = min(table[i], hour)
+
+        for year in range(first_year, last_year + 1):
+            for month, day, hour in FIXED_HOLIDAYS:
+                mark(_day(f"{year}-{month:02d}-{day:02d}"), hour)
+            for first, length in RELIGIOUS_HOLIDAYS.get(year, []):
+                start = _day(first)
+                mark(start - 1, HALF_DAY)
+                for i in range(length):
+                    mark(start + i, 0)
+        self.table = table
+
+    def start_hour(self, days):
+        """Hour of day from which each day is a holiday (24 = not a holiday)."""
+        days = np.asarray(days, dtype=np.int64)
+        if days.size:
+            first, last = _year(days.min()), _year(days.max())
+            if first < self.first_year or last > self.last_year:
+                self.__init__(min(first, self.first_year), max(last, self.last_year))
+        return self.table[days - self.day0]
+
+    @staticmethod
+    def missing_years(days):
+        """Years of ``days`` without an entry in ``RELIGIOUS_HOLIDAYS``."""
+        years = np.unique(_year(np.asarray(days, dtype=np.int64)))
+        return [int(y) for y in years if int(y) not in RELIGIOUS_HOLIDAYS]
@@ -0,0 +1,239 @@
+"""
+Incremental annual-leave accrual and balance engine.
+
+Balances are carried forward month by month per employee:
+
+    balance[m] = balance[m - 1] + granted[m] - used[m]
+
+where ``granted`` is the statutory entitlement earned on each hire
+anniversary (İş Kanunu md. 53: 14 days up to 5 years of service, 20 days
+below 15 years, 26 days from 15 years; at least 20 days at age ≤ 18 or
+≥ 50) and ``used`` is the month's annual-leave days.  Employees seen for
+the first time start from the balance the source reports for that month,
+or zero when they were hired in it.
+
+Every processed month leaves behind the per-employee balances and its
+company × department aggregates under ``<data>/leave/``, stamped with a
+hash chained from the previous month.  Adding a month processes only that
+month; a changed month replays from there onward.  The employee master is
+only read for hire and birth dates, which never change for an existing
+employee, so it is not part of the stamp.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import age_group, labelled, period_windows, safe_div, tenure_group, windowed, years_between
+from .dims import (
+    ABSENCE_COLUMNS, AGE_GROUPS, COMPANIES, DEPARTMENTS, TENURE_GROUPS,
+    month_end_day, month_slug, period_months,
+)
+from .store import DATA_DIR, EMPLOYEE_CATEGORIES, _read, partition_fingerprint, partition_months, read_month
+
+RULES_VERSION = 1
+
+# (measure, width) of each company × department × month cell
+LAYOUT = [
+    ("headcount", 1),
+    ("balance", 1),
+    ("granted", 1),
+    ("used", 1),
+    ("absence_by_tenure", len(TENURE_GROUPS)),
+    ("tenure_group", len(TENURE_GROUPS)),
+    ("absence_by_age", len(AGE_GROUPS)),
+    ("age_group", len(AGE_GROUPS)),
+]
+SLICES = {}
+_offset = 0
+for _name, _width in LAYOUT:
+    SLICES[_name] = slice(_offset, _offset + _width)
+    _offset += _width
+N_MEASURES = _offset
+
+
+def _measure(values, name):
+    sl = SLICES[name]
+    return values[..., sl] if sl.stop - sl.start > 1 else values[..., sl.start]
+
+
+def entitlement(service_years, age):
+    """Annual leave days earned on completing ``service_years`` years of service."""
+    days = np.select([service_years <= 5, service_years < 15], [14, 20], 26)
+    return np.where((age <= 18) | (age >= 50), np.maximum(days, 20), days)
+
+
+def _employee_dates(root):
+    emp = _read(Path(root) / "employees.parquet", EMPLOYEE_CATEGORIES,
+                columns=["employee_id", "hire_date", "birth_date"]).sort_values("employee_id")
+    days = {col: pd.to_datetime(emp[col]).to_numpy("datetime64[D]") for col in ("hire_date", "birth_date")}
+    return emp["employee_id"].to_numpy(), days["hire_date"], days["birth_date"]
+
+
+def _lookup(keys, values, query, default):
+    """``values[keys == q]`` for each q of ``query`` (``keys`` sorted)."""
+    if keys is None or not len(keys):
+        return np.full(len(query), default, dtype=np.float64)
+    pos = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+    return np.where(keys[pos] == query, values[pos], default)
+
+
+def advance(month, df, employees, prev_ids, prev_balance):
+    """One month of accrual: (ids, closing balances, company × dept cells)."""
+    emp_ids, hire, birth = employees
+    ids = df["employee_id"].to_numpy()
+    where = np.searchsorted(emp_ids, ids)
+    hire, birth = hire[where], birth[where]
+    hire_month = hire.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+    end = month_end_day([month])[0]
+
+    # Opening balance: carried forward, else as reported, else zero for new hires
+    reported = df["leave_balance"].to_numpy(np.float64) if "leave_balance" in df else np.zeros(len(ids))
+    carried = _lookup(prev_ids, prev_balance, ids, np.nan)
+    opening = np.where(np.isnan(carried), np.where(hire_month == month, 0.0, reported), carried)
+
+    # Anniversaries falling in this month earn the tier entitlement
+    service = month // 12 - hire_month // 12
+    anniversary = (hire_month % 12 == month % 12) & (service >= 1)
+    age = years_between(birth.astype(np.int64), end)
+    granted = np.where(anniversary, entitlement(service, age), 0)
+    used = df["absence_annual"].to_numpy(np.float64)
+    balance = opening + granted - used
+
+    days = sum(df[col].to_numpy(np.float64) for col in ABSENCE_COLUMNS)
+    tgrp = tenure_group(years_between(hire.astype(np.int64), end))
+    agrp = age_group(age)
+    cells = _cells(df, {
+        "headcount": None, "balance": balance, "granted": granted, "used": used,
+        "absence_by_tenure": (days, tgrp), "tenure_group": (None, tgrp),
+        "absence_by_age": (days, agrp), "age_group": (None, agrp),
+    })
+    order = np.argsort(ids)
+    return ids[order], balance[order].astype(np.float32), cells
+
+
+def _cells(df, measures):
+    n_co, n_dept = len(COMPANIES), len(DEPARTMENTS)
+    n_cells = n_co * n_dept
+    cell = df["company"].cat.codes.to_numpy().astype(np.int64) * n_dept + df["department"].cat.codes.to_numpy()
+    out = np.zeros((n_cells, N_MEASURES))
+    for name, spec in measures.items():
+        sl = SLICES[name]
+        if isinstance(spec, tuple):
+            weights, group = spec
+            width = sl.stop - sl.start
+            hist = np.bincount(cell * width + group, weights, minlength=n_cells * width)
+            out[:, sl] = hist.reshape(n_cells, width)
+        else:
+            out[:, sl.start] = np.bincount(cell, spec, minlength=n_cells)
+    out = out.reshape(n_co, n_dept, N_MEASURES)
+    out[0] = out[1:].sum(axis=0)
+    out[:, 0] = out[:, 1:].sum(axis=1)
+    return out
+
+
+class LeaveEngine:
+    """``cells[company, dept, month, measure]`` of leave balances and absence."""
+
+    def __init__(self, cells, first_month, processed=(), root=DATA_DIR):
+        self.cells = cells
+        self.first_month = first_month
+        self.n_months = cells.shape[2]
+        self.processed = list(processed)
+        self.root = Path(root)
+
+    @classmethod
+    def open(cls, root=DATA_DIR):
+        """Load persisted months and process only new or changed ones."""
+        root = Path(root)
+        path = root / "leave"
+        path.mkdir(parents=True, exist_ok=True)
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+        except (OSError, ValueError):
+            meta = {}
+
+        months = partition_months(root)
+        first = months[0]
+        cells = np.zeros((len(COMPANIES), len(DEPARTMENTS), months[-1] - first + 1, N_MEASURES))
+        employees = None
+        state = None                          # (ids, balance) after the previous month, once needed
+        stamp, fresh, processed = f"v{RULES_VERSION}", {}, []
+        for i, m in enumerate(months):
+            slug = month_slug(m)
+            stamp = hashlib.sha1(f"{stamp}:{partition_fingerprint(m, root)}".encode()).hexdigest()
+            file = path / f"{slug}.npz"
+            if meta.get(slug) == stamp and file.exists():
+                with np.load(file) as saved:
+                    cells[:, :, m - first] = saved["cells"]
+            else:
+                if state is None and i > 0:
+                    with np.load(path / f"{month_slug(months[i - 1])}.npz") as saved:
+                        state = saved["ids"], saved["balance"]
+                if employees is None:
+                    employees = _employee_dates(root)
+                df = read_month(m, root, ["company", "department", "leave_balance", *ABSENCE_COLUMNS])
+                ids, balance, month_cells = advance(m, df, employees, *(state or (None, None)))
+                np.savez(file, ids=ids, balance=balance, cells=month_cells)
+                cells[:, :, m - first] = month_cells
+                state = ids, balance
+                processed.append(m)
+            fresh[slug] = stamp
+        for stale in set(meta) - set(fresh):
+            (path / f"{stale}.npz").unlink(missing_ok=True)
+        (path / "meta.json").write_text(json.dumps(fresh, indent=1))
+        return cls(cells, first, processed, root)
+
+    def bundle(self, company, period_type, period, dept):
+        """Leave KPIs and absence by tenure / age for a filter state."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        requested = np.array(period_months(period_type, period))
+        idx = requested - self.first_month
+        idx = idx[(idx >= 0) & (idx < self.n_months)]
+        n_months = max(len(idx), 1)
+        flow = self.cells[c, d, idx].sum(axis=0)
+        stock = self.cells[c, d, idx[-1]] if len(idx) else np.zeros(N_MEASURES)
+
+        headcount = _measure(stock, "headcount")
+        avg_headcount = _measure(flow, "headcount") / n_months
+        used = _measure(flow, "used")
+        return {
+            "total_annual_leave_balance": float(_measure(stock, "balance")),
+            "avg_annual_leave_balance": float(safe_div(_measure(stock, "balance"), headcount)),
+            "total_used_annual_leave": float(used),
+            "avg_used_annual_leave": float(safe_div(used, avg_headcount)),
+            "absence_by_tenure": labelled(TENURE_GROUPS, safe_div(_measure(flow, "absence_by_tenure"),
+                                                                  _measure(flow, "tenure_group") / n_months)),
+            "absence_by_age": labelled(AGE_GROUPS, safe_div(_measure(flow, "absence_by_age"),
+                                                            _measure(flow, "age_group") / n_months)),
+        }
+
+    def kpi_windows(self, company, period_type, period, dept):
+        """Leave KPIs for the period, the previous period and a year ago."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        windows = period_windows(period_type, period, self.first_month, self.n_months)
+        if windows is None:
+            return {}
+        idx, ok = windows
+        cells = self.cells[c, d]
+        flow, stock = cells[idx].sum(axis=1), cells[idx[:, -1]]
+        headcount = _measure(stock, "headcount")
+        avg_headcount = _measure(flow, "headcount") / idx.shape[1]
+        used = _measure(flow, "used")
+        return windowed({
+            "total_annual_leave_balance": _measure(stock, "balance"),
+            "avg_annual_leave_balance": safe_div(_measure(stock, "balance"), headcount),
+            "total_used_annual_leave": used,
+            "avg_used_annual_leave": safe_div(used, avg_headcount),
+        }, ok)
+
+    def balances(self, month, ids):
+        """Closing balance of each employee id in ``month`` (NaN if not active)."""
+        file = self.root / "leave" / f"{month_slug(month)}.npz"
+        if not file.exists():
+            return np.full(len(ids), np.nan)
+        with np.load(file) as saved:
+            return _lookup(saved["ids"], saved["balance"].astype(np.float64), ids, np.nan)
@@ -0,0 +1,186 @@
+"""
+Background prefetch of the filter states a user is likely to open next.
+
+After a rerun the app hands its state to ``Prefetcher.schedule``, which
+queues the bundles of its neighbours on a small thread pool, nearest first:
+
+- the previous and next period in the period selectbox,
+- the same period under the other period types (the quarter and year that
+  contain a month, ...), and the period those selectboxes open on,
+- the sibling departments, with every other filter unchanged.
+
+States already cached are skipped; the rest go through ``Engines.bundle``
+and land in the shared ``AggregateCache``.  The batch belongs to the session
+that scheduled it and is cancelled when that session reruns, so queued work
+never competes with the rerun it was meant to speed up.  Each worker sleeps
+after every state in proportion to the CPU time it used, which keeps
+prefetch within ``budget`` of one core in total.
+
+``record`` classifies every foreground request: served from a prefetched
+bundle (a hit), from a bundle cached some other way, or computed (a miss);
+``stats`` reports the hit rate over the requests that were not already
+cached otherwise, and how many prefetched bundles were ever used.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .dims import DEPARTMENTS, PERIOD_TYPES, period_months, period_options
+
+ENABLED = os.environ.get("HR_PREFETCH", "1") != "0"
+# Share of one CPU that prefetch may use, over all its workers
+BUDGET = float(os.environ.get("HR_PREFETCH_BUDGET", "0.25"))
+WORKERS = int(os.environ.get("HR_PREFETCH_WORKERS", "1"))
+# Neighbour states queued per rerun
+MAX_STATES = int(os.environ.get("HR_PREFETCH_STATES", "16"))
+
+
+def neighbours(filters, period_type, period, max_states=MAX_STATES):
+    """Likely next (filters, period_type, period) states, most likely first."""
+    out = []
+    opts, _ = period_options(period_type)
+    i = opts.index(period)
+    for j in (i - 1, i + 1):
+        if 0 <= j < len(opts):
+            out.append((filters, period_type, opts[j]))
+
+    months = set(period_months(period_type, period))
+    for other in PERIOD_TYPES:
+        if other == period_type:
+            continue
+        other_opts, default = period_options(other)
+        containing = [p for p in other_opts if months & set(period_months(other, p))]
+        # The period holding the current one's last month, then the selectbox default
+        for p in containing[-1:] + [other_opts[default]]:
+            out.append((filters, other, p))
+
+    depts = filters.get("department", [])
+    siblings = DEPARTMENTS[1:]
+    if len(depts) == 1:
+        # Departments next to the current one in the list first
+        d = siblings.index(depts[0])
+        siblings = sorted((s for s in siblings if s != depts[0]), key=lambda s: abs(siblings.index(s) - d))
+    elif depts:
+        siblings = []
+    for dept in siblings:
+        out.append(({**filters, "department": [dept]}, period_type, period))
+
+    seen, unique = set(), []
+    for state in out:
+        key = (repr(sorted((k, tuple(v)) for k, v in state[0].items() if v)), state[1], state[2])
+        if key not in seen:
+            seen.add(key)
+            unique.append(state)
+    return unique[:max_states]
+
+
+class Batch:
+    """Prefetch work queued for one rerun; ``cancel`` drops what hasn't started."""
+
+    def __init__(self):
+        self.cancelled = False
+        self.futures = []
+
+    def cancel(self):
+        self.cancelled = True
+        for future in self.futures:
+            future.cancel()
+
+
+class Prefetcher:
+    """Bounded, cancellable background prefetch into ``engines.cache``."""
+
+    def __init__(self, engines, workers=WORKERS, budget=BUDGET, max_states=MAX_STATES, remember=4096):
+        self.engines = engines
+        self.workers = workers
+        self.budget = budget
+        self.max_states = max_states
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="hr-prefetch")
+        self._lock = threading.Lock()
+        # Cache keys this prefetcher computed, not yet requested in the foreground
+        self._prefetched = OrderedDict()
+        self._remember = remember
+        self.scheduled = self.computed = self.skipped = self.cancelled = self.failed = 0
+        self.hits = self.cached = self.misses = 0
+        self.used = 0
+        self.cpu_s = 0.0
+
+    def schedule(self, filters, period_type, period):
+        """Queue the neighbours of a state; returns the ``Batch`` to cancel on the next rerun."""
+        batch = Batch()
+        states = neighbours(filters, period_type, period, self.max_states)
+        with self._lock:
+            self.scheduled += len(states)
+        batch.futures = [self._pool.submit(self._prefetch, batch, state) for state in states]
+        return batch
+
+    def _prefetch(self, batch, state):
+        if batch.cancelled:
+            with self._lock:
+                self.cancelled += 1
+            return
+        key = self.engines.cache_key(*state)
+        if key in self.engines.cache:
+            with self._lock:
+                self.skipped += 1
+            return
+        t = time.thread_time()
+        try:
+            self.engines.bundle(*state)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            return
+        cpu = time.thread_time() - t
+        with self._lock:
+            self.computed += 1
+            self.cpu_s += cpu
+            self._prefetched[key] = None
+            while len(self._prefetched) > self._remember:
+                self._prefetched.popitem(last=False)
+        # Duty cycle: ``workers`` threads each busy ``budget / workers`` of the time
+        if self.budget < self.workers:
+            time.sleep(cpu * (self.workers / self.budget - 1))
+
+    def record(self, filters, period_type, period):
+        """Classify a foreground request before it is served; call ahead of ``Engines.bundle``."""
+        key = self.engines.cache_key(filters, period_type, period)
+        cached = key in self.engines.cache
+        with self._lock:
+            if key in self._prefetched:
+                del self._prefetched[key]
+                if cached:
+                    self.hits += 1
+                    self.used += 1
+                    return
+            if cached:
+                self.cached += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            uncached = self.hits + self.misses
+            return {
+                "workers": self.workers,
+                "cpu_budget": self.budget,
+                "scheduled": self.scheduled,
+                "computed": self.computed,
+                "skipped_cached": self.skipped,
+                "cancelled": self.cancelled,
+                "failed": self.failed,
+                "cpu_s": self.cpu_s,
+                "hits": self.hits,
+                "cached_otherwise": self.cached,
+                "misses": self.misses,
+                # Of the requests the cache couldn't already answer, share prefetch answered
+                "hit_rate": self.hits / uncached if uncached else 0.0,
+                # Share of prefetched bundles a foreground request used
+                "precision": self.used / self.computed if self.computed else 0.0,
+            }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
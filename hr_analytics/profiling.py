@@ -0,0 +1,102 @@
+"""
+Timing spans for one dashboard rerun: where the time goes.
+
+    HR_PROFILE=1 streamlit run app.py      # every session, or open the page with ?profile=1
+    HR_PROFILE_LOG=/var/log/hr/spans.jsonl # where spans are appended (default hr_profile.jsonl)
+
+The app activates a ``Profiler`` for the rerun and wraps data fetches,
+sections, KPI cards and chart helpers in ``span``; ``FigureCache`` adds the
+figure build / serialization spans underneath.  Spans nest, so every span
+records its parent and the summary splits time into self time per kind.
+Each finished rerun appends one JSON line per span, tagged with the rerun
+id, the wall-clock time and the filter state.
+
+Without an active profiler ``span`` returns one shared no-op context
+manager, so instrumented code pays a context-variable lookup per call.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+LOG_PATH = os.environ.get("HR_PROFILE_LOG", "hr_profile.jsonl")
+
+_current = ContextVar("hr_profiler", default=None)
+_NULL = nullcontext()
+_write_lock = threading.Lock()
+
+
+def enabled(query_params=None):
+    """HR_PROFILE in the environment or ``profile`` in the page's query parameters."""
+    if os.environ.get("HR_PROFILE", "") not in ("", "0"):
+        return True
+    return query_params is not None and query_params.get("profile", "") not in ("", "0")
+
+
+def activate(profiler):
+    """Make ``profiler`` (or None) the target of ``span`` in this context."""
+    _current.set(profiler)
+
+
+def span(kind, name="", **attrs):
+    profiler = _current.get()
+    return _NULL if profiler is None else profiler.span(kind, name, **attrs)
+
+
+class Profiler:
+    """Nested timing spans of one rerun, with the state they ran under."""
+
+    def __init__(self, state=None):
+        self.state = state or {}
+        self.run = uuid.uuid4().hex[:12]
+        self.spans = []
+        self._open = []
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def span(self, kind, name="", **attrs):
+        record = {"id": len(self.spans), "parent": self._open[-1]["id"] if self._open else None,
+                  "kind": kind, "name": name, **attrs}
+        self.spans.append(record)
+        self._open.append(record)
+        start = time.perf_counter()
+        record["start_ms"] = (start - self._t0) * 1e3
+        try:
+            yield record
+        finally:
+            record["ms"] = (time.perf_counter() - start) * 1e3
+            self._open.pop()
+
+    def total_ms(self):
+        return (time.perf_counter() - self._t0) * 1e3
+
+    def summary(self):
+        """{kind: {"calls", "ms", "self_ms"}} with children's time taken out of self_ms."""
+        child_ms = {}
+        for s in self.spans:
+            if s["parent"] is not None:
+                child_ms[s["parent"]] = child_ms.get(s["parent"], 0.0) + s.get("ms", 0.0)
+        out = {}
+        for s in self.spans:
+            row = out.setdefault(s["kind"], {"calls": 0, "ms": 0.0, "self_ms": 0.0})
+            row["calls"] += 1
+            row["ms"] += s.get("ms", 0.0)
+            row["self_ms"] += s.get("ms", 0.0) - child_ms.get(s["id"], 0.0)
+        return out
+
+    def lines(self):
+        ts = time.time()
+        head = {"run": self.run, "ts": ts, "state": self.state}
+        yield json.dumps({**head, "kind": "rerun", "ms": self.total_ms()}, ensure_ascii=False)
+        for s in self.spans:
+            yield json.dumps({**head, **s}, ensure_ascii=False)
+
+    def write(self, path=LOG_PATH):
+        """Append this rerun's spans to the JSONL file at ``path``."""
+        text = "".join(line + "\n" for line in self.lines())
+        with _write_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(text)
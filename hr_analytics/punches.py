@@ -0,0 +1,210 @@
+"""
+Streaming ingestion of time-and-attendance punch exports into overtime partials.
+
+Input CSVs hold one row per shift:
+
+    employee_id,clock_in,clock_out
+    1042,2025-03-03 08:55:00,2025-03-03 19:10:00
+
+Files are read block by block with pyarrow's streaming CSV reader into
+per-month buffers of shifts, one per employee and clock-in time: a row read
+again, from an export passed twice or from exports that overlap, replaces
+the earlier one, so memory follows the distinct shifts of the months being
+built.  Before classification each employee's overlapping shifts are merged
+into one span and spans are split at midnight.
+
+Overtime per employee and Monday-to-Sunday week:
+
+    Resmi Tatil   hours worked inside a public holiday (see ``holidays``)
+    Hafta İçi     the other hours past ``WEEKLY_HOURS`` in the week, on a weekday
+    Hafta Sonu    the same on a Saturday or Sunday
+
+Holiday hours do not count toward the weekly limit, and the hours past it
+are the latest ones of the week.  Each hour is booked to the month of its
+day, so a month's weeks reach into the neighbouring months.
+
+Results are written as ``overtime/<YYYY-MM>.parquet``, one row per
+employee-month.  Ingesting a month rewrites that month's partial only, so
+all punch files of a month, including the days of its first and last week
+in the neighbouring months, must be passed together; ``--months`` restricts
+a run to some months of a larger export.
+
+    python -m hr_analytics.punches exports/2025-*.csv --months 2025-03
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+from .dims import OVERTIME_COLUMNS, month_key, month_slug
+from .holidays import HolidayCalendar
+from .store import DATA_DIR, write_overtime
+
+WEEKLY_HOURS = 45.0                      # overtime is work past 45 hours a week (İş Kanunu md. 41)
+MAX_SHIFT_HOURS = 24
+BLOCK_SIZE = 32 * 2**20                  # bytes of CSV per streamed block
+COMPACT_ROWS = 2_000_000                 # buffered shifts before dropping duplicates
+
+COLUMNS = ["employee_id", "clock_in", "clock_out"]
+_COLUMN_TYPES = {"employee_id": pa.int64(), "clock_in": pa.timestamp("s"), "clock_out": pa.timestamp("s")}
+_DAY = 86_400
+_DAY_BITS = 20                           # employee-day key = employee_id << 20 | day
+
+
+def _month_of_day(days):
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) + 1970 * 12
+
+
+class _MonthBuffer:
+    """Shifts touching one month's weeks, one per (employee, clock-in)."""
+
+    def __init__(self):
+        self.parts = []
+        self.rows = 0
+        self.compacted = 0
+
+    def add(self, emp, t_in, t_out, seq):
+        self.parts.append((emp, t_in, t_out, seq))
+        self.rows += len(emp)
+        if self.rows > max(COMPACT_ROWS, 2 * self.compacted):
+            self.compact()
+
+    def compact(self):
+        # Sorted by employee and clock-in; a repeated pair keeps the row read last
+        emp, t_in, t_out, seq = (np.concatenate(cols) for cols in zip(*self.parts))
+        order = np.lexsort((seq, t_in, emp))
+        emp, t_in, t_out, seq = emp[order], t_in[order], t_out[order], seq[order]
+        last = np.r_[(emp[1:] != emp[:-1]) | (t_in[1:] != t_in[:-1]), True]
+        self.parts = [(emp[last], t_in[last], t_out[last], seq[last])]
+        self.rows = self.compacted = int(last.sum())
+        return self.parts[0]
+
+    def overtime(self, month, calendar):
+        """Employee-month overtime hours by type."""
+        emp, t_in, t_out, _ = self.compact()
+        emp, day, start, end = _day_pieces(*_merge(emp, t_in, t_out))
+        keys, inverse = np.unique((emp << _DAY_BITS) | day, return_inverse=True)
+        hours = np.bincount(inverse, end - start)
+        holiday = np.bincount(inverse, np.clip(end - np.maximum(start, calendar.start_hour(day)), 0, None))
+        emp = keys >> _DAY_BITS
+        day = keys & ((1 << _DAY_BITS) - 1)
+        regular = hours - holiday
+        # Hours worked in the week up to the end of each day; day 0 (1970-01-01) was a Thursday
+        week = (day + 3) // 7
+        total = np.cumsum(regular)
+        monday = np.flatnonzero(np.r_[True, (emp[1:] != emp[:-1]) | (week[1:] != week[:-1])])
+        worked = total - np.repeat((total - regular)[monday], np.diff(np.r_[monday, len(day)]))
+        over = np.maximum(worked - WEEKLY_HOURS, 0.0) - np.maximum(worked - regular - WEEKLY_HOURS, 0.0)
+        weekend = (day + 3) % 7 >= 5
+        by_type = np.stack([np.where(weekend, 0.0, over), np.where(weekend, over, 0.0), holiday], axis=1)
+        inside = _month_of_day(day) == month
+        emp, by_type = emp[inside], by_type[inside]
+        ids, first = np.unique(emp, return_index=True)
+        sums = np.add.reduceat(by_type, first, axis=0) if len(ids) else by_type
+        df = pd.DataFrame({
+            "employee_id": ids.astype(np.int32),
+            "month": np.full(len(ids), month, dtype=np.int32),
+        })
+        for i, col in enumerate(OVERTIME_COLUMNS):
+            df[col] = sums[:, i].astype(np.float32)
+        return df
+
+
+def _merge(emp, t_in, t_out):
+    """Union of each employee's overlapping shifts, given sorted by employee and clock-in."""
+    # Clock times fit in 32 bits, so one key orders by employee, then time
+    lo = (emp << 32) | t_in
+    reach = np.maximum.accumulate((emp << 32) | t_out)
+    first = np.flatnonzero(np.r_[True, lo[1:] > reach[:-1]])
+    last = np.r_[first[1:], len(lo)] - 1
+    return emp[first], t_in[first], reach[last] & 0xFFFFFFFF
+
+
+def _day_pieces(emp, t_in, t_out):
+    """Split spans at midnight: (employee, day, start hour, end hour) per piece."""
+    first = t_in // _DAY
+    n = (t_out - 1) // _DAY - first + 1
+    span = np.repeat(np.arange(len(emp)), n)
+    day = first[span] + np.arange(len(span)) - np.repeat(np.cumsum(n) - n, n)
+    start = np.maximum(t_in[span] - day * _DAY, 0)
+    end = np.minimum(t_out[span] - day * _DAY, _DAY)
+    return emp[span], day, start / 3600, end / 3600
+
+
+def _read_blocks(path, block_size):
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(include_columns=COLUMNS, column_types=_COLUMN_TYPES),
+    )
+    for batch in reader:
+        emp = pc.fill_null(batch.column("employee_id"), -1).to_numpy()
+        t_in, t_out = (pc.fill_null(pc.cast(batch.column(c), pa.int64()), -1).to_numpy()
+                       for c in ("clock_in", "clock_out"))
+        ok = (emp >= 0) & (t_in >= 0) & (t_out > t_in) & (t_out - t_in <= MAX_SHIFT_HOURS * 3600)
+        yield emp[ok], t_in[ok], t_out[ok]
+
+
+def ingest(paths, root=DATA_DIR, months=None, block_size=BLOCK_SIZE, calendar=None):
+    """Ingest punch CSVs and write the overtime partial of every month they cover.
+
+    With ``months`` (month keys) punches outside those months are skipped and
+    only their partials are rewritten.  Raises ValueError, before writing
+    anything, for punches in a year without ``RELIGIOUS_HOLIDAYS``.  Returns
+    {month key: employees}.
+    """
+    calendar = calendar or HolidayCalendar()
+    wanted = None if months is None else set(months)
+    buffers, covered = {}, set()
+    seen = 0
+    for path in paths:
+        for emp, t_in, t_out in _read_blocks(path, block_size):
+            seq = seen + np.arange(len(emp))
+            seen += len(emp)
+            first, last = t_in // _DAY, (t_out - 1) // _DAY
+            covered.update(np.unique(np.r_[_month_of_day(first), _month_of_day(last)]).tolist())
+            # Months whose first or last week the shift falls in, its own included
+            lo = _month_of_day(first - (first + 3) % 7)
+            hi = _month_of_day(last + 6 - (last + 3) % 7)
+            for m in np.unique(np.r_[lo, hi]).tolist():
+                if wanted is not None and m not in wanted:
+                    continue
+                sel = (lo <= m) & (hi >= m)
+                missing = calendar.missing_years(np.r_[first[sel], last[sel]])
+                if missing:
+                    raise ValueError(f"{path}: no religious holidays listed for {', '.join(map(str, missing))}; "
+                                     "add them to holidays.RELIGIOUS_HOLIDAYS")
+                buffers.setdefault(m, _MonthBuffer()).add(emp[sel], t_in[sel], t_out[sel], seq[sel])
+
+    written = {}
+    for m, buf in sorted(buffers.items()):
+        if m not in covered:
+            continue
+        df = buf.overtime(m, calendar)
+        write_overtime(df, root)
+        written[m] = len(df)
+    return written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Ingest punch-clock CSV exports into overtime partials.")
+    ap.add_argument("paths", nargs="+", type=Path)
+    ap.add_argument("--months", nargs="*", metavar="YYYY-MM", help="only (re)build these months")
+    ap.add_argument("--out", type=Path, default=DATA_DIR)
+    ap.add_argument("--block-mb", type=int, default=BLOCK_SIZE // 2**20)
+    args = ap.parse_args()
+    months = None
+    if args.months:
+        months = [month_key(*map(int, m.split("-"))) for m in args.months]
+    written = ingest(args.paths, args.out, months, args.block_mb * 2**20)
+    for m, n in written.items():
+        print(f"{month_slug(m)}: {n:,} employees")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Batch HTML reports: one static dashboard per company × department × period.
+
+    python -m hr_analytics.report --out reports --period "Ocak 2026" --period "Q4 2025" --period 2025
+
+Each report lays out all six ``sections`` with the same KPI cards and chart
+builders as the app, as one self-contained HTML page (Plotly inline, or
+``--plotlyjs shared`` for a single plotly.min.js beside the reports).
+``--images`` also writes every chart as PNG next to its report, which needs
+the optional ``kaleido`` package.
+
+Reports are rendered by a forked process pool.  The engines and the
+memory-mapped cube are opened once in the parent and inherited by the
+workers.  Figures go through a ``FigureCache`` backed by
+``<out>/.figures``, so a chart whose data and style match one already
+rendered by any worker (the same department under "Tüm Şirketler" and its
+only company, empty segments, ...) is built and serialized once.
+
+Every finished report is appended to ``<out>/manifest.jsonl`` with the data
+version.  A rerun skips the reports listed for the current data, so an
+interrupted batch resumes where it stopped; ``--force`` renders everything.
+"""
+
+import argparse
+import html
+import importlib.util
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from .charts import BLUE, FigureCache
+from .cube import WORKERS
+from .dims import COMPANIES, DEPARTMENTS, PERIOD_TYPES, period_options
+from .sections import CSS as SECTION_CSS
+from .sections import SECTIONS, kpi_html
+from .service import Engines
+from .store import DATA_DIR, company_slug
+
+PAGE_CSS = """
+body { margin: 0; padding: 28px 32px 32px; background: #f0f2f5; font-family: 'Inter', sans-serif; }
+.row { display: flex; gap: 16px; }
+.col { flex: 1; min-width: 0; }
+.card {
+    background: white;
+    border-radius: 10px;
+    padding: 16px 18px 8px 18px;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.08);
+    border: 1px solid #e2e6ea;
+    margin-bottom: 16px;
+}
+.spacer { height: 16px; }
+.section-title { font-size: 17px; font-weight: 600; color: #111827; margin: 28px 0 12px; }
+.kpi-card { margin-bottom: 16px; }
+"""
+PLOTLY_CONFIG = {"displayModeBar": False, "responsive": True}
+
+
+def slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", company_slug(text)).strip("-")
+
+
+def report_path(out, period_type, period, company, dept):
+    return Path(out) / slug(period_type) / slug(period) / slug(company) / f"{slug(dept)}.html"
+
+
+def period_type_of(period):
+    """The period type whose options include the label ``period``."""
+    for period_type in PERIOD_TYPES:
+        if period in period_options(period_type)[0]:
+            return period_type
+    raise ValueError(f"unknown period {period!r}")
+
+
+# ── HTML layout ───────────────────────────────────────────────────────────────
+class _Row:
+    def __init__(self, n):
+        self.cols = [[] for _ in range(n)]
+
+class _Card:
+    def __init__(self):
+        self.parts = []
+
+
+class HtmlUI:
+    """``sections`` layout primitives, collected as HTML instead of drawn."""
+
+    def __init__(self, figures, images=None):
+        self.figures = figures
+        self.images = Path(images) if images else None
+        self.specs = []
+        self._stack = [[]]
+
+    @contextmanager
+    def _into(self, parts):
+        self._stack.append(parts)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+
+    def _emit(self, item):
+        self._stack[-1].append(item)
+
+    def columns(self, n):
+        row = _Row(n)
+        self._emit(row)
+        return [self._into(col) for col in row.cols]
+
+    @contextmanager
+    def card(self):
+        card = _Card()
+        self._emit(card)
+        with self._into(card.parts):
+            yield
+
+    def spacer(self):
+        self._emit('<div class="spacer"></div>')
+
+    def kpi(self, label, value, sub="", icon=""):
+        self._emit(kpi_html(label, value, sub, icon))
+
+    def _chart(self, entry, title):
+        spec, height = entry
+        n = len(self.specs)
+        self.specs.append(spec)
+        self._emit(f'<div class="chart-title">{html.escape(title)}</div>'
+                   f'<div id="chart-{n}" style="height:{height}px"></div>')
+        if self.images is not None:
+            self.images.mkdir(parents=True, exist_ok=True)
+            pio.write_image(pio.from_json(spec), self.images / f"{n:02d}-{slug(title)}.png")
+
+    def bar_chart(self, data, title, color=BLUE, horizontal=False, x_label="", y_label="", drill=None):
+        self._chart(self.figures.get("bar", title, data, color=color, horizontal=horizontal,
+                                     x_label=x_label, y_label=y_label), title)
+
+    def pie_chart(self, data, title, drill=None):
+        self._chart(self.figures.get("pie", title, data), title)
+
+    def trend_line(self, periods, series, title):
+        self._chart(self.figures.get("trend", title, periods, series), title)
+
+    def band_chart(self, bands, title, color=BLUE):
+        self._chart(self.figures.get("band", title, bands, color=color), title)
+
+    def section(self, title):
+        self._emit(f'<div class="section-title">{html.escape(title)}</div>')
+
+    def body(self):
+        return _render(self._stack[0])
+
+    def script(self):
+        # Specs are JSON; "</" must not close the script element early
+        specs = ",".join(self.specs).replace("</", "<\\/")
+        return (f"<script>[{specs}].forEach((f, i) => Plotly.newPlot('chart-' + i, f.data, f.layout, "
+                f"{json.dumps(PLOTLY_CONFIG)}));</script>")
+
+
+def _render(parts):
+    out = []
+    for part in parts:
+        if isinstance(part, _Row):
+            out.append('<div class="row">' + "".join(f'<div class="col">{_render(c)}</div>' for c in part.cols) + "</div>")
+        elif isinstance(part, _Card):
+            out.append(f'<div class="card">{_render(part.parts)}</div>')
+        else:
+            out.append(part)
+    return "".join(out)
+
+
+def render_report(data, period_type, period, company, dept, figures, plotlyjs, images=None):
+    """Self-contained HTML page of every section for one bundle."""
+    ui = HtmlUI(figures, images)
+    for title, section in SECTIONS.items():
+        ui.section(title)
+        section(ui, data, period_type)
+    sub = " · ".join((company, period_type, period, dept))
+    return f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>İK Analitiği — {html.escape(sub)}</title>
+<style>{PAGE_CSS}{SECTION_CSS}</style>
+{plotlyjs}
+</head>
+<body>
+<div class="page-title">İK Analitik Panosu</div>
+<div class="page-sub">{html.escape(sub)}</div>
+{ui.body()}
+{ui.script()}
+</body>
+</html>
+""", len(ui.specs)
+
+
+# ── Batch ─────────────────────────────────────────────────────────────────────
+# Set in the parent before the pool forks, or by _init_worker under spawn
+_STATE = None
+
+
+def _init_worker(root, out, plotlyjs, images):
+    global _STATE
+    if _STATE is None:
+        _STATE = _open_state(root, out, plotlyjs, images)
+
+
+def _open_state(root, out, plotlyjs, images):
+    engines = Engines(root)
+    if engines.cube is None:
+        raise SystemExit(f"no data under {root}")
+    for name in ("headcount", "cost", "leave", "sketches", "cohorts"):
+        getattr(engines, name)
+    return {"engines": engines, "figures": FigureCache(directory=Path(out) / ".figures"),
+            "out": Path(out), "plotlyjs": plotlyjs, "images": images}
+
+
+def _render_task(task):
+    period_type, period, company, dept = task
+    state = _STATE
+    t = time.perf_counter()
+    filters = {"company": [company] if company != COMPANIES[0] else [],
+               "department": [dept] if dept != DEPARTMENTS[0] else []}
+    data = state["engines"].bundle(filters, period_type, period)
+    path = report_path(state["out"], *task)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if state["plotlyjs"] == "inline":
+        script = f"<script>{get_plotlyjs()}</script>"
+    else:
+        script = f'<script src="{os.path.relpath(state["out"] / "plotly.min.js", path.parent)}"></script>'
+    images = path.with_suffix("") if state["images"] else None
+    page, n_charts = render_report(data, period_type, period, company, dept,
+                                   state["figures"], script, images)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(page, encoding="utf-8")
+    os.replace(tmp, path)
+    return list(task), str(path.relative_to(state["out"])), n_charts, time.perf_counter() - t
+
+
+def _read_manifest(path, version):
+    done = set()
+    try:
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return done
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:                      # torn last line after an interruption
+            continue
+        if entry.get("version") == version and (Path(path).parent / entry["path"]).exists():
+            done.add(tuple(entry["key"]))
+    return done
+
+
+def run(periods, root=DATA_DIR, out="reports", companies=COMPANIES, departments=DEPARTMENTS,
+        workers=WORKERS, plotlyjs="inline", images=False, force=False):
+    """Render every missing report; returns a summary dict."""
+    global _STATE
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    if plotlyjs == "shared" and not (out / "plotly.min.js").exists():
+        (out / "plotly.min.js").write_text(get_plotlyjs(), encoding="utf-8")
+    _STATE = _open_state(root, out, plotlyjs, images)
+    version = _STATE["engines"].version
+
+    manifest = out / "manifest.jsonl"
+    done = set() if force else _read_manifest(manifest, version)
+    tasks = [(period_type_of(p), p, c, d) for p in periods for c in companies for d in departments]
+    todo = [t for t in tasks if t not in done]
+    figures_before = len(list((out / ".figures").glob("*.json")))
+
+    t0 = time.perf_counter()
+    charts = 0
+    with manifest.open("a", encoding="utf-8") as log:
+        def record(result):
+            nonlocal charts
+            key, path, n_charts, seconds = result
+            charts += n_charts
+            log.write(json.dumps({"key": key, "path": path, "version": version,
+                                  "seconds": round(seconds, 3)}, ensure_ascii=False) + "\n")
+            log.flush()
+
+        if workers <= 1 or len(todo) <= 1:
+            for task in todo:
+                record(_render_task(task))
+        else:
+            # Forked workers inherit the open engines; the batch CLI starts no threads
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+            with ProcessPoolExecutor(workers, mp_context=ctx, initializer=_init_worker,
+                                     initargs=(root, out, plotlyjs, images)) as pool:
+                for future in as_completed([pool.submit(_render_task, t) for t in todo]):
+                    record(future.result())
+
+    return {
+        "reports": len(tasks),
+        "skipped": len(tasks) - len(todo),
+        "rendered": len(todo),
+        "charts": charts,
+        "figures_built": len(list((out / ".figures").glob("*.json"))) - figures_before,
+        "seconds": time.perf_counter() - t0,
+        "workers": workers,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Render static HTML dashboards per company × department × period.")
+    ap.add_argument("--data", type=Path, default=DATA_DIR)
+    ap.add_argument("--out", type=Path, default=Path("reports"))
+    ap.add_argument("--period", action="append", default=[],
+                    help='period label such as "Ocak 2026", "Q4 2025" or "2025" (repeatable; '
+                         "default: the dashboard's default period of every type)")
+    ap.add_argument("--all-periods", action="store_true", help="every period the dashboard offers")
+    ap.add_argument("--company", action="append", choices=COMPANIES, help="repeatable; default: all")
+    ap.add_argument("--department", action="append", choices=DEPARTMENTS, help="repeatable; default: all")
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--plotlyjs", choices=["inline", "shared"], default="inline")
+    ap.add_argument("--images", action="store_true", help="also write PNGs of every chart (needs kaleido)")
+    ap.add_argument("--force", action="store_true", help="re-render reports already in the manifest")
+    args = ap.parse_args()
+
+    if args.images and importlib.util.find_spec("kaleido") is None:
+        ap.error("--images needs the kaleido package (pip install kaleido)")
+    if args.all_periods:
+        periods = [p for t in PERIOD_TYPES for p in period_options(t)[0]]
+    elif args.period:
+        periods = args.period
+        for p in periods:
+            try:
+                period_type_of(p)
+            except ValueError as exc:
+                ap.error(str(exc))
+    else:
+        periods = [opts[default] for opts, default in map(period_options, PERIOD_TYPES)]
+
+    summary = run(periods, args.data, args.out, args.company or COMPANIES, args.department or DEPARTMENTS,
+                  args.workers, args.plotlyjs, args.images, args.force)
+    json.dump(summary, sys.stdout, indent=1)
+    print()
+
+
+if __name__ == "__main__":
+    main()
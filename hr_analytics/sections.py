@@ -0,0 +1,311 @@
+"""
+Dashboard sections, laid out on an abstract ``ui``.
+
+Each section draws the KPI cards and charts of one topic from a bundle.
+The ``ui`` object supplies the layout primitives:
+
+    ui.columns(n)                      n column blocks, each entered with ``with``
+    ui.card()                          bordered chart container, entered with ``with``
+    ui.spacer()                        gap between the KPI rows and the charts
+    ui.kpi(label, value, sub, icon)
+    ui.bar_chart(data, title, color, horizontal, drill)
+    ui.pie_chart(data, title, drill)
+    ui.trend_line(periods, series, title)
+    ui.band_chart(bands, title, color)
+
+``app.py`` implements it with Streamlit and ``report`` with static HTML,
+so both render the same definitions.  ``drill`` names the filter dimension
+a click on the chart selects; static renderers ignore it.
+"""
+
+from .charts import BLUE
+
+# KPI card, chart title and page header styles shared by the app and reports
+CSS = """
+/* ── KPI card ── */
+.kpi-card {
+    background: white;
+    border-radius: 10px;
+    padding: 18px 20px;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.08);
+    border: 1px solid #e2e6ea;
+    min-height: 110px;
+}
+.kpi-label {
+    font-size: 12.5px;
+    color: #374151;
+    font-weight: 500;
+    margin-bottom: 8px;
+    display: flex;
+    align-items: center;
+    gap: 6px;
+}
+.kpi-value {
+    font-size: 32px;
+    font-weight: 700;
+    color: #111827;
+    line-height: 1.1;
+    margin-bottom: 4px;
+}
+.kpi-sub {
+    font-size: 11.5px;
+    color: #6b7280;
+    margin-top: 4px;
+}
+.chart-title {
+    font-size: 14px;
+    font-weight: 600;
+    color: #111827;
+    margin-bottom: 12px;
+}
+
+/* ── Page header ── */
+.page-title {
+    font-size: 22px;
+    font-weight: 700;
+    color: #111827;
+    line-height: 1.2;
+}
+.page-sub {
+    font-size: 12.5px;
+    color: #6b7280;
+    margin-top: 2px;
+    margin-bottom: 0;
+}
+"""
+
+
+# ── Formatting ────────────────────────────────────────────────────────────────
+def fmt_num(v, d=0):
+    return f"{v:,.{d}f}".replace(",", ".")
+
+def fmt_currency(v):
+    return f"₺{v:,.0f}"
+
+def fmt_pct(v):
+    # Rates no cohort has reached yet are None
+    return "—" if v is None else f"%{fmt_num(v, 1)}"
+
+# Comparison windows of ``data["kpi_windows"]`` after the current period;
+# a year back is the previous period of a yearly view, so it is shown once
+COMPARISONS = {
+    "Aylık": ((1, "önceki aya göre"), (2, "geçen yıla göre")),
+    "Çeyreklik": ((1, "önceki çeyreğe göre"), (2, "geçen yıla göre")),
+    "Yıllık": ((2, "geçen yıla göre"),),
+}
+# Rates change in percentage points, everything else relative to the earlier value
+POINT_KPIS = {"turnover_rate_monthly", "turnover_rate_yearly", "retention_6m", "retention_12m"}
+
+def change(data, key, period_type):
+    """KPI sub line: change of ``data[key]`` versus the previous period and a year ago."""
+    windows = data.get("kpi_windows", {}).get(key)
+    if not windows or windows[0] is None:
+        return ""
+    now = windows[0]
+    parts = []
+    for i, label in COMPARISONS[period_type]:
+        then = windows[i]
+        if then is None or (then == 0 and key not in POINT_KPIS):
+            continue
+        diff = now - then if key in POINT_KPIS else (now - then) / abs(then) * 100
+        diff = round(diff, 1)
+        arrow = "▲" if diff > 0 else "▼" if diff < 0 else "="
+        text = f"{fmt_num(abs(diff), 1)} puan" if key in POINT_KPIS else f"%{fmt_num(abs(diff), 1)}"
+        parts.append(f"{arrow} {text} {label}")
+    return " · ".join(parts)
+
+def kpi_html(label, value, sub="", icon=""):
+    icon_html = f'<span style="font-size:15px">{icon}</span> ' if icon else ""
+    return f"""
+    <div class="kpi-card">
+        <div class="kpi-label">{icon_html}{label}</div>
+        <div class="kpi-value">{value}</div>
+        <div class="kpi-sub">{sub}</div>
+    </div>"""
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 1 — Demografi
+# ══════════════════════════════════════════════════════════════════════════════
+def section_demografi(ui, data, period_type):
+    c1, c2, c3, c4 = ui.columns(4)
+    with c1: ui.kpi("Toplam Çalışan", fmt_num(data["headcount"]), change(data, "headcount", period_type), icon="👥")
+    with c2: ui.kpi("Ortalama Yaş", fmt_num(data["avg_age"], 1), change(data, "avg_age", period_type), icon="🎂")
+    with c3: ui.kpi("Ortalama Kıdem", f"{fmt_num(data['avg_tenure'], 1)} yıl", change(data, "avg_tenure", period_type), icon="📅")
+    with c4: ui.kpi("Emekli Çalışan", fmt_num(data["retired_count"]), change(data, "retired_count", period_type), icon="🏅")
+
+    ui.spacer()
+
+    col_a, col_b = ui.columns(2)
+    with col_a:
+        with ui.card(): ui.pie_chart(data["collar"], "Beyaz / Mavi Yaka Dağılımı", drill="collar")
+    with col_b:
+        with ui.card(): ui.pie_chart(data["gender"], "Cinsiyete Göre Çalışan Sayısı", drill="gender")
+
+    col_c, col_d = ui.columns(2)
+    with col_c:
+        with ui.card(): ui.bar_chart(data["age_groups"], "Yaş Skalasına Göre Çalışan Sayısı", color=BLUE, drill="age_group")
+    with col_d:
+        with ui.card(): ui.bar_chart(data["tenure_groups"], "Kıdem Yılı Skalasına Göre Çalışan Sayısı", color="#7c3aed", drill="tenure_group")
+
+    col_e, col_f = ui.columns(2)
+    with col_e:
+        with ui.card(): ui.bar_chart(data["headcount_by_dept"], "Departmanlara Göre Çalışan Sayısı", color="#059669", horizontal=True, drill="department")
+    with col_f:
+        with ui.card(): ui.bar_chart(data["headcount_by_position"], "Pozisyonlara Göre Çalışan Sayısı", color="#d97706", horizontal=True, drill="position")
+
+    if period_type == "Yıllık":
+        with ui.card():
+            ui.trend_line(
+                data["trend_periods"],
+                {"Çalışan Sayısı": data["headcount_trend"]},
+                "Aylara Göre Çalışan Sayısı — Son 12 Ay",
+            )
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 2 — Ücret
+# ══════════════════════════════════════════════════════════════════════════════
+def section_ucret(ui, data, period_type):
+    c1, c2, c3 = ui.columns(3)
+    with c1: ui.kpi("Ortalama Maaş", fmt_currency(data["salary_avg"]), change(data, "salary_avg", period_type), icon="💵")
+    with c2: ui.kpi("Minimum Maaş", fmt_currency(data["salary_min"]), change(data, "salary_min", period_type), icon="📉")
+    with c3: ui.kpi("Maksimum Maaş", fmt_currency(data["salary_max"]), change(data, "salary_max", period_type), icon="📈")
+
+    c4, c5, c6 = ui.columns(3)
+    with c4: ui.kpi("Ort. Saatlik Ücret", fmt_currency(data["salary_hourly_avg"]), change(data, "salary_hourly_avg", period_type), icon="⏱️")
+    with c5: ui.kpi("Min. Saatlik Ücret", fmt_currency(data["salary_hourly_min"]), change(data, "salary_hourly_min", period_type), icon="📉")
+    with c6: ui.kpi("Maks. Saatlik Ücret", fmt_currency(data["salary_hourly_max"]), change(data, "salary_hourly_max", period_type), icon="📈")
+
+    c7, c8, c9 = ui.columns(3)
+    with c7: ui.kpi("Medyan Maaş", fmt_currency(data["salary_median"]), change(data, "salary_median", period_type), icon="⚖️")
+    with c8: ui.kpi("Alt %10 Maaş (P10)", fmt_currency(data["salary_p10"]), change(data, "salary_p10", period_type), icon="🔻")
+    with c9: ui.kpi("Üst %10 Maaş (P90)", fmt_currency(data["salary_p90"]), change(data, "salary_p90", period_type), icon="🔺")
+
+    ui.spacer()
+
+    col_a, col_b = ui.columns(2)
+    with col_a:
+        with ui.card(): ui.bar_chart(data["salary_by_dept"], "Departmanlara Göre Ortalama Maaş (₺)", color=BLUE, horizontal=True, drill="department")
+    with col_b:
+        with ui.card(): ui.bar_chart(data["salary_by_position"], "Pozisyona Göre Ortalama Maaş (₺)", color="#059669", horizontal=True, drill="position")
+
+    with ui.card(): ui.bar_chart(data["salary_by_tenure"], "Kıdem Yılı Skalasına Göre Ortalama Maaş (₺)", color="#d97706", drill="tenure_group")
+
+    with ui.card(): ui.band_chart(data["salary_band_by_dept"], "Departmanlara Göre Maaş Bandı — P10 · Medyan · P90 (₺)")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 3 — Maliyet
+# ══════════════════════════════════════════════════════════════════════════════
+def section_maliyet(ui, data, period_type):
+    c1, c2, c3 = ui.columns(3)
+    with c1: ui.kpi("Toplam İşçilik Maliyeti", fmt_currency(data["cost_labor_total"]), change(data, "cost_labor_total", period_type), icon="🏭")
+    with c2: ui.kpi("Toplam SGK Maliyeti", fmt_currency(data["cost_sgk_total"]), change(data, "cost_sgk_total", period_type), icon="🏛️")
+    with c3: ui.kpi("Toplam Fazla Mesai Maliyeti", fmt_currency(data["cost_overtime_total"]), change(data, "cost_overtime_total", period_type), icon="⚡")
+
+    ui.spacer()
+
+    col_a, col_b = ui.columns(2)
+    with col_a:
+        with ui.card(): ui.bar_chart(data["cost_by_dept"], "Departmanlara Göre Toplam Maliyet (₺)", color=BLUE, horizontal=True, drill="department")
+    with col_b:
+        with ui.card(): ui.bar_chart(data["cost_by_position"], "Pozisyona Göre Toplam Maliyet (₺)", color="#059669", horizontal=True, drill="position")
+
+    with ui.card():
+        ui.trend_line(data["trend_periods"], data["cost_trend"], "Aylara Göre Maliyet Dağılımı — Son 12 Ay (₺)")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 4 — Fazla Mesai
+# ══════════════════════════════════════════════════════════════════════════════
+def section_fazla_mesai(ui, data, period_type):
+    c1, c2 = ui.columns(2)
+    with c1: ui.kpi("Toplam Fazla Mesai Gün", f"{fmt_num(data['overtime_total'])} saat", change(data, "overtime_total", period_type), icon="🕐")
+    with c2: ui.kpi("Ortalama Fazla Mesai", f"{fmt_num(data['overtime_avg'], 1)} saat", change(data, "overtime_avg", period_type), icon="📊")
+
+    ui.spacer()
+
+    col_a, col_b = ui.columns(2)
+    with col_a:
+        with ui.card(): ui.bar_chart(data["overtime_by_position"], "Pozisyonlara Göre Ortalama FM (saat)", color=BLUE, horizontal=True, drill="position")
+    with col_b:
+        with ui.card(): ui.pie_chart(data["overtime_by_type"], "Fazla Mesai Türü Dağılımı")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 5 — Devamsızlık
+# ══════════════════════════════════════════════════════════════════════════════
+def section_devamsizlik(ui, data, period_type):
+    c1, c2, c3 = ui.columns(3)
+    with c1: ui.kpi("Toplam Devamsızlık", f"{fmt_num(data['total_absent_days'])} gün", change(data, "total_absent_days", period_type), icon="📋")
+    with c2: ui.kpi("Ortalama Devamsızlık", f"{fmt_num(data['avg_absent_days'], 2)} gün", change(data, "avg_absent_days", period_type), icon="📉")
+    with c3: ui.kpi("Toplam Yıllık İzin Bakiyesi", f"{fmt_num(data['total_annual_leave_balance'])} gün", change(data, "total_annual_leave_balance", period_type), icon="🏖️")
+
+    c4, c5, c6 = ui.columns(3)
+    with c4: ui.kpi("Ort. Yıllık İzin Bakiyesi", f"{fmt_num(data['avg_annual_leave_balance'], 1)} gün", change(data, "avg_annual_leave_balance", period_type), icon="📅")
+    with c5: ui.kpi("Toplam Kullanılan Yıllık İzin", f"{fmt_num(data['total_used_annual_leave'])} gün", change(data, "total_used_annual_leave", period_type), icon="✅")
+    with c6: ui.kpi("Ort. Kullanılan Yıllık İzin", f"{fmt_num(data['avg_used_annual_leave'], 1)} gün", change(data, "avg_used_annual_leave", period_type), icon="📊")
+
+    ui.spacer()
+
+    col_a, col_b = ui.columns(2)
+    with col_a:
+        with ui.card(): ui.pie_chart(data["absence_types"], "Devamsızlık Türüne Göre Dağılım")
+    with col_b:
+        with ui.card(): ui.bar_chart(data["absence_by_tenure"], "Kıdem Skalasına Göre Devamsızlık (gün)", color="#d97706", drill="tenure_group")
+
+    with ui.card(): ui.bar_chart(data["absence_by_age"], "Yaş Skalasına Göre Devamsızlık (gün)", color="#7c3aed", drill="age_group")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAB 6 — İşe Alım & Çıkış
+# ══════════════════════════════════════════════════════════════════════════════
+def section_ise_alim(ui, data, period_type):
+    c1, c2, c3 = ui.columns(3)
+    with c1: ui.kpi("İş Başı Yapan Çalışan", fmt_num(data["hires"]), change(data, "hires", period_type), icon="🟢")
+    with c2: ui.kpi("İşten Çıkan Çalışan", fmt_num(data["terminations"]), change(data, "terminations", period_type), icon="🔴")
+    if period_type == "Yıllık":
+        with c3: ui.kpi("Turnover Oranı (Yıllık)", f"%{fmt_num(data['turnover_rate_yearly'], 1)}", change(data, "turnover_rate_yearly", period_type), icon="📆")
+    else:
+        with c3: ui.kpi("Turnover Oranı", f"%{fmt_num(data['turnover_rate_monthly'], 1)}", change(data, "turnover_rate_monthly", period_type), icon="🔄")
+
+    c4, c5, c6 = ui.columns(3)
+    with c4: ui.kpi("6. Ay Kalma Oranı", fmt_pct(data["retention_6m"]), change(data, "retention_6m", period_type), icon="🌱")
+    with c5: ui.kpi("12. Ay Kalma Oranı", fmt_pct(data["retention_12m"]), change(data, "retention_12m", period_type), icon="🌳")
+    with c6: ui.kpi("Ort. Çıkış Kıdemi", f"{fmt_num(data['avg_exit_tenure'], 1)} yıl", change(data, "avg_exit_tenure", period_type), icon="⏳")
+
+    ui.spacer()
+
+    col_a, col_b = ui.columns(2)
+    with col_a:
+        with ui.card(): ui.pie_chart(data["termination_reasons"], "İşten Çıkış Sebebi Dağılımı")
+    with col_b:
+        with ui.card(): ui.pie_chart(data["termination_by_collar"], "Yaka Rengine Göre İşten Çıkma Dağılımı", drill="collar")
+
+    col_c, col_d = ui.columns(2)
+    with col_c:
+        with ui.card(): ui.bar_chart(data["exit_tenure"], "Çıkış Anındaki Kıdeme Göre İşten Çıkma", color="#dc2626")
+    with col_d:
+        with ui.card(): ui.bar_chart(data["cohort_retention"], "İşe Giriş Ayına Göre Kalma Oranı (%)", color="#059669")
+
+    with ui.card():
+        ui.trend_line(data["survival_periods"], data["survival_curve"], "İşe Giriş Kohortlarının Kalma Eğrisi — İşe Girişten Sonraki Ay Sonları (%)")
+
+    if period_type == "Yıllık":
+        with ui.card():
+            ui.trend_line(
+                data["trend_periods"],
+                {"İşe Alım": data["hires_trend"], "İşten Çıkış": data["terminations_trend"]},
+                "Aylara Göre İşe Alım & Çıkma — Son 12 Ay",
+            )
+
+
+SECTIONS = {
+    "👥 Demografi": section_demografi,
+    "💰 Ücret": section_ucret,
+    "🏭 Maliyet": section_maliyet,
+    "🕐 Fazla Mesai": section_fazla_mesai,
+    "🏖️ Devamsızlık": section_devamsizlik,
+    "🔄 İşe Alım & Çıkış": section_ise_alim,
+}
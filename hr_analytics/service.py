@@ -0,0 +1,225 @@
+"""
+Filter state → bundle, shared by the dashboard and the headless API.
+
+``Engines`` holds the cube and the engines layered over it (headcount
+events, costs, leave balances, salary sketches, hire cohorts and the
+drill-down index), each opened on first use, plus the process-wide
+``AggregateCache``.
+``Engines.bundle`` is the single path from a filter state to the dict the
+tabs render: states the cube can answer merge the cube cell with every
+engine, all others are aggregated row by row through the bitmap index.
+``Engines.reload`` brings open engines up to date with changed source
+partitions (see ``watch``).
+"""
+
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .cache import AggregateCache
+from .cohorts import CohortEngine
+from .costs import CostEngine
+from .cube import Cube
+from .dims import COMPANIES, DEPARTMENTS
+from .drill import DrillEngine, cube_filters, filter_key
+from .events import HeadcountEngine
+from .leave import LeaveEngine
+from .sketch import SalarySketches
+from .store import DATA_DIR, has_data, partition_months, source_fingerprint
+
+# Per-cell arrays [company, dept, month, ...] of each engine, compared across a reload
+CELLS = {"cube": ("sums", "mins", "maxs"), "cost": ("cells",), "leave": ("cells",), "sketches": ("counts",)}
+
+
+class _Once:
+    """``load`` memoized; concurrent first calls wait for the one in flight."""
+
+    def __init__(self, load):
+        self._load = load
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.value = None
+
+    @classmethod
+    def of(cls, value):
+        once = cls(None)
+        once.loaded, once.value = True, value
+        return once
+
+    def __call__(self):
+        with self._lock:
+            if not self.loaded:
+                self.value = self._load()
+                self.loaded = True
+        return self.value
+
+
+def changed_cells(old, new, arrays):
+    """(company, month) pairs whose cells differ between two versions of an engine.
+
+    Both must start at the same month; months only ``new`` has are left out.
+    """
+    changed = set()
+    for name in arrays:
+        a, b = np.asarray(getattr(old, name)), np.asarray(getattr(new, name))
+        n = min(a.shape[2], b.shape[2])
+        differs = (a[:, :, :n] != b[:, :, :n]).reshape(len(COMPANIES), len(DEPARTMENTS), n, -1).any(axis=(1, 3))
+        changed.update((COMPANIES[c], old.first_month + int(i)) for c, i in zip(*np.nonzero(differs)) if c)
+    return changed
+
+
+class Engines:
+    """Aggregation engines over one data directory, opened lazily.
+
+    Every engine comes from a zero-argument loader, by default its ``open``
+    over ``root`` called once; the dashboard passes its ``st.cache_resource``
+    loaders instead.  ``cube`` is None when ``root`` holds no data.
+    ``generation`` counts reloads.
+    """
+
+    NAMES = ("cube", "headcount", "cost", "leave", "sketches", "cohorts", "drill")
+
+    def __init__(self, root=DATA_DIR, cache=None, **loaders):
+        unknown = set(loaders) - set(self.NAMES)
+        if unknown:
+            raise TypeError(f"unknown engines: {', '.join(sorted(unknown))}")
+        root = Path(root)
+        defaults = {
+            "cube": lambda: Cube.open(root) if has_data(root) else None,
+            "headcount": lambda: HeadcountEngine.open(root),
+            "cost": lambda: CostEngine.open(root),
+            "leave": lambda: LeaveEngine.open(root),
+            "sketches": lambda: SalarySketches.open(root),
+            "cohorts": lambda: CohortEngine.open(root),
+            # Row-level store and bitmap index, for states the cube can't answer
+            "drill": lambda: DrillEngine.open(self.leave, root),
+        }
+        self.root = root
+        self.cache = cache if cache is not None else AggregateCache()
+        # Source files the engines describe; part of every API ETag
+        self.version = source_fingerprint(root) if has_data(root) else ""
+        self.generation = 0
+        self._loaders = {name: loaders.get(name) or _Once(defaults[name]) for name in self.NAMES}
+        self._reload_lock = threading.Lock()
+
+    def __getattr__(self, name):
+        loaders = self.__dict__.get("_loaders", {})
+        if name in loaders:
+            return loaders[name]()
+        raise AttributeError(name)
+
+    def compute(self, company, period_type, period, dept):
+        """Uncached bundle of one cube cell."""
+        # Headcount trend, hires / exits and turnover come from the event logs,
+        # labor cost from the rate-versioned cost engine and leave balances from
+        # the incremental accrual engine, salary percentiles from merged sketches,
+        # survival curves and tenure at exit from the cohort counts
+        engines = (self.cube, self.headcount, self.cost, self.leave, self.sketches, self.cohorts)
+        state = (company, period_type, period, dept)
+        bundle = {}
+        for engine in engines:
+            bundle.update(engine.bundle(*state))
+        # [current, previous period, a year ago] of every KPI card, later
+        # engines overriding the cube's values exactly as in the bundle
+        bundle["kpi_windows"] = {}
+        for engine in engines:
+            bundle["kpi_windows"].update(engine.kpi_windows(*state))
+        return bundle
+
+    @staticmethod
+    def cache_key(filters, period_type, period):
+        """``AggregateCache`` key of a filter state: a cube cell, or the drill-down filters."""
+        cell = cube_filters(filters)
+        if cell is not None:
+            company, dept = cell
+            return company, period_type, period, dept
+        drill = filter_key(filters)
+        companies = dict(drill).get("company", ())
+        company = companies[0] if len(companies) == 1 else COMPANIES[0]
+        return company, period_type, period, DEPARTMENTS[0], drill
+
+    def bundle(self, filters, period_type, period):
+        """Cached bundle for a filter state ({dimension: values}), None without data."""
+        if self.cube is None:
+            return None
+        key = self.cache_key(filters, period_type, period)
+        if len(key) == 4:
+            return self.cache.get(*key, lambda: self.compute(*key))
+        return self.cache.get(*key[:4], lambda: self.drill.bundle(filters, period_type, period), drill=key[4])
+
+    def cached(self, filters, period_type, period):
+        """Whether the bundle of a filter state is in the cache."""
+        return self.cache_key(filters, period_type, period) in self.cache
+
+    def reload(self, partitions):
+        """Bring the open engines up to date with changed source partitions.
+
+        ``partitions`` holds (company, month) pairs whose snapshot files
+        changed, (None, month) for a month's overtime partial and None for
+        the employee table.  The cube rebuilds those cells only
+        (``Cube.refresh``), the cost, leave and sketch engines their stale
+        months through their own per-month stamps, and the drill-down store
+        rereads those partitions; new months are appended.  The rebuilt engines replace
+        the old ones at once, then the cache drops the bundles of every
+        (company, month) whose cells came out different, plus the changed
+        partitions themselves.  The employee table, or months removed or
+        added before the first, reopen every engine and clear the cache.
+        Engines not opened yet are left to open from the new files.  Only
+        engines from the default loaders are reloaded.  Returns the
+        invalidated (company, month) pairs, or None after a full reload.
+        """
+        with self._reload_lock:
+            old = {name: loader.value for name, loader in self._loaders.items()
+                   if isinstance(loader, _Once) and loader.loaded}
+            months = partition_months(self.root) if has_data(self.root) else []
+            cube = old.get("cube")
+            touched = set()
+            for part in partitions:
+                if part is None:
+                    touched = None
+                    break
+                company, month = part
+                touched.update((c, month) for c in ([company] if company else COMPANIES[1:]))
+
+            new = {}
+            if touched is not None and cube is not None and months:
+                new["cube"] = cube.refresh(self.root, touched)
+            if touched is None or new.get("cube") is None:
+                self._reopen(old)
+                return None
+
+            last = cube.first_month + cube.n_months - 1
+            appended = {(c, m) for c in COMPANIES[1:] for m in range(last + 1, months[-1] + 1)}
+            # The event engines read the employee table, bounded by the months with data
+            for name, engine in (("headcount", HeadcountEngine), ("cohorts", CohortEngine)):
+                if name in old and appended:
+                    new[name] = engine.open(self.root)
+            for name, engine in (("cost", CostEngine), ("leave", LeaveEngine), ("sketches", SalarySketches)):
+                if name in old:
+                    new[name] = engine.open(self.root)
+            if "drill" in old:
+                new["drill"] = old["drill"].refresh(new.get("leave") or self.leave, self.root, touched)
+
+            changed = touched | appended
+            for name, arrays in CELLS.items():
+                if name in new:
+                    changed |= changed_cells(old[name], new[name], arrays)
+            self._swap(new)
+            for company, month in changed:
+                self.cache.invalidate_partition(company, month)
+            return changed
+
+    def _reopen(self, old):
+        """Reopen every engine that was open, then swap them in and clear the cache."""
+        fresh = Engines(self.root)
+        # Without data only the (None) cube is reopened; bundles never reach the others
+        names = [name for name in self.NAMES if name in old and (name == "cube" or fresh.cube is not None)]
+        self._swap({name: getattr(fresh, name) for name in names})
+        self.cache.clear()
+
+    def _swap(self, engines):
+        for name, engine in engines.items():
+            self._loaders[name] = _Once.of(engine)
+        self.version = source_fingerprint(self.root) if has_data(self.root) else ""
+        self.generation += 1
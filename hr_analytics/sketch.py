@@ -0,0 +1,137 @@
+"""
+Mergeable salary quantile sketches per company × department × month cell.
+
+The sketch is a histogram over logarithmic buckets (DDSketch): a value x
+falls in bucket ceil(log_γ x) with γ = (1 + α) / (1 - α), and every bucket
+is reported by a representative within relative error α of any value in it.
+Because all sketches share the same buckets, merging is adding counts, so a
+yearly "Tüm Şirketler" quantile is a sum over twelve count vectors followed
+by one cumulative scan.
+
+Counts are cached per month under ``<data>/sketch/`` like the cost cells and
+are rebuilt when a month's partitions or the error bound change.
+"""
+
+import os
+
+import numpy as np
+
+from .aggregate import period_windows, windowed
+from .dims import COMPANIES, DEPARTMENTS, period_months
+from .store import DATA_DIR, monthly_arrays, partition_fingerprint, read_month
+
+DEFAULT_ALPHA = float(os.environ.get("HR_SKETCH_ALPHA", "0.005"))
+# Monthly salaries outside this range are clamped into the edge buckets
+MIN_VALUE = 1_000
+MAX_VALUE = 10_000_000
+
+QUANTILES = [0.1, 0.5, 0.9]
+
+
+class QuantileSketch:
+    """Bucket layout and queries for a relative error bound ``alpha``."""
+
+    def __init__(self, alpha=DEFAULT_ALPHA, lo=MIN_VALUE, hi=MAX_VALUE):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = np.log(self.gamma)
+        self.offset = int(np.ceil(np.log(lo) / self.log_gamma))
+        self.n_buckets = int(np.ceil(np.log(hi) / self.log_gamma)) - self.offset + 1
+
+    def bucket(self, values):
+        idx = np.ceil(np.log(np.maximum(values, 1e-9)) / self.log_gamma).astype(np.int64) - self.offset
+        return np.clip(idx, 0, self.n_buckets - 1)
+
+    def counts(self, values, cells, n_cells):
+        """Sketch of ``values`` per cell id: array (n_cells, n_buckets)."""
+        flat = np.bincount(cells * self.n_buckets + self.bucket(values), minlength=n_cells * self.n_buckets)
+        return flat.reshape(n_cells, self.n_buckets).astype(np.uint32)
+
+    def quantiles(self, counts, qs=QUANTILES):
+        """Quantiles of (merged) sketches; ``counts`` is (..., n_buckets).
+
+        Uses the lower rank ``floor(q * (n - 1))``; empty sketches give 0.
+        """
+        cum = np.cumsum(counts, axis=-1, dtype=np.int64)
+        total = cum[..., -1:]
+        out = []
+        for q in qs:
+            rank = np.floor(q * (total - 1))
+            idx = (cum > rank).argmax(axis=-1)
+            value = 2 * self.gamma ** (idx + self.offset) / (self.gamma + 1)
+            out.append(np.where(total[..., 0] > 0, value, 0.0))
+        return np.stack(out, axis=-1)
+
+
+def month_sketch(df, sketch):
+    """Salary sketches of one month's rows per company × department, with margins."""
+    n_co, n_dept = len(COMPANIES), len(DEPARTMENTS)
+    cells = df["company"].cat.codes.to_numpy().astype(np.int64) * n_dept + df["department"].cat.codes.to_numpy()
+    out = sketch.counts(df["salary"].to_numpy(np.float64), cells, n_co * n_dept).reshape(n_co, n_dept, -1)
+    out[0] = out[1:].sum(axis=0)
+    out[:, 0] = out[:, 1:].sum(axis=1)
+    return out
+
+
+class SalarySketches:
+    """``counts[company, dept, month, bucket]`` for every data month."""
+
+    def __init__(self, counts, first_month, sketch, recomputed=()):
+        self.counts = counts
+        self.first_month = first_month
+        self.n_months = counts.shape[2]
+        self.sketch = sketch
+        self.recomputed = list(recomputed)
+
+    @classmethod
+    def open(cls, root=DATA_DIR, alpha=DEFAULT_ALPHA):
+        sketch = QuantileSketch(alpha)
+
+        def stamp(m):
+            return {"alpha": alpha, "range": [MIN_VALUE, MAX_VALUE], "source": partition_fingerprint(m, root)}
+
+        def compute(m):
+            return month_sketch(read_month(m, root, ["company", "department", "salary"]), sketch)
+
+        months, arrays, recomputed = monthly_arrays("sketch", stamp, compute, root)
+        first = months[0]
+        counts = np.zeros((len(COMPANIES), len(DEPARTMENTS), months[-1] - first + 1, sketch.n_buckets),
+                          dtype=np.uint32)
+        for m, arr in zip(months, arrays):
+            counts[:, :, m - first] = arr
+        return cls(counts, first, sketch, recomputed)
+
+    def merged(self, company, period_type, period):
+        """Merged sketch per department (index 0 = all) for a company and period."""
+        c = COMPANIES.index(company)
+        months = np.array(period_months(period_type, period)) - self.first_month
+        i0, i1 = np.clip([months[0], months[-1] + 1], 0, self.n_months)
+        return self.counts[c, :, i0:i1].sum(axis=1, dtype=np.int64)
+
+    def bundle(self, company, period_type, period, dept):
+        """P10 / median / P90 salary, overall and per department."""
+        d = DEPARTMENTS.index(dept)
+        merged = self.merged(company, period_type, period)
+        bands = self.sketch.quantiles(merged)
+        p10, p50, p90 = bands[d]
+        has_rows = merged[1:].sum(axis=1) > 0
+        in_filter = (np.arange(1, len(DEPARTMENTS)) == d) | (d == 0)
+        return {
+            "salary_p10": float(p10),
+            "salary_median": float(p50),
+            "salary_p90": float(p90),
+            "salary_band_by_dept": {
+                name: [float(v) for v in band]
+                for name, band, keep in zip(DEPARTMENTS[1:], bands[1:], has_rows & in_filter) if keep
+            },
+        }
+
+    def kpi_windows(self, company, period_type, period, dept):
+        """Salary percentiles for the period, the previous period and a year ago."""
+        c, d = COMPANIES.index(company), DEPARTMENTS.index(dept)
+        windows = period_windows(period_type, period, self.first_month, self.n_months)
+        if windows is None:
+            return {}
+        idx, ok = windows
+        p10, p50, p90 = self.sketch.quantiles(self.counts[c, d][idx].sum(axis=1, dtype=np.int64)).T
+        return windowed({"salary_p10": p10, "salary_median": p50, "salary_p90": p90}, ok)
@@ -0,0 +1,412 @@
+"""
+Parquet-backed employee and monthly snapshot tables.
+
+Layout under the data directory:
+
+    employees.parquet                          one row per employee
+    snapshots/<YYYY-MM>/<company>.parquet      one row per active employee-month
+    overtime/<YYYY-MM>.parquet                 punch-clock overtime per employee-month
+
+Where a month has an overtime partial (see ``punches``) it replaces the
+overtime hours carried on that month's snapshot rows.
+
+Coded columns are loaded as pandas categoricals whose categories are the
+lists in ``dims``, so ``.cat.codes`` lines up with the dashboard constants;
+``HRStore`` keeps only those codes and other compact columns in memory,
+encoding the snapshots month by month as they are read.
+"""
+
+import ctypes
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .dims import (
+    COLLARS, COMPANIES, DEPARTMENTS, GENDERS, OVERTIME_COLUMNS, POSITIONS, TERMINATION_REASONS,
+    month_end_day, month_key, month_slug,
+)
+from .encoding import (
+    EMPLOYEE_SCHEMA, NO_DAY, SNAPSHOT_SCHEMA, compact_bytes, encode_frame, naive_bytes,
+    narrow_quantity, to_money, to_quantity,
+)
+
+DATA_DIR = Path(os.environ.get("HR_DATA_DIR", Path(__file__).resolve().parent.parent / "data"))
+
+EMPLOYEE_CATEGORIES = {
+    "company": COMPANIES,
+    "department": DEPARTMENTS,
+    "position": POSITIONS,
+    "collar": COLLARS,
+    "gender": GENDERS,
+    "termination_reason": TERMINATION_REASONS,
+}
+SNAPSHOT_CATEGORIES = {
+    "company": COMPANIES,
+    "department": DEPARTMENTS,
+    "position": POSITIONS,
+}
+
+# Arrow buffers here are transient read buffers.  The system allocator hands
+# them back to the OS; Arrow's default pool would keep them resident in every
+# worker on top of the compact columns.
+pa.set_memory_pool(pa.system_memory_pool())
+
+_SLUG = str.maketrans("çğıöşüÇĞİÖŞÜ ", "cgiosuCGIOSU-")
+
+
+def company_slug(name):
+    return name.translate(_SLUG).lower()
+
+
+# ── Writing ───────────────────────────────────────────────────────────────────
+def write_employees(df, root=DATA_DIR):
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), root / "employees.parquet")
+
+def write_snapshots(df, root=DATA_DIR):
+    """Write snapshot rows, one file per month × company partition."""
+    root = Path(root) / "snapshots"
+    for (month, company), part in df.groupby(["month", "company"], observed=True, sort=False):
+        path = root / month_slug(int(month)) / f"{company_slug(str(company))}.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(pa.Table.from_pandas(part, preserve_index=False), path)
+
+def write_overtime(df, root=DATA_DIR):
+    """Replace the overtime partial of each month in ``df``."""
+    root = Path(root) / "overtime"
+    root.mkdir(parents=True, exist_ok=True)
+    for month, part in df.groupby("month", sort=False):
+        path = root / f"{month_slug(int(month))}.parquet"
+        tmp = path.with_name(f".{path.name}.tmp")       # hidden from dataset reads
+        pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp)
+        os.replace(tmp, path)
+
+
+# ── Reading ───────────────────────────────────────────────────────────────────
+def _read(path, categories, columns=None):
+    coded = [c for c in categories if columns is None or c in columns]
+    table = pq.read_table(path, columns=columns, read_dictionary=coded)
+    df = table.to_pandas()
+    for col, cats in categories.items():
+        if col in df:
+            df[col] = df[col].astype("category").cat.set_categories(cats)
+    return df
+
+def has_data(root=DATA_DIR):
+    root = Path(root)
+    return (root / "employees.parquet").exists() and any((root / "snapshots").glob("*/*.parquet"))
+
+def source_files(root=DATA_DIR):
+    root = Path(root)
+    return [
+        root / "employees.parquet",
+        *sorted((root / "snapshots").glob("*/*.parquet")),
+        *sorted((root / "overtime").glob("*.parquet")),
+    ]
+
+def partition_months(root=DATA_DIR):
+    """Month keys that have a snapshot partition directory, in order."""
+    months = []
+    for path in (Path(root) / "snapshots").glob("*-*"):
+        year, month = path.name.split("-")
+        months.append(month_key(int(year), int(month)))
+    return sorted(months)
+
+def partition_files(month, root=DATA_DIR):
+    """Source files of one month: its snapshot partitions and overtime partial."""
+    root = Path(root)
+    files = sorted((root / "snapshots" / month_slug(month)).glob("*.parquet"))
+    overtime = root / "overtime" / f"{month_slug(month)}.parquet"
+    return files + [overtime] if overtime.exists() else files
+
+def _fingerprint(root, paths):
+    h = hashlib.sha1()
+    for path in paths:
+        st = path.stat()
+        h.update(f"{path.relative_to(root)}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()
+
+def source_fingerprint(root=DATA_DIR):
+    """Cheap change detector over the source files' names, sizes and mtimes."""
+    return _fingerprint(Path(root), source_files(root))
+
+def partition_fingerprint(month, root=DATA_DIR):
+    return _fingerprint(Path(root), partition_files(month, root))
+
+def company_file(month, company, root=DATA_DIR):
+    """Snapshot partition of one month × company."""
+    return Path(root) / "snapshots" / month_slug(month) / f"{company_slug(company)}.parquet"
+
+_COMPANY_BY_SLUG = {company_slug(c): c for c in COMPANIES[1:]}
+
+def file_partition(path, root=DATA_DIR):
+    """What a source file holds: (company, month), (None, month) or None.
+
+    A snapshot file is one company × month partition, an overtime partial
+    touches every company of its month (company None) and the employee
+    table (None) every partition.
+    """
+    parts = Path(path).relative_to(root).parts
+    if parts[0] == "snapshots":
+        year, month = parts[1].split("-")
+        return _COMPANY_BY_SLUG[Path(parts[2]).stem], month_key(int(year), int(month))
+    if parts[0] == "overtime":
+        year, month = Path(parts[1]).stem.split("-")
+        return None, month_key(int(year), int(month))
+    return None
+
+def content_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha1").hexdigest()
+
+def read_month(month, root=DATA_DIR, columns=None, company=None):
+    """Snapshot rows of one month (of one company) with its overtime partial applied."""
+    root = Path(root)
+    if columns is not None:
+        columns = list(dict.fromkeys(["employee_id", "month", *columns, *OVERTIME_COLUMNS]))
+    path = root / "snapshots" / month_slug(month) if company is None else company_file(month, company, root)
+    df = _read(path, SNAPSHOT_CATEGORIES, columns)
+    overtime = root / "overtime" / f"{month_slug(month)}.parquet"
+    if overtime.exists():
+        _apply_overtime(df, _read(overtime, {}))
+    return df
+
+
+def monthly_arrays(name, stamp, compute, root=DATA_DIR):
+    """Per-month derived arrays cached under ``<data>/<name>/<YYYY-MM>.npy``.
+
+    ``stamp(month)`` describes everything a month's array depends on;
+    ``compute(month)`` runs only for months whose stamp changed.  Returns
+    (months, arrays, recomputed months).
+    """
+    path = Path(root) / name
+    path.mkdir(parents=True, exist_ok=True)
+    try:
+        meta = json.loads((path / "meta.json").read_text())
+    except (OSError, ValueError):
+        meta = {}
+
+    months = partition_months(root)
+    arrays, fresh, recomputed = [], {}, []
+    for m in months:
+        slug = month_slug(m)
+        fresh[slug] = stamp(m)
+        file = path / f"{slug}.npy"
+        if meta.get(slug) == fresh[slug] and file.exists():
+            arrays.append(np.load(file))
+        else:
+            arrays.append(compute(m))
+            np.save(file, arrays[-1])
+            recomputed.append(m)
+    for stale in set(meta) - set(fresh):
+        (path / f"{stale}.npy").unlink(missing_ok=True)
+    (path / "meta.json").write_text(json.dumps(fresh, indent=1))
+    return months, arrays, recomputed
+
+
+class HRStore:
+    """In-memory columnar copy of the employee and snapshot tables.
+
+    Columns are stored compactly (see ``encoding``): codes as int8, months as
+    int16, dates as int32 day numbers and money as integer kuruş.  Snapshots
+    are sorted by (month, company, department) so that every filter
+    combination resolves to a handful of contiguous row ranges.
+    """
+
+    def __init__(self, employees, snapshots):
+        # Column dicts as returned by ``encoding.encode_frame``
+        order = np.argsort(employees["employee_id"], kind="stable")
+        self._emp = {col: values[order] for col, values in employees.items()}
+        snap_order = np.lexsort((snapshots["department"], snapshots["company"], snapshots["month"]))
+        self._snap = {col: values[snap_order] for col, values in snapshots.items()}
+        for col, kind in SNAPSHOT_SCHEMA.items():
+            if kind == "quantity" and col in self._snap:
+                self._snap[col] = narrow_quantity(self._snap[col])
+        self._derived = {}
+        self.n_rows = len(self._snap["month"])
+        self.n_employees = len(self._emp["employee_id"])
+
+        month = self.snap("month")
+        self.months = np.unique(month)
+        self._month_set = set(self.months.tolist())
+        self._m0 = int(self.months[0]) if len(self.months) else 0
+        self._month_end = month_end_day(np.arange(self._m0, self.months[-1] + 1 if len(self.months) else 0))
+        self.segment_keys = self._segment_key(month, self.snap("company"), self.snap("department")).astype(np.int32)
+
+        # Position of each snapshot row's employee in the employee table
+        self.snap_emp = np.searchsorted(self.emp("employee_id"), self.snap("employee_id")).astype(np.int32)
+
+        # Hire / exit months for event counts; -1 when there is no such date
+        for col in ("hire", "termination"):
+            days = self._emp[f"{col}_date"]
+            months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64) + 1970 * 12
+            self._derived[f"{col}_month"] = np.where(days == NO_DAY, -1, months).astype(np.int32)
+
+    @classmethod
+    def open(cls, root=DATA_DIR, company=None, months=None):
+        """Load ``root`` one month partition at a time, encoding as it goes.
+
+        Only one month is ever held as a pandas frame, so the peak stays
+        close to the compact size.  ``company`` and ``months`` restrict the
+        snapshot partitions read (at least one must exist); the employee
+        table is always complete.
+        """
+        root = Path(root)
+        months = partition_months(root) if months is None else months
+        if company is not None:
+            months = [m for m in months if company_file(m, company, root).exists()]
+        path = root / "employees.parquet"
+        employees = _employee_columns(path, path.stat().st_mtime_ns)
+        parts = [encode_frame(read_month(m, root, company=company), SNAPSHOT_SCHEMA) for m in months]
+        snapshots = {col: np.concatenate([p[col] for p in parts]) for col in parts[0]}
+        del parts
+        store = cls(employees, snapshots)
+        _release_freed()
+        return store
+
+    def refresh(self, root, partitions):
+        """Store with the rows of changed (company, month) partitions reread.
+
+        Only those partitions are read; every other row is kept, and the
+        employee table is taken to be unchanged.  Rows end up in the order
+        ``open`` would give them.
+        """
+        root = Path(root)
+        drop = np.zeros(self.n_rows, dtype=bool)
+        parts = []
+        for company, month in sorted(partitions):
+            if month in self._month_set:
+                for a, b in self.ranges([month], COMPANIES.index(company)):
+                    drop[a:b] = True
+            if company_file(month, company, root).exists():
+                parts.append(encode_frame(read_month(month, root, company=company), SNAPSHOT_SCHEMA))
+        keep = ~drop
+        snapshots = {}
+        for col, values in self._snap.items():
+            if SNAPSHOT_SCHEMA[col] == "quantity" and values.dtype.kind == "i":
+                # Back to float32 so that the reread rows share its scale
+                values = to_quantity(values).astype(np.float32)
+            snapshots[col] = np.concatenate([values[keep], *(p[col] for p in parts)])
+        del parts
+        store = HRStore(self._emp, snapshots)
+        _release_freed()
+        return store
+
+    # ── Column access ────────────────────────────────────────────────────────
+    def snap(self, name):
+        """Compact snapshot column (codes, month keys, kuruş, encoded quantities)."""
+        return self._snap[name]
+
+    def emp(self, name):
+        """Compact employee column; dates are int32 day numbers, ``NO_DAY`` if missing."""
+        return self._derived[name] if name in self._derived else self._emp[name]
+
+    def money(self, name, rows=None):
+        """Snapshot money column in lira (float64), optionally for ``rows`` only."""
+        kurus = self._snap[name]
+        return to_money(kurus if rows is None else kurus[rows])
+
+    def quantity(self, name, rows=None):
+        """Snapshot hours or days column as float64, optionally for ``rows`` only."""
+        values = self._snap[name]
+        return to_quantity(values if rows is None else values[rows])
+
+    def memory_usage(self):
+        """Bytes held by the columns, next to the same tables as naive object columns."""
+        snap_cats = {**EMPLOYEE_CATEGORIES, **SNAPSHOT_CATEGORIES}
+        compact = compact_bytes(self._emp) + compact_bytes(self._snap) + compact_bytes(self._derived)
+        compact += self.snap_emp.nbytes + self.segment_keys.nbytes
+        naive = (naive_bytes(self._emp, EMPLOYEE_SCHEMA, EMPLOYEE_CATEGORIES)
+                 + naive_bytes(self._snap, SNAPSHOT_SCHEMA, snap_cats))
+        return {
+            "rows": self.n_rows,
+            "employees": self.n_employees,
+            "bytes": compact,
+            "naive_object_bytes": naive,
+            "reduction": naive / compact if compact else 0.0,
+        }
+
+    # ── Row selection ────────────────────────────────────────────────────────
+    def _segment_key(self, month, company, dept):
+        n_co, n_dept = len(COMPANIES), len(DEPARTMENTS)
+        return ((np.asarray(month, dtype=np.int64) - self._m0) * n_co + company) * n_dept + dept
+
+    def ranges(self, months, company=0, dept=0):
+        """Contiguous (start, stop) snapshot row ranges for the given filter codes."""
+        companies = [company] if company else range(1, len(COMPANIES))
+        lo, hi = [], []
+        for m in months:
+            if not company and not dept:
+                lo.append(self._segment_key(m, 0, 0))
+                hi.append(self._segment_key(m + 1, 0, 0))
+                continue
+            for c in companies:
+                lo.append(self._segment_key(m, c, dept if dept else 0))
+                hi.append(self._segment_key(m, c, dept + 1) if dept else self._segment_key(m, c + 1, 0))
+        starts = np.searchsorted(self.segment_keys, lo)
+        stops = np.searchsorted(self.segment_keys, hi)
+        return [(a, b) for a, b in zip(starts, stops) if b > a]
+
+    def rows(self, months, company=0, dept=0):
+        """Snapshot row indices for the given months and filter codes (0 = all)."""
+        ranges = self.ranges(months, company, dept)
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        if len(ranges) == 1:
+            return np.arange(*ranges[0])
+        return np.concatenate([np.arange(a, b) for a, b in ranges])
+
+    def month_end(self, months):
+        """Last day number of each month key in ``months`` (keys held by the store)."""
+        return self._month_end[np.asarray(months) - self._m0]
+
+    def count(self, months, company=0, dept=0):
+        return sum(b - a for a, b in self.ranges(months, company, dept))
+
+    def available(self, months):
+        """The subset of ``months`` that has snapshot data, in order."""
+        return [m for m in months if m in self._month_set]
+
+
+@functools.lru_cache(maxsize=1)
+def _employee_columns(path, mtime_ns):
+    """Encoded employee table; cached so pool workers read it once per change."""
+    return encode_frame(_read(path, EMPLOYEE_CATEGORIES), EMPLOYEE_SCHEMA)
+
+
+def _release_freed():
+    """Return the allocator's free pages to the OS (glibc only, else a no-op)."""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def _apply_overtime(snapshots, overtime):
+    """Overwrite snapshot overtime hours for the months covered by ``overtime``.
+
+    ``snapshots`` must be sorted by month; employees without punches in a
+    covered month get zero overtime.
+    """
+    month = snapshots["month"].to_numpy()
+    ids = snapshots["employee_id"].to_numpy()
+    hours = {col: snapshots[col].to_numpy().copy() for col in OVERTIME_COLUMNS}
+    for m, part in overtime.groupby("month", sort=False):
+        a, b = np.searchsorted(month, [m, m + 1])
+        if a == b:
+            continue
+        part = part.sort_values("employee_id")
+        pid = part["employee_id"].to_numpy()
+        pos = np.minimum(np.searchsorted(pid, ids[a:b]), len(pid) - 1)
+        hit = pid[pos] == ids[a:b]
+        for col in OVERTIME_COLUMNS:
+            hours[col][a:b] = np.where(hit, part[col].to_numpy()[pos], 0)
+    for col, values in hours.items():
+        snapshots[col] = values
@@ -0,0 +1,175 @@
+"""
+Boot-time warm-up: the first visitor after a deploy gets a warm worker.
+
+    python -m hr_analytics.warmup [streamlit run options...]
+
+The dashboard's engines, aggregate cache and figure cache are the
+process-wide instances returned by ``shared_engines`` and
+``shared_figures``; the app's ``st.cache_resource`` loaders only hand them
+out.  Run as above, this module imports the aggregation stack, opens every
+engine the default view needs, computes the default bundle (latest month,
+all companies, all departments) and builds and serializes every section's
+figures for it, and only then starts ``streamlit run app.py`` in the same
+process.  The Streamlit health check therefore answers once the default
+page can be served from the caches.  The partition watcher
+(``shared_watcher``) is started first, so that no change to the data
+directory slips in between opening the engines and watching it.
+
+``HR_WARMUP=0`` starts the server without the warm-up.
+
+With ``HR_PAYLOAD=compact`` chart specs shrink to ~1 kB, below Streamlit's
+10 kB minimum for client-cached messages, so ``main`` lowers it for the
+server (``STREAMLIT_GLOBAL_MIN_CACHED_MESSAGE_SIZE``) and a chart unchanged
+since the previous rerun goes out as a hash reference.  Servers started
+with ``streamlit run`` directly need that variable set themselves.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+from .cache import AggregateCache
+from .charts import BLUE, FigureCache
+from .dims import PERIOD_TYPES, period_options
+from .sections import SECTIONS
+from .service import Engines
+from .watch import ENABLED as WATCH
+from .watch import PartitionWatcher
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+# Smallest ForwardMsg the browser caches by hash, for compact chart specs
+COMPACT_MIN_CACHED_MESSAGE_SIZE = 1024
+
+_lock = threading.Lock()
+_shared = {}
+
+
+def _once(name, make):
+    with _lock:
+        if name not in _shared:
+            _shared[name] = make()
+        return _shared[name]
+
+
+def shared_engines():
+    """This process's ``Engines`` over DATA_DIR, with the aggregate cache sized from the environment."""
+    def make():
+        ttl = os.environ.get("HR_AGG_CACHE_TTL")
+        cache = AggregateCache(max_bytes=int(os.environ.get("HR_AGG_CACHE_MB", "64")) * 2**20,
+                               ttl=float(ttl) if ttl else None)
+        return Engines(cache=cache)
+    return _once("engines", make)
+
+
+def shared_figures():
+    """This process's ``FigureCache``; compact specs with HR_PAYLOAD=compact."""
+    return _once("figures", lambda: FigureCache(max_entries=int(os.environ.get("HR_FIGURE_CACHE_SIZE", "512")),
+                                                compact=os.environ.get("HR_PAYLOAD") == "compact"))
+
+
+def shared_watcher():
+    """This process's ``PartitionWatcher`` over ``shared_engines()``, started on first use."""
+    engines = shared_engines()
+    return _once("watcher", lambda: PartitionWatcher(engines).start())
+
+
+def default_state():
+    """(filters, period_type, period) of a fresh session."""
+    period_type = PERIOD_TYPES[0]
+    opts, default = period_options(period_type)
+    return {}, period_type, opts[default]
+
+
+class _FigureUI:
+    """``sections`` layout primitives that only put each chart's figure in the cache.
+
+    The chart calls mirror the app's helpers argument for argument, so the
+    figure keys match the ones the first rerun looks up.
+    """
+
+    def __init__(self, figures):
+        self.figures = figures
+        self.charts = 0
+
+    def columns(self, n):
+        return [nullcontext()] * n
+
+    def card(self):
+        return nullcontext()
+
+    def spacer(self):
+        pass
+
+    def kpi(self, label, value, sub="", icon=""):
+        pass
+
+    def bar_chart(self, data, title, color=BLUE, horizontal=False, x_label="", y_label="", drill=None):
+        self.charts += 1
+        self.figures.get("bar", title, data, color=color, horizontal=horizontal, x_label=x_label, y_label=y_label)
+
+    def pie_chart(self, data, title, drill=None):
+        self.charts += 1
+        self.figures.get("pie", title, data)
+
+    def band_chart(self, bands, title, color=BLUE):
+        self.charts += 1
+        self.figures.get("band", title, bands, color=color)
+
+    def trend_line(self, periods, series, title):
+        self.charts += 1
+        self.figures.get("trend", title, periods, series)
+
+
+def warm(engines=None, figures=None, state=None):
+    """Open the engines, cache the default bundle and its figures; returns timings in seconds."""
+    engines = engines or shared_engines()
+    figures = figures or shared_figures()
+    filters, period_type, period = state or default_state()
+    timings = {}
+
+    t = time.perf_counter()
+    if engines.cube is None:
+        # No data yet: the app shows its mock bundle, nothing to warm
+        return {"data": False}
+    for name in ("headcount", "cost", "leave", "sketches", "cohorts"):
+        getattr(engines, name)
+    timings["engines_s"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    data = engines.bundle(filters, period_type, period)
+    timings["bundle_s"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    ui = _FigureUI(figures)
+    for render in SECTIONS.values():
+        render(ui, data, period_type)
+    timings["figures_s"] = time.perf_counter() - t
+    timings["charts"] = ui.charts
+    return timings
+
+
+def main():
+    from streamlit.web import cli
+
+    if shared_figures().compact:
+        # Read by streamlit run's option parsing: set once for the whole server
+        os.environ.setdefault("STREAMLIT_GLOBAL_MIN_CACHED_MESSAGE_SIZE", str(COMPACT_MIN_CACHED_MESSAGE_SIZE))
+    if WATCH:
+        shared_watcher()
+    if os.environ.get("HR_WARMUP", "1") != "0":
+        t = time.perf_counter()
+        timings = warm()
+        print(f"Warm-up done in {time.perf_counter() - t:.2f}s: {timings}", flush=True)
+    sys.argv = ["streamlit", "run", str(APP), *sys.argv[1:]]
+    sys.exit(cli.main())
+
+
+if __name__ == "__main__":
+    # ``python -m`` runs this file as ``__main__``, a second copy of the
+    # module with its own ``_shared``; app.py imports hr_analytics.warmup, so
+    # warm that one
+    from hr_analytics.warmup import main as _main
+    _main()
@@ -0,0 +1,141 @@
+"""
+Partition-aware reload: watch the data directory, refresh only what changed.
+
+    PartitionWatcher(engines).start()
+
+A daemon thread polls the source files (``store.source_files``) every
+``HR_WATCH_INTERVAL`` seconds.  A file whose size or mtime moved is hashed
+once it has stayed the same for one more poll, so a partition still being
+written is not read half-way; only a new content hash counts as a change,
+so a touched or identically rewritten file costs nothing.  Changed files
+map to their company × month partitions (``store.file_partition``) and go
+to ``Engines.reload`` in one batch: the cube rebuilds those cells, the
+monthly engines their months, and the aggregate cache drops only the
+bundles that read them.  Sessions pick up the new engines on their next
+rerun; every other cached bundle stays warm.
+
+Content hashes are taken when the watcher starts, so it should start once
+the engines are open (``warmup`` opens them first).  ``HR_WATCH=0`` turns
+the watcher off.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from .store import content_hash, file_partition, source_files
+
+ENABLED = os.environ.get("HR_WATCH", "1") != "0"
+INTERVAL = float(os.environ.get("HR_WATCH_INTERVAL", "5"))
+
+
+class PartitionWatcher:
+    """Polls ``engines.root`` and reloads the partitions whose content changed."""
+
+    def __init__(self, engines, interval=INTERVAL):
+        self.engines = engines
+        self.root = Path(engines.root)
+        self.interval = interval
+        self._hashes = {}           # path → ((size, mtime_ns), sha1)
+        self._settling = {}         # path → stat seen on the previous poll
+        self._pending = set()       # partitions of a reload that failed, retried with the next
+        self._stop = threading.Event()
+        self._thread = None
+        self.polls = self.reloads = self.full_reloads = self.failures = 0
+        self.history = deque(maxlen=20)
+
+    def baseline(self):
+        """Hash the current files; later polls report changes against them."""
+        self._hashes = {path: (stat, content_hash(path)) for path, stat in self._scan().items()}
+        self._settling.clear()
+        return self
+
+    def start(self):
+        """``baseline``, then poll in a daemon thread; returns self."""
+        self.baseline()
+        self._thread = threading.Thread(target=self._run, name="hr-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                # A partition replaced mid-scan or a failed rebuild; the next poll retries
+                self.failures += 1
+
+    def _scan(self):
+        stats = {}
+        for path in source_files(self.root):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            stats[path] = (st.st_size, st.st_mtime_ns)
+        return stats
+
+    def changed_files(self):
+        """Files whose content changed since the last call, added or removed included."""
+        stats = self._scan()
+        changed = [path for path in self._hashes if path not in stats]
+        for path in changed:
+            del self._hashes[path]
+        for path, stat in stats.items():
+            known = self._hashes.get(path)
+            if known is not None and known[0] == stat:
+                self._settling.pop(path, None)
+                continue
+            if self._settling.get(path) != stat:
+                # Moved since the last poll: may still be being written
+                self._settling[path] = stat
+                continue
+            del self._settling[path]
+            digest = content_hash(path)
+            if known is None or known[1] != digest:
+                changed.append(path)
+            self._hashes[path] = (stat, digest)
+        return changed
+
+    def poll(self):
+        """One scan; reloads the engines if any partition changed.
+
+        Returns the invalidated (company, month) pairs (see
+        ``Engines.reload``), None after a full reload, or an empty set.
+        """
+        self.polls += 1
+        files = self.changed_files()
+        self._pending.update(file_partition(path, self.root) for path in files)
+        if not self._pending:
+            return set()
+        t = time.perf_counter()
+        invalidated = self.engines.reload(self._pending)
+        self._pending = set()
+        self.reloads += 1
+        self.full_reloads += invalidated is None
+        self.history.append({
+            "at": time.time(),
+            "files": [str(path.relative_to(self.root)) for path in files],
+            "invalidated": None if invalidated is None else len(invalidated),
+            "seconds": time.perf_counter() - t,
+        })
+        return invalidated
+
+    def stats(self):
+        return {
+            "interval_s": self.interval,
+            "files": len(self._hashes),
+            "polls": self.polls,
+            "reloads": self.reloads,
+            "full_reloads": self.full_reloads,
+            "failures": self.failures,
+            "generation": self.engines.generation,
+            "last": self.history[-1] if self.history else None,
+        }